@@ -1,12 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api import articles, search
+from app.api import articles, health, jobs, metrics, search
+from app.db.session import async_engine
+from app.services.analysis_executor import get_analysis_executor, shutdown_analysis_executor
+from app.services.cache import close_response_cache
+from app.services.http_client import get_http_client, close_http_client
+from app.services.search_prefetch import shutdown_search_prefetcher
 import logging
+import time
 
 from app.core.logging import configure_logging
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Un único cliente HTTP con pool de conexiones durante toda la vida de la app
+    get_http_client()
+    executor = get_analysis_executor()
+    executor.start()
+    if settings.MODELS_WARM_UP:
+        # Sin los modelos la aplicación no arranca (no se descargan)
+        start = time.perf_counter()
+        await executor.warm_up()
+        logging.getLogger(__name__).info(f"Modelos cargados en {time.perf_counter() - start:.2f} s")
+    yield
+    await shutdown_search_prefetcher()
+    shutdown_analysis_executor()
+    await close_response_cache()
+    await close_http_client()
+    await async_engine.dispose()
+
+
 def create_app() -> FastAPI:
 
     configure_logging()
@@ -15,6 +41,7 @@ def create_app() -> FastAPI:
         title=settings.PROJECT_NAME,
         description="API para buscar, analizar y guardar artículos de Wikipedia",
         version=settings.VERSION,
+        lifespan=lifespan,
         openapi_url=f"{settings.API_PREFIX}/openapi.json",
         docs_url=f"{settings.API_PREFIX}/docs",
         redoc_url=f"{settings.API_PREFIX}/redoc",
@@ -27,6 +54,18 @@ def create_app() -> FastAPI:
                 "name": "Search",
                 "description": "Búsqueda de artículos en Wikipedia",
             },
+            {
+                "name": "Jobs",
+                "description": "Trabajos en segundo plano",
+            },
+            {
+                "name": "Health",
+                "description": "Estado del servicio",
+            },
+            {
+                "name": "Metrics",
+                "description": "Métricas internas del servicio",
+            },
         ],
     )
 
@@ -48,6 +87,9 @@ def create_app() -> FastAPI:
     # Registrar routers
     app.include_router(articles.router, prefix=settings.API_PREFIX)
     app.include_router(search.router, prefix=settings.API_PREFIX)
+    app.include_router(jobs.router, prefix=settings.API_PREFIX)
+    app.include_router(metrics.router, prefix=settings.API_PREFIX)
+    app.include_router(health.router, prefix=settings.API_PREFIX)
 
     # Configurar logging
     logging.basicConfig(
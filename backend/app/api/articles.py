@@ -1,13 +1,41 @@
+import json
+import math
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Body
-from typing import Dict, Any
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.services.wiki_service import WikipediaService
-from app.services.analyzer import TextAnalyzer
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from collections import Counter
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Any, List, Literal, Optional, Tuple
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import undefer
+from app.db.dialects import dialect_insert, dialect_name
+from app.db.session import get_async_db, get_async_session_factory
+from app.api.dependencies import get_article_or_404, get_wiki_service
+from app.services.wiki_service import AsyncWikipediaService, parse_touched
+from app.services.analysis_executor import AnalysisExecutor, AnalysisQueueFullError, get_analysis_executor
+from app.services.analysis_store import AnalysisStore, content_hash
+from app.services.analyzer import ANALYSIS_PARTS
+from app.services.article_search import search_saved_articles
+from app.services.article_stats import StatsDelta, apply_stats_delta, get_article_stats
+from app.services.job_queue import enqueue
+from app.services.resilience import UpstreamUnavailableError
+from app.services.saved_articles import article_values, import_articles
+from app.services.search_prefetch import record_prefetch_access
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.exceptions import DuplicatedError, ServiceUnavailableError, TooManyRequestsError, ValidationError
 from app.schemas.article import (
     SavedArticleCreate,
     SavedArticleInDB,
     SavedArticleUpdate,
+    SavedArticleFullText,
+    SavedArticleSearchResult,
+    SavedArticleSearchResponse,
+    ArticleStatsResponse,
+    BulkSaveRequest,
+    BulkDeleteRequest,
+    BulkItemResult,
+    BulkOperationResponse,
     ArticleDetailResponse,
     ArticleAnalysis
 )
@@ -25,123 +53,303 @@ router = APIRouter(
 logger = logging.getLogger(__name__)
 DEFAULT_USER_ID = "default_user"
 
+def _parse_include(include: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Convierte include=sentiment,entities en las partes del análisis a
+    calcular; sin el parámetro se calculan todas
+    """
+    if include is None:
+        return None
+
+    parts = tuple(sorted({part.strip() for part in include.split(",") if part.strip()}))
+    unknown = [part for part in parts if part not in ANALYSIS_PARTS]
+    if unknown:
+        raise ValidationError(
+            detail=f"Partes desconocidas: {', '.join(unknown)}. Válidas: {', '.join(ANALYSIS_PARTS)}"
+        )
+
+    return parts
+
+
+def _mask_analysis(analysis: ArticleAnalysis, parts: Optional[Tuple[str, ...]]) -> ArticleAnalysis:
+    if parts is None:
+        return analysis
+    return analysis.model_copy(update={part: None for part in ANALYSIS_PARTS if part not in parts})
+
+
+async def _load_article_source(
+        page_id: int,
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService
+) -> Tuple[Optional[SavedArticle], Dict[str, Any], str]:
+    """
+    Devuelve (artículo guardado o None, datos de Wikipedia, texto a analizar)
+    """
+    db_article = await db.scalar(select(SavedArticle).options(undefer(SavedArticle.full_text)).filter(
+        SavedArticle.wikipedia_id == str(page_id),
+        SavedArticle.user_id == DEFAULT_USER_ID
+    ).limit(1))
+
+    # Los artículos guardados con texto completo no necesitan ir a Wikipedia
+    if db_article and db_article.full_text:
+        return db_article, {}, db_article.full_text
+
+    article_data = await wiki_service.get_article_details(page_id)
+    return db_article, article_data, article_data.get("content", "")
+
+
+def _upstream_unavailable(error: UpstreamUnavailableError) -> ServiceUnavailableError:
+    logger.warning(f"Wikipedia no disponible: {str(error)}")
+    return ServiceUnavailableError(detail=str(error), retry_after=math.ceil(error.retry_after or 1))
+
+
+def _detail_article(
+        page_id: int,
+        db_article: Optional[SavedArticle],
+        article_data: Dict[str, Any],
+        analysis: Optional[ArticleAnalysis] = None
+) -> SavedArticleInDB:
+    if db_article:
+        return SavedArticleInDB.model_validate(db_article)
+
+    return SavedArticleInDB(
+        id=-1,
+        title=article_data.get("title", ""),
+        wikipedia_id=str(page_id),
+        wikipedia_url=article_data.get("url", ""),
+        summary=article_data.get("summary", ""),
+        word_count=analysis.word_count if analysis else None,
+        frequent_words=analysis.frequent_words if analysis else None,
+        revision_id=article_data.get("revision_id"),
+        touched=parse_touched(article_data.get("touched")),
+        created_at=dt.now(),
+        updated_at=dt.now()
+    )
+
+
+INCLUDE_DESCRIPTION = (
+    "Partes opcionales del análisis separadas por comas (sentiment, entities); "
+    "el conteo y las palabras frecuentes siempre se incluyen. Vacío para solo esas."
+)
+
+
 @router.get("/detail/{page_id}", response_model=ArticleDetailResponse)
 async def get_article_detail(
         page_id: int = Path(..., description="ID de la página en Wikipedia"),
-        db: Session = Depends(get_db)
+        include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+        db: AsyncSession = Depends(get_async_db),
+        wiki_service: AsyncWikipediaService = Depends(get_wiki_service),
+        executor: AnalysisExecutor = Depends(get_analysis_executor)
 ):
     """
-    Obtiene los detalles y análisis de un artículo de Wikipedia
+    Obtiene los detalles y análisis de un artículo de Wikipedia.
+
+    Con `include` solo se calculan las partes pedidas; los análisis
+    parciales no se guardan, pero uno completo ya guardado sí se reutiliza.
     """
-    try:
-        wiki_service = WikipediaService()
-        text_analyzer = TextAnalyzer()
+    parts = _parse_include(include)
+    record_prefetch_access(page_id)
 
-        article_data = wiki_service.get_article_content(page_id)
+    try:
+        db_article, article_data, content = await _load_article_source(page_id, db, wiki_service)
 
-        content = article_data.get("content", "")
-        analysis = text_analyzer.analyze_text(content)
+        analysis_store = AnalysisStore(db)
+        digest = content_hash(content)
+        analysis = await analysis_store.get(str(page_id), digest)
 
-        db_article = db.query(SavedArticle).filter(
-            SavedArticle.wikipedia_id == str(page_id),
-            SavedArticle.user_id == DEFAULT_USER_ID
-        ).first()
-
-        if db_article:
-            article = SavedArticleInDB(
-                id=db_article.id,
-                title=db_article.title,
-                wikipedia_id=db_article.wikipedia_id,
-                wikipedia_url=db_article.wikipedia_url,
-                summary=db_article.summary,
-                personal_notes=db_article.personal_notes,
-                word_count=db_article.word_count,
-                frequent_words=eval(db_article.frequent_words) if db_article.frequent_words else None,
-                created_at=db_article.created_at,
-                updated_at=db_article.updated_at
-            )
+        if analysis is not None:
+            analysis = _mask_analysis(analysis, parts)
+        elif parts is not None:
+            analysis = await executor.analyze(content, parts=parts)
         else:
-            summary_data = wiki_service.get_article_summary(page_id)
-
-            article = SavedArticleInDB(
-                id=-1,
-                title=article_data.get("title", ""),
-                wikipedia_id=str(page_id),
-                wikipedia_url=article_data.get("url", ""),
-                summary=summary_data.get("summary", ""),
-                word_count=analysis.word_count,
-                frequent_words=[{"word": wf.word, "count": wf.count} for wf in analysis.frequent_words],
-                created_at=dt.now(),
-                updated_at=dt.now()
-            )
+            analysis = await executor.analyze(content)
+            await analysis_store.save(str(page_id), digest, analysis, revision_id=article_data.get("revision_id"))
+            await db.commit()
 
+        article = _detail_article(page_id, db_article, article_data, analysis)
         return ArticleDetailResponse(article=article, analysis=analysis)
 
+    except AnalysisQueueFullError as e:
+        logger.warning(f"Análisis rechazado por carga: {str(e)}")
+        raise TooManyRequestsError(detail=str(e))
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
     except Exception as e:
         logger.error(f"Error al obtener detalles del artículo: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error al obtener detalles del artículo: {str(e)}")
 
 
+# Etapas del análisis en streaming: parte que añade cada una y qué campos envía
+STREAM_STAGES = {
+    "word_stats": (None, lambda analysis: {
+        "word_count": analysis.word_count,
+        "frequent_words": analysis.frequent_words
+    }),
+    "sentiment": ("sentiment", lambda analysis: {"sentiment": analysis.sentiment}),
+    "entities": ("entities", lambda analysis: {"entities": analysis.entities}),
+}
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def _encode_event(event: str, data: Any, stream_format: str) -> str:
+    data = jsonable_encoder(data)
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+
+def _ready_stages(analysis: ArticleAnalysis, stages: List[str]) -> List[str]:
+    """
+    Etapas cuyos campos ya están en el análisis (parcial o completo)
+    """
+    return [
+        stage for stage in stages
+        if STREAM_STAGES[stage][0] is None or getattr(analysis, STREAM_STAGES[stage][0]) is not None
+    ]
+
+
+async def _detail_events(
+        page_id: int,
+        db_article: Optional[SavedArticle],
+        article_data: Dict[str, Any],
+        content: str,
+        session_factory: async_sessionmaker,
+        executor: AnalysisExecutor,
+        stream_format: str,
+        parts: Optional[Tuple[str, ...]] = None
+) -> AsyncIterator[str]:
+    """
+    Eventos de la respuesta en streaming. Se ejecuta después de que la ruta
+    devuelve la respuesta, cuando su sesión puede estar ya cerrada, así que
+    abre sesiones propias.
+    """
+    # word_stats siempre; el resto solo si se pidió
+    stages = [
+        stage for stage, (part, _) in STREAM_STAGES.items()
+        if parts is None or part is None or part in parts
+    ]
+
+    try:
+        yield _encode_event("article", _detail_article(page_id, db_article, article_data), stream_format)
+
+        digest = content_hash(content)
+        async with session_factory() as db:
+            analysis = await AnalysisStore(db).get(str(page_id), digest)
+
+        if analysis is not None:
+            for stage in stages:
+                yield _encode_event(stage, STREAM_STAGES[stage][1](analysis), stream_format)
+        else:
+            # Un solo análisis, por partes: cada etapa se envía en cuanto
+            # termina, así el NER lento no retrasa los campos baratos
+            sent: List[str] = []
+            async with aclosing(executor.analyze_stages(content, parts=parts)) as partials:
+                async for analysis in partials:
+                    for stage in _ready_stages(analysis, stages):
+                        if stage not in sent:
+                            sent.append(stage)
+                            yield _encode_event(stage, STREAM_STAGES[stage][1](analysis), stream_format)
+
+            if parts is None:
+                async with session_factory() as db:
+                    await AnalysisStore(db).save(
+                        str(page_id), digest, analysis, revision_id=article_data.get("revision_id")
+                    )
+                    await db.commit()
+
+        yield _encode_event("done", {}, stream_format)
+
+    except AnalysisQueueFullError as e:
+        logger.warning(f"Análisis rechazado por carga: {str(e)}")
+        yield _encode_event("error", {"status": 429, "detail": str(e)}, stream_format)
+    except Exception as e:
+        logger.error(f"Error al analizar el artículo en streaming: {str(e)}")
+        yield _encode_event("error", {"status": 500, "detail": f"Error al analizar el artículo: {str(e)}"}, stream_format)
+
+
+@router.get("/detail/{page_id}/stream")
+async def stream_article_detail(
+        page_id: int = Path(..., description="ID de la página en Wikipedia"),
+        stream_format: Literal["ndjson", "sse"] = Query("ndjson", alias="format", description="ndjson o sse"),
+        include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+        db: AsyncSession = Depends(get_async_db),
+        session_factory: async_sessionmaker = Depends(get_async_session_factory),
+        wiki_service: AsyncWikipediaService = Depends(get_wiki_service),
+        executor: AnalysisExecutor = Depends(get_analysis_executor)
+):
+    """
+    Variante en streaming de /detail/{page_id}: envía primero los datos del
+    artículo y después las estadísticas de palabras, el sentimiento y las
+    entidades, cada uno en cuanto está listo (eventos article, word_stats,
+    sentiment, entities y done, o error)
+    """
+    parts = _parse_include(include)
+    record_prefetch_access(page_id)
+
+    try:
+        db_article, article_data, content = await _load_article_source(page_id, db, wiki_service)
+    except UpstreamUnavailableError as e:
+        raise _upstream_unavailable(e)
+    except Exception as e:
+        logger.error(f"Error al obtener detalles del artículo: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al obtener detalles del artículo: {str(e)}")
+
+    return StreamingResponse(
+        _detail_events(page_id, db_article, article_data, content, session_factory, executor, stream_format, parts),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        # Evita que los proxies acumulen la respuesta antes de reenviarla
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/", response_model=SavedArticleInDB)
 async def save_article(
         article: SavedArticleCreate = Body(...),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db),
+        wiki_service: AsyncWikipediaService = Depends(get_wiki_service)
 ):
     """
-    Guarda un artículo en la base de datos
+    Guarda un artículo en la base de datos.
+
+    Sin full_text se toma el texto que ya descargó la vista de detalle (de
+    la caché de respuestas); si no está, lo completa un trabajo en segundo
+    plano.
     """
     try:
-        db_article = db.query(SavedArticle).filter(
-            SavedArticle.wikipedia_id == article.wikipedia_id,
-            SavedArticle.user_id == article.user_id
-        ).first()
-
-        if db_article:
-            raise HTTPException(status_code=400, detail="El artículo ya está guardado")
-
-        if article.frequent_words:
-            if hasattr(article.frequent_words[0], 'word'):
-                frequent_words_str = str(
-                    [{"word": wf.word, "count": wf.count} for wf in article.frequent_words])
-            else:
-                # Si ya son diccionarios
-                frequent_words_str = str(article.frequent_words)
-        else:
-            frequent_words_str = None
-
-        db_article = SavedArticle(
-            title=article.title,
-            wikipedia_id=article.wikipedia_id,
-            wikipedia_url=article.wikipedia_url,
-            summary=article.summary,
-            full_text=article.full_text,
-            word_count=article.word_count,
-            frequent_words=frequent_words_str,
-            user_id=article.user_id
-        )
+        if not article.full_text and article.wikipedia_id.isdigit():
+            page = await wiki_service.peek_article_details(int(article.wikipedia_id))
+            if page and page.get("content"):
+                article = article.model_copy(update={"full_text": page["content"]})
 
-        db.add(db_article)
-        db.commit()
-        db.refresh(db_article)
-
-        frequent_words = eval(db_article.frequent_words) if db_article.frequent_words else None
-
-        return SavedArticleInDB(
-            id=db_article.id,
-            title=db_article.title,
-            wikipedia_id=db_article.wikipedia_id,
-            wikipedia_url=db_article.wikipedia_url,
-            summary=db_article.summary,
-            word_count=db_article.word_count,
-            frequent_words=frequent_words,
-            created_at=db_article.created_at,
-            updated_at=db_article.updated_at
-        )
+        insert = dialect_insert(db)
+        # Una sola sentencia: si ya existe (user_id, wikipedia_id) no devuelve fila
+        statement = insert(SavedArticle).values(**article_values(article)).on_conflict_do_nothing(
+            index_elements=[SavedArticle.user_id, SavedArticle.wikipedia_id]
+        ).returning(SavedArticle)
+
+        db_article = await db.scalar(statement)
+        if db_article is None:
+            raise DuplicatedError(detail="El artículo ya está guardado")
+
+        delta = StatsDelta()
+        delta.add(article.user_id, article.word_count, article.frequent_words, article.entities)
+        await apply_stats_delta(db, delta)
+
+        await db.commit()
+
+        if not article.full_text and article.wikipedia_id.isdigit():
+            await enqueue(db, "fetch_full_text", {"article_id": db_article.id}, priority=-10)
+
+        return SavedArticleInDB.model_validate(db_article)
 
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error de base de datos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de base de datos: {str(e)}")
     except Exception as e:
@@ -149,68 +357,232 @@ async def save_article(
         raise HTTPException(status_code=500, detail=f"Error al guardar el artículo: {str(e)}")
 
 
+def _created_at_key(db: AsyncSession, value: Any = SavedArticle.created_at):
+    """
+    created_at (o la fecha del cursor) tal como se ordena y compara.
+
+    SQLite guarda las fechas como texto y el formato de CURRENT_TIMESTAMP no
+    coincide con el de los parámetros datetime, así que allí ambos lados
+    pasan por julianday(), que los convierte al mismo número; en el resto de
+    motores se compara el timestamp.
+    """
+    if dialect_name(db) == "sqlite":
+        return func.julianday(value)
+    return value
+
+
 @router.get("/", response_model=Dict[str, Any])
 async def get_saved_articles(
-        skip: int = Query(0, ge=0, description="Número de artículos para saltar (paginación)"),
+        skip: int = Query(0, ge=0, description="Número de artículos para saltar (paginación por desplazamiento)"),
         limit: int = Query(100, ge=1, le=100, description="Número máximo de artículos a devolver"),
-        db: Session = Depends(get_db)
+        cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor por la página anterior"),
+        include_total: bool = Query(True, description="Incluir el total de artículos guardados"),
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Obtiene la lista de artículos guardados con el conteo total
+    Obtiene la lista de artículos guardados ordenada por fecha de creación.
+
+    Con `cursor` la página se busca por índice (user_id, created_at, id), con
+    el mismo coste sea cual sea la profundidad; `skip` se mantiene por
+    compatibilidad. Con `include_total` el total se calcula en cada página:
+    en la primera con una función de ventana y en las siguientes aparte.
     """
     try:
-        total_count = db.query(SavedArticle).filter(
-            SavedArticle.user_id == DEFAULT_USER_ID
-        ).count()
+        created_at_key = _created_at_key(db)
+        columns = [SavedArticle]
+
+        position = decode_cursor(cursor) if cursor else None
+        count_in_query = include_total and position is None
+        total_count = None
 
-        db_articles = db.query(SavedArticle).filter(
+        if count_in_query:
+            columns.append(func.count().over().label("total_count"))
+
+        query = select(*columns).filter(
             SavedArticle.user_id == DEFAULT_USER_ID
-        ).offset(skip).limit(limit).all()
-
-        articles = []
-        for db_article in db_articles:
-            frequent_words = eval(db_article.frequent_words) if db_article.frequent_words else None
-
-            article = SavedArticleInDB(
-                id=db_article.id,
-                title=db_article.title,
-                wikipedia_id=db_article.wikipedia_id,
-                wikipedia_url=db_article.wikipedia_url,
-                summary=db_article.summary,
-                personal_notes=db_article.personal_notes,
-                word_count=db_article.word_count,
-                frequent_words=frequent_words,
-                created_at=db_article.created_at,
-                updated_at=db_article.updated_at
+        ).order_by(created_at_key, SavedArticle.id)
+
+        if position is not None:
+            try:
+                after = (dt.fromisoformat(position["created_at"]), int(position["id"]))
+            except (KeyError, TypeError, ValueError) as e:
+                raise InvalidCursorError("Cursor de paginación inválido") from e
+            query = query.filter(
+                tuple_(created_at_key, SavedArticle.id) > tuple_(_created_at_key(db, after[0]), after[1])
             )
-            articles.append(article)
+        elif skip:
+            query = query.offset(skip)
+
+        # Una fila de más indica si hay página siguiente
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        page = rows[:limit]
+
+        if count_in_query:
+            total_count = rows[0].total_count if rows else None
+        if include_total and total_count is None:
+            # Página vacía o siguiente a la primera: se cuenta aparte
+            total_count = await db.scalar(select(func.count(SavedArticle.id)).filter(
+                SavedArticle.user_id == DEFAULT_USER_ID
+            ))
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1].SavedArticle
+            next_cursor = encode_cursor({"created_at": last.created_at.isoformat(), "id": last.id})
+
+        articles = [SavedArticleInDB.model_validate(row.SavedArticle) for row in page]
 
         return {
             "items": articles,
-            "total": total_count
+            "total": total_count,
+            "next_cursor": next_cursor
         }
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error al obtener artículos guardados: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error al obtener artículos guardados: {str(e)}")
 
+@router.get("/search", response_model=SavedArticleSearchResponse)
+async def search_articles(
+        q: str = Query(..., min_length=1, description="Términos a buscar en los artículos guardados"),
+        limit: int = Query(20, ge=1, le=100, description="Número máximo de resultados"),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Busca en el título, resumen, notas personales y texto completo de los
+    artículos guardados usando el índice de texto completo de la base de datos
+    """
+    try:
+        matches, total = await search_saved_articles(db, DEFAULT_USER_ID, q, limit=limit)
+
+        results = [
+            SavedArticleSearchResult(**SavedArticleInDB.model_validate(db_article).model_dump(), rank=rank)
+            for db_article, rank in matches
+        ]
+
+        return SavedArticleSearchResponse(results=results, total=total)
+
+    except Exception as e:
+        logger.error(f"Error al buscar artículos guardados: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al buscar artículos guardados: {str(e)}")
+
+
+@router.get("/stats", response_model=ArticleStatsResponse)
+async def get_saved_articles_stats(
+        top_n: int = Query(20, ge=1, le=100, description="Número de palabras y entidades a devolver"),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Estadísticas de todos los artículos guardados: palabras y entidades más
+    frecuentes y distribución de la longitud. Se leen de tablas acumuladas
+    que se actualizan al guardar y eliminar artículos.
+    """
+    try:
+        return await get_article_stats(db, DEFAULT_USER_ID, top_n=top_n)
+    except Exception as e:
+        logger.error(f"Error al obtener estadísticas: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al obtener estadísticas: {str(e)}")
+
+
+def _bulk_response(results: List[BulkItemResult]) -> BulkOperationResponse:
+    return BulkOperationResponse(results=results, counts=Counter(result.status for result in results))
+
+
+@router.post("/bulk", response_model=BulkOperationResponse)
+async def bulk_save_articles(
+        request: BulkSaveRequest = Body(...),
+        db: AsyncSession = Depends(get_async_db),
+        wiki_service: AsyncWikipediaService = Depends(get_wiki_service)
+):
+    """
+    Guarda varios artículos en una sola transacción con inserciones de
+    varias filas; devuelve el resultado de cada elemento en el mismo orden
+    """
+    try:
+        results = await import_articles(db, request.items, wiki_service, request.fetch_content)
+        return _bulk_response(results)
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Error de base de datos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error de base de datos: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error al guardar los artículos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al guardar los artículos: {str(e)}")
+
+
+@router.delete("/bulk", response_model=BulkOperationResponse)
+async def bulk_delete_articles(
+        request: BulkDeleteRequest = Body(...),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Elimina varios artículos guardados con una sola sentencia
+    """
+    try:
+        ids = list(dict.fromkeys(request.ids))
+        rows = await db.execute(
+            delete(SavedArticle).filter(
+                SavedArticle.user_id == DEFAULT_USER_ID,
+                SavedArticle.id.in_(ids)
+            ).returning(
+                SavedArticle.id,
+                SavedArticle.user_id,
+                SavedArticle.word_count,
+                SavedArticle.frequent_words,
+                SavedArticle.entities
+            ).execution_options(synchronize_session=False)
+        )
+
+        deleted = set()
+        delta = StatsDelta()
+        for row in rows:
+            deleted.add(row.id)
+            delta.add(row.user_id, row.word_count, row.frequent_words, row.entities, sign=-1)
+        await apply_stats_delta(db, delta)
+
+        await db.commit()
+
+        return _bulk_response([
+            BulkItemResult(status="deleted" if article_id in deleted else "not_found", id=article_id)
+            for article_id in ids
+        ])
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Error de base de datos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error de base de datos: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error al eliminar los artículos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error al eliminar los artículos: {str(e)}")
+
+
+@router.get("/{article_id}/full-text", response_model=SavedArticleFullText)
+async def get_article_full_text(
+        article_id: int = Path(..., description="ID del artículo guardado"),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtiene el texto completo de un artículo guardado; el resto de endpoints
+    no lo cargan
+    """
+    db_article = await get_article_or_404(article_id, db, user_id=DEFAULT_USER_ID, with_full_text=True)
+    return SavedArticleFullText.model_validate(db_article)
+
+
 @router.patch("/{article_id}", response_model=SavedArticleInDB)
 async def update_article(
         article_id: int = Path(..., description="ID del artículo guardado"),
         article_update: SavedArticleUpdate = Body(...),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     Actualiza un artículo guardado (título, resumen o notas personales)
     """
     try:
-        db_article = db.query(SavedArticle).filter(
-            SavedArticle.id == article_id,
-            SavedArticle.user_id == DEFAULT_USER_ID
-        ).first()
-
-        if not db_article:
-            raise HTTPException(status_code=404, detail="Artículo no encontrado")
+        db_article = await get_article_or_404(article_id, db, user_id=DEFAULT_USER_ID)
 
         if article_update.title is not None:
             db_article.title = article_update.title
@@ -221,28 +593,15 @@ async def update_article(
         if article_update.personal_notes is not None:
             db_article.personal_notes = article_update.personal_notes
 
-        db.commit()
-        db.refresh(db_article)
-
-        frequent_words = eval(db_article.frequent_words) if db_article.frequent_words else None
-
-        return SavedArticleInDB(
-            id=db_article.id,
-            title=db_article.title,
-            wikipedia_id=db_article.wikipedia_id,
-            wikipedia_url=db_article.wikipedia_url,
-            summary=db_article.summary,
-            personal_notes=db_article.personal_notes,
-            word_count=db_article.word_count,
-            frequent_words=frequent_words,
-            created_at=db_article.created_at,
-            updated_at=db_article.updated_at
-        )
+        await db.commit()
+        await db.refresh(db_article)
+
+        return SavedArticleInDB.model_validate(db_article)
 
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error de base de datos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de base de datos: {str(e)}")
     except Exception as e:
@@ -253,29 +612,27 @@ async def update_article(
 @router.delete("/{article_id}", response_model=dict)
 async def delete_article(
         article_id: int = Path(..., description="ID del artículo guardado"),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     Elimina un artículo guardado
     """
     try:
-        db_article = db.query(SavedArticle).filter(
-            SavedArticle.id == article_id,
-            SavedArticle.user_id == DEFAULT_USER_ID
-        ).first()
+        db_article = await get_article_or_404(article_id, db, user_id=DEFAULT_USER_ID)
 
-        if not db_article:
-            raise HTTPException(status_code=404, detail="Artículo no encontrado")
+        delta = StatsDelta()
+        delta.add(db_article.user_id, db_article.word_count, db_article.frequent_words, db_article.entities, sign=-1)
 
-        db.delete(db_article)
-        db.commit()
+        await db.delete(db_article)
+        await apply_stats_delta(db, delta)
+        await db.commit()
 
         return {"message": "Artículo eliminado correctamente"}
 
     except HTTPException:
         raise
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Error de base de datos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error de base de datos: {str(e)}")
     except Exception as e:
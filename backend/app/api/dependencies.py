@@ -1,17 +1,41 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from app.db.session import get_async_db
 from app.db.models import SavedArticle
+from app.core.config import settings
+from app.services.cache import get_response_cache
+from app.services.http_client import get_http_client
+from app.services.resilience import get_upstream_guard
+from app.services.single_flight import get_single_flight
+from app.services.wiki_service import AsyncWikipediaService, CachedWikipediaService
+
+
+def get_wiki_service() -> AsyncWikipediaService:
+    flight = get_single_flight("wikipedia", timeout=settings.WIKIPEDIA_SINGLE_FLIGHT_TIMEOUT)
+    guard = get_upstream_guard()
+
+    if settings.CACHE_ENABLED:
+        return CachedWikipediaService(get_response_cache(), client=get_http_client(), flight=flight, guard=guard)
+
+    return AsyncWikipediaService(client=get_http_client(), flight=flight, guard=guard)
+
 
 async def get_article_or_404(
         article_id: int,
-        db: Session = Depends(get_db),
-        user_id: str = "default_user"
+        db: AsyncSession = Depends(get_async_db),
+        user_id: str = "default_user",
+        with_full_text: bool = False
 ) -> SavedArticle:
-    db_article = db.query(SavedArticle).filter(
+    query = select(SavedArticle).filter(
         SavedArticle.id == article_id,
         SavedArticle.user_id == user_id
-    ).first()
+    )
+    if with_full_text:
+        query = query.options(undefer(SavedArticle.full_text))
+
+    db_article = await db.scalar(query.limit(1))
 
     if db_article is None:
         raise HTTPException(
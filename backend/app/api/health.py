@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from app.services.analysis_executor import AnalysisExecutor, get_analysis_executor
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"]
+)
+
+
+@router.get("/ready")
+async def get_readiness(executor: AnalysisExecutor = Depends(get_analysis_executor)):
+    """
+    Indica si los modelos de análisis están cargados; responde 503 mientras
+    no lo estén
+    """
+    status = executor.models_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
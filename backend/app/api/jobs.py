@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Path
+from pydantic import ValidationError as PayloadValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.exceptions import NotFoundError, ValidationError
+from app.db.session import get_async_db
+from app.schemas.job import JobCreate, JobResponse
+from app.services.job_handlers import validate_payload
+from app.services.job_queue import enqueue, get_job
+import logging
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+    responses={404: {"description": "Not found"}}
+)
+
+logger = logging.getLogger(__name__)
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def create_job(
+        job: JobCreate = Body(...),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Encola un trabajo para el worker (python -m app.worker) y responde sin
+    esperar a que se ejecute; su estado se consulta con GET /jobs/{id}
+    """
+    try:
+        payload = validate_payload(job.type, job.payload)
+    except PayloadValidationError as e:
+        raise ValidationError(detail=f"Payload no válido para {job.type}: {e.errors(include_url=False)}")
+
+    try:
+        db_job = await enqueue(
+            db, job.type, payload.model_dump(mode="json"), priority=job.priority, max_attempts=job.max_attempts
+        )
+        return JobResponse.model_validate(db_job)
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error(f"Error de base de datos: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error de base de datos: {str(e)}")
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+        job_id: int = Path(..., description="ID del trabajo"),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Devuelve el estado de un trabajo y, cuando termina, su resultado o error
+    """
+    db_job = await get_job(db, job_id)
+    if db_job is None:
+        raise NotFoundError(detail="Trabajo no encontrado")
+
+    return JobResponse.model_validate(db_job)
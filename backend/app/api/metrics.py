@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from typing import Dict, Any
+from app.services.analysis_executor import get_analysis_executor
+from app.services.cache import get_response_cache
+from app.services.resilience import upstream_stats
+from app.services.search_prefetch import search_prefetch_stats
+from app.services.single_flight import single_flight_stats
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+
+@router.get("/", response_model=Dict[str, Any])
+async def get_metrics():
+    """
+    Devuelve los contadores internos del servicio (caché de Wikipedia,
+    pool de análisis, llamadas agrupadas, precarga de resultados de
+    búsqueda y protección frente a Wikipedia)
+    """
+    return {
+        "cache": get_response_cache().stats(),
+        "analysis": get_analysis_executor().stats(),
+        "single_flight": single_flight_stats(),
+        "prefetch": search_prefetch_stats(),
+        "upstream": upstream_stats()
+    }
@@ -1,5 +1,12 @@
-from fastapi import APIRouter, HTTPException, Query
-from app.services.wiki_service import WikipediaService
+import math
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.api.dependencies import get_wiki_service
+from app.core.exceptions import ServiceUnavailableError
+from app.services.analysis_executor import AnalysisExecutor, get_analysis_executor
+from app.services.resilience import UpstreamUnavailableError
+from app.services.search_prefetch import SearchPrefetcher, get_search_prefetcher
+from app.services.wiki_service import AsyncWikipediaService
 from app.schemas.article import WikiSearchResponse
 import logging
 
@@ -14,15 +21,26 @@ logger = logging.getLogger(__name__)
 @router.get("/", response_model=WikiSearchResponse)
 async def search_wikipedia(
     q: str = Query(..., min_length=1, description="Término de búsqueda"),
-    limit: int = Query(10, ge=1, le=50, description="Número máximo de resultados")
+    limit: int = Query(10, ge=1, le=50, description="Número máximo de resultados"),
+    prefetch: bool = Query(True, description="Precargar en segundo plano los primeros resultados"),
+    wiki_service: AsyncWikipediaService = Depends(get_wiki_service),
+    executor: AnalysisExecutor = Depends(get_analysis_executor),
+    prefetcher: Optional[SearchPrefetcher] = Depends(get_search_prefetcher)
 ):
     """
-    Busca artículos en Wikipedia basados en el término de búsqueda
+    Busca artículos en Wikipedia basados en el término de búsqueda.
+
+    Con la precarga activada, el contenido y el análisis de los primeros
+    resultados se calculan en segundo plano sin retrasar la respuesta.
     """
     try:
-        wiki_service = WikipediaService()
-        search_response = wiki_service.search_articles(query=q, limit=limit)
+        search_response = await wiki_service.search_articles(query=q, limit=limit)
+        if prefetch and prefetcher is not None:
+            prefetcher.schedule([result.page_id for result in search_response.results], wiki_service, executor)
         return search_response
+    except UpstreamUnavailableError as e:
+        logger.warning(f"Wikipedia no disponible: {str(e)}")
+        raise ServiceUnavailableError(detail=str(e), retry_after=math.ceil(e.retry_after or 1))
     except Exception as e:
         logger.error(f"Error al buscar en Wikipedia: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error al buscar en Wikipedia: {str(e)}")
\ No newline at end of file
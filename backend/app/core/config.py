@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings
 from functools import lru_cache
@@ -13,6 +13,103 @@ class Settings(BaseSettings):
     WIKIPEDIA_API_URL: str = "https://en.wikipedia.org/w/api.php"
     SECRET_KEY: Optional[str] = None
 
+    # Cliente HTTP compartido para la API de Wikipedia
+    WIKIPEDIA_MAX_CONNECTIONS: int = 20
+    WIKIPEDIA_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    WIKIPEDIA_KEEPALIVE_EXPIRY: float = 30.0
+    WIKIPEDIA_TIMEOUT: float = 10.0
+    WIKIPEDIA_CONNECT_TIMEOUT: float = 5.0
+
+    # Protección frente a Wikipedia: solicitudes por segundo y ráfaga máxima
+    # (0 = sin límite), reintentos de errores de red y respuestas 429/5xx con
+    # espera exponencial con jitter entre RETRY_BASE_DELAY y RETRY_MAX_DELAY
+    # (o la de Retry-After), y circuito que se abre tras BREAKER_THRESHOLD
+    # fallos seguidos durante BREAKER_RESET_SECONDS
+    WIKIPEDIA_RATE_LIMIT: float = 50.0
+    WIKIPEDIA_RATE_BURST: float = 20.0
+    WIKIPEDIA_MAX_RETRIES: int = 2
+    WIKIPEDIA_RETRY_BASE_DELAY: float = 0.5
+    WIKIPEDIA_RETRY_MAX_DELAY: float = 10.0
+    WIKIPEDIA_BREAKER_THRESHOLD: int = 5
+    WIKIPEDIA_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Caché de respuestas de Wikipedia (LRU local + nivel compartido opcional)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024
+    # Tamaño aproximado máximo de la caché local y del nivel compartido
+    # (los detalles guardan el texto completo del artículo); 0 = sin límite
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_SQLITE_MAX_BYTES: int = 512 * 1024 * 1024
+    CACHE_TTL_SECONDS: float = 300.0
+    CACHE_STALE_SECONDS: float = 3600.0
+    # Respuestas aún más antiguas que solo se sirven si Wikipedia falla
+    CACHE_FALLBACK_SECONDS: float = 86400.0
+    CACHE_SQLITE_PATH: Optional[str] = None
+
+    # Plazo de una solicitud a Wikipedia compartida por llamadas concurrentes
+    WIKIPEDIA_SINGLE_FLIGHT_TIMEOUT: float = 30.0
+
+    # Pool de procesos para el análisis de texto (None = un proceso por núcleo,
+    # 0 = hilos del propio proceso)
+    ANALYSIS_WORKERS: Optional[int] = None
+    ANALYSIS_MAX_PENDING: int = 32
+    # Agrupación de análisis concurrentes en micro-lotes (0 = desactivada)
+    ANALYSIS_BATCH_WINDOW_MS: float = 0.0
+    ANALYSIS_BATCH_SIZE: int = 8
+    # Plazo de un análisis compartido por llamadas concurrentes con el mismo texto
+    ANALYSIS_TIMEOUT: float = 120.0
+
+    # Refresco de los artículos guardados según su revisión en Wikipedia:
+    # cada cuánto (segundos, 0 = desactivado), cuántos artículos por pasada y
+    # cuántas páginas cambiadas se descargan y analizan a la vez
+    ARTICLE_REFRESH_INTERVAL: float = 3600.0
+    ARTICLE_REFRESH_BATCH_SIZE: int = 500
+    ARTICLE_REFRESH_CONCURRENCY: int = 4
+
+    # Modelos de NLP: se cargan al arrancar (False = en el primer uso) y nunca
+    # se descargan; deben estar instalados en la imagen
+    MODELS_WARM_UP: bool = True
+    NER_MODEL: str = "en_core_web_sm"
+    # Motor de sentimiento: "textblob" (referencia) o "lexicon" (NumPy, en lote)
+    SENTIMENT_BACKEND: str = "textblob"
+
+    # Precarga especulativa tras una búsqueda: contenido y análisis de los
+    # primeros resultados (0 = desactivada, por defecto: la interfaz busca
+    # mientras se escribe y cada pausa lanzaría descargas y análisis que
+    # compiten con las solicitudes reales), páginas precargándose a la vez
+    # como máximo, ocupación del pool de análisis a partir de la cual se
+    # cancela y segundos durante los que una página precargada cuenta como
+    # acierto si se abre
+    SEARCH_PREFETCH_TOP_K: int = 0
+    SEARCH_PREFETCH_MAX_IN_FLIGHT: int = 4
+    SEARCH_PREFETCH_LOAD_THRESHOLD: float = 0.5
+    SEARCH_PREFETCH_TTL: float = 600.0
+
+    # Cola de trabajos en segundo plano (python -m app.worker): trabajos a la
+    # vez por worker y, por tipo, límites más estrictos; cada cuánto se
+    # consulta la cola, espera base entre reintentos (se duplica en cada uno)
+    # y segundos tras los que un trabajo en curso se da por abandonado
+    JOB_CONCURRENCY: int = 4
+    JOB_TYPE_CONCURRENCY: Dict[str, int] = {"import_articles": 1, "reanalyze_articles": 1}
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_RETRY_DELAY: float = 5.0
+    JOB_LOCK_TIMEOUT: float = 600.0
+
+    # spaCy: tamaño de lote y procesos de nlp.pipe, y tamaño máximo de cada
+    # fragmento de texto en caracteres
+    NER_BATCH_SIZE: int = 32
+    NER_N_PROCESS: int = 1
+    NER_CHUNK_SIZE: int = 10000
+
+    # Pool de conexiones de la base de datos (no aplica a SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Tiempo máximo por sentencia en PostgreSQL (0 = sin límite)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
 
     model_config = ConfigDict(env_file=".env", case_sensitive=True)
 
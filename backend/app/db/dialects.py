@@ -0,0 +1,27 @@
+from typing import Callable
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# insert() con soporte de ON CONFLICT para cada motor
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def insert_for_dialect(name: str) -> Callable:
+    """
+    Devuelve el insert() del motor, que admite
+    on_conflict_do_nothing / on_conflict_do_update
+    """
+    if name not in _INSERTS:
+        raise NotImplementedError(f"INSERT ... ON CONFLICT no soportado en {name}")
+    return _INSERTS[name]
+
+
+def dialect_insert(db: AsyncSession) -> Callable:
+    return insert_for_dialect(dialect_name(db))
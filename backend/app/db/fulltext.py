@@ -0,0 +1,68 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columnas de saved_articles que entran en la búsqueda
+SEARCH_COLUMNS = ("title", "summary", "personal_notes", "full_text")
+
+# Configuración de texto de PostgreSQL: sin stemming, igual que FTS5 en SQLite
+SEARCH_CONFIG = "simple"
+
+# Documento indexado en PostgreSQL. La consulta debe usar exactamente esta
+# expresión para que el planificador use el índice GIN.
+SEARCH_DOCUMENT = (
+    f"to_tsvector('{SEARCH_CONFIG}', "
+    + " || ' ' || ".join(f"coalesce({column}, '')" for column in SEARCH_COLUMNS)
+    + ")"
+)
+
+SEARCH_INDEX_NAME = "ix_saved_articles_search"
+FTS_TABLE = "saved_articles_fts"
+
+_FTS_COLUMNS = ", ".join(SEARCH_COLUMNS)
+_FTS_NEW = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_FTS_OLD = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+# Tabla FTS5 de contenido externo y triggers que la mantienen al día
+_SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"{_FTS_COLUMNS}, content='saved_articles', content_rowid='id')",
+    f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON saved_articles BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON saved_articles BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {_FTS_COLUMNS} ON saved_articles BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_COLUMNS}) VALUES ('delete', old.id, {_FTS_OLD}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_FTS_NEW}); END",
+    # Indexa las filas que ya existían
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def create_search_index(engine: Engine) -> None:
+    """
+    Crea el índice de texto completo de los artículos guardados: GIN sobre
+    un tsvector en PostgreSQL y una tabla FTS5 con triggers en SQLite. El
+    propio motor lo mantiene al guardar, actualizar o eliminar.
+    """
+    inspector = inspect(engine)
+    if "saved_articles" not in inspector.get_table_names():
+        return
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX_NAME} "
+                f"ON saved_articles USING GIN ({SEARCH_DOCUMENT})"
+            ))
+
+    elif engine.dialect.name == "sqlite":
+        if FTS_TABLE in inspector.get_table_names():
+            return
+
+        with engine.begin() as conn:
+            for statement in _SQLITE_DDL:
+                conn.execute(text(statement))
+        logger.info(f"Creada la tabla de búsqueda {FTS_TABLE}")
@@ -0,0 +1,204 @@
+import ast
+import json
+from sqlalchemy import BigInteger, Text, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.engine import Engine
+from app.db.base import Base
+from app.db import models  # noqa: F401  (registra las tablas en Base.metadata)
+from app.db.fulltext import create_search_index
+from app.db.dialects import insert_for_dialect
+from app.db.models import AppliedMigration, SavedArticle, WordCountBucketStat
+from app.services.article_stats import StatsDelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_legacy_frequent_words(value: str) -> str:
+    """
+    Convierte el formato antiguo (str() de una lista de dicts de Python) a JSON
+    """
+    return json.dumps(ast.literal_eval(value))
+
+
+def migrate_frequent_words_to_json(engine: Engine) -> None:
+    """
+    saved_articles.frequent_words pasó de Text con str(lista) a una columna
+    JSON (JSONB en PostgreSQL). Reescribe como JSON las filas en el formato
+    antiguo y, en PostgreSQL, cambia el tipo de la columna.
+    """
+    inspector = inspect(engine)
+    if "saved_articles" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"]: column["type"] for column in inspector.get_columns("saved_articles")}
+    is_postgres = engine.dialect.name == "postgresql"
+    needs_type_change = is_postgres and isinstance(columns["frequent_words"], Text)
+
+    if is_postgres and not needs_type_change:
+        return
+
+    with engine.begin() as conn:
+        # El formato antiguo empieza por "[{'"; el JSON usa comillas dobles
+        rows = conn.execute(text(
+            "SELECT id, frequent_words FROM saved_articles "
+            "WHERE frequent_words LIKE :legacy_prefix"
+        ), {"legacy_prefix": "[{'%"}).fetchall()
+
+        for row_id, value in rows:
+            conn.execute(
+                text("UPDATE saved_articles SET frequent_words = :value WHERE id = :id"),
+                {"value": _encode_legacy_frequent_words(value), "id": row_id}
+            )
+
+        if rows:
+            logger.info(f"Convertidas {len(rows)} filas de frequent_words a JSON")
+
+        if needs_type_change:
+            conn.execute(text(
+                "ALTER TABLE saved_articles ALTER COLUMN frequent_words "
+                "TYPE JSONB USING frequent_words::jsonb"
+            ))
+            logger.info("Columna frequent_words convertida a JSONB")
+
+
+def add_missing_columns(engine: Engine) -> None:
+    """
+    create_all no añade columnas nuevas a tablas existentes; las columnas
+    añadidas después deben ser opcionales
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            definition = CreateColumn(column).compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {definition}"))
+            logger.info(f"Añadida la columna {table.name}.{column.name}")
+
+
+def remove_duplicated_saved_articles(engine: Engine) -> None:
+    """
+    Antes del índice único (user_id, wikipedia_id) podía haber artículos
+    guardados dos veces; se conserva el más antiguo
+    """
+    inspector = inspect(engine)
+    if "saved_articles" not in inspector.get_table_names():
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes("saved_articles")}
+    if "uq_saved_articles_user_wikipedia" in indexes:
+        return
+
+    with engine.begin() as conn:
+        result = conn.execute(text(
+            "DELETE FROM saved_articles WHERE id NOT IN ("
+            "SELECT MIN(id) FROM saved_articles GROUP BY user_id, wikipedia_id)"
+        ))
+        if result.rowcount:
+            logger.info(f"Eliminados {result.rowcount} artículos guardados duplicados")
+
+
+def widen_analysis_revision_id(engine: Engine) -> None:
+    """
+    article_analyses.revision_id se creó como Integer; las revisiones de
+    Wikipedia pueden superar 2^31, como en saved_articles.revision_id.
+    SQLite no distingue los dos tipos.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(engine)
+    if "article_analyses" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"]: column["type"] for column in inspector.get_columns("article_analyses")}
+    if isinstance(columns.get("revision_id"), BigInteger):
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE article_analyses ALTER COLUMN revision_id TYPE BIGINT"))
+    logger.info("Columna article_analyses.revision_id convertida a BIGINT")
+
+
+def create_missing_indexes(engine: Engine) -> None:
+    """
+    create_all no añade índices nuevos a tablas que ya existen
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                logger.info(f"Creado el índice {index.name}")
+
+
+def backfill_article_stats(engine: Engine, batch_size: int = 1000) -> None:
+    """
+    Llena las tablas de estadísticas con los artículos guardados antes de que
+    existieran; después se mantienen al guardar y eliminar.
+
+    La marca en applied_migrations se inserta en la misma transacción que las
+    estadísticas: si dos procesos arrancan a la vez, el segundo espera a que
+    el primero confirme y no vuelve a sumar los mismos artículos.
+    """
+    insert = insert_for_dialect(engine.dialect.name)
+    with engine.begin() as conn:
+        claimed = conn.execute(
+            insert(AppliedMigration)
+            .values(name="backfill_article_stats")
+            .on_conflict_do_nothing(index_elements=[AppliedMigration.name])
+        )
+        if not claimed.rowcount:
+            return
+
+        # Instalaciones que calcularon las estadísticas antes de la marca
+        if conn.execute(select(WordCountBucketStat.user_id).limit(1)).first() is not None:
+            return
+
+        rows = conn.execution_options(yield_per=batch_size).execute(select(
+            SavedArticle.user_id,
+            SavedArticle.word_count,
+            SavedArticle.frequent_words,
+            SavedArticle.entities
+        ))
+
+        delta = StatsDelta()
+        count = 0
+        for row in rows:
+            delta.add(row.user_id, row.word_count, row.frequent_words, row.entities)
+            count += 1
+
+        for statement in delta.statements(insert):
+            conn.execute(statement)
+
+        if count:
+            logger.info(f"Estadísticas calculadas para {count} artículos guardados")
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Ajusta las tablas existentes que create_all no modifica. Cada paso
+    comprueba el estado actual, así que se puede ejecutar en cada arranque.
+    """
+    add_missing_columns(engine)
+    migrate_frequent_words_to_json(engine)
+    remove_duplicated_saved_articles(engine)
+    widen_analysis_revision_id(engine)
+    create_missing_indexes(engine)
+    create_search_index(engine)
+    backfill_article_stats(engine)
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, JSON, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.db.base import Base
 from pydantic import ConfigDict
@@ -14,13 +16,136 @@ class SavedArticle(Base):
     wikipedia_id = Column(String(100), nullable=False)
     wikipedia_url = Column(String(500), nullable=False)
     summary = Column(Text, nullable=True)
-    full_text = Column(Text, nullable=True)
+    # Puede ocupar cientos de KB: solo se carga cuando se pide con undefer()
+    full_text = deferred(Column(Text, nullable=True))
     word_count = Column(Integer, nullable=True)
-    frequent_words = Column(Text, nullable=True)
+    frequent_words = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    entities = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     personal_notes = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     user_id = Column(String(50), nullable=False, index=True)
 
+    # Revisión de Wikipedia del texto guardado; el refresco periódico solo
+    # vuelve a descargar y analizar los artículos cuya revisión cambió
+    revision_id = Column(BigInteger, nullable=True)
+    touched = Column(DateTime, nullable=True)
+    last_checked_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Paginación por cursor: WHERE user_id = ? AND (created_at, id) > (?, ?)
+        Index("ix_saved_articles_user_created_id", "user_id", "created_at", "id"),
+        # Un artículo por usuario; también sirve las búsquedas por wikipedia_id
+        Index("uq_saved_articles_user_wikipedia", "user_id", "wikipedia_id", unique=True),
+        # El refresco recorre primero los artículos revisados hace más tiempo
+        Index("ix_saved_articles_last_checked", "last_checked_at"),
+    )
+
     model_config = ConfigDict(from_attributes=True)
+
+
+class ArticleAnalysisRecord(Base):
+    """Análisis calculado de un artículo, reutilizable mientras no cambien el texto ni el analizador"""
+
+    __tablename__ = "article_analyses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    wikipedia_id = Column(String(100), nullable=False, index=True)
+    content_hash = Column(String(64), nullable=False)
+    analyzer_version = Column(String(20), nullable=False)
+    revision_id = Column(BigInteger, nullable=True)
+    word_count = Column(Integer, nullable=False)
+    frequent_words = Column(JSON, nullable=False)
+    sentiment = Column(JSON, nullable=True)
+    entities = Column(JSON, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint(
+            "wikipedia_id", "content_hash", "analyzer_version",
+            name="uq_article_analyses_key"
+        ),
+    )
+
+
+class WordStat(Base):
+    """Acumulado por usuario de las palabras frecuentes de sus artículos guardados"""
+
+    __tablename__ = "article_word_stats"
+
+    user_id = Column(String(50), primary_key=True)
+    word = Column(String(100), primary_key=True)
+    total_count = Column(BigInteger, nullable=False, default=0)
+    article_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_article_word_stats_user_total", "user_id", "total_count"),
+    )
+
+
+class EntityStat(Base):
+    """Acumulado por usuario de las entidades de sus artículos guardados"""
+
+    __tablename__ = "article_entity_stats"
+
+    user_id = Column(String(50), primary_key=True)
+    text = Column(String(255), primary_key=True)
+    type = Column(String(50), primary_key=True)
+    mentions = Column(BigInteger, nullable=False, default=0)
+    article_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_article_entity_stats_user_articles", "user_id", "article_count"),
+    )
+
+
+class WordCountBucketStat(Base):
+    """Distribución por usuario de la longitud (en palabras) de sus artículos guardados"""
+
+    __tablename__ = "article_length_stats"
+
+    user_id = Column(String(50), primary_key=True)
+    # Límite inferior del intervalo; -1 para artículos sin conteo de palabras
+    bucket = Column(Integer, primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    word_total = Column(BigInteger, nullable=False, default=0)
+
+
+class AppliedMigration(Base):
+    """Migraciones de datos ya ejecutadas, para no repetirlas en cada arranque"""
+
+    __tablename__ = "applied_migrations"
+
+    name = Column(String(100), primary_key=True)
+    applied_at = Column(DateTime, server_default=func.now())
+
+
+class Job(Base):
+    """Trabajo en segundo plano (descarga, análisis, importación) que ejecuta app.worker"""
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    type = Column(String(50), nullable=False)
+    payload = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    # queued -> running -> succeeded | failed (o de vuelta a queued para reintentar)
+    status = Column(String(20), nullable=False, default="queued")
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Fechas en UTC sin zona horaria; un reintento no se reclama antes de run_after
+    run_after = Column(DateTime, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    result = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Reclamación: WHERE status = 'queued' AND run_after <= ? ORDER BY priority DESC
+        Index("ix_jobs_claim", "status", "priority", "run_after"),
+    )
@@ -1,8 +1,10 @@
 from app import create_app
 from app.db.base import Base
+from app.db.migrations import run_migrations
 from app.db.session import engine
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = create_app()
 
@@ -1,10 +1,21 @@
-from typing import List, Optional, Generic, TypeVar
+from typing import Dict, List, Literal, Optional, Generic, TypeVar
 from pydantic import BaseModel, Field
 from datetime import datetime
 from pydantic import ConfigDict
 
 T = TypeVar('T')
 
+class WordFrequency(BaseModel):
+    word: str
+    count: int
+
+class Entity(BaseModel):
+    text: str
+    type: str
+    start: int
+    end: int
+    count: int = 1
+
 class ArticleBase(BaseModel):
     title: str
     wikipedia_id: str
@@ -14,7 +25,10 @@ class ArticleBase(BaseModel):
 class SavedArticleCreate(ArticleBase):
     full_text: Optional[str] = None
     word_count: Optional[int] = None
-    frequent_words: Optional[List[dict]] = None
+    frequent_words: Optional[List[WordFrequency]] = None
+    entities: Optional[List[Entity]] = None
+    revision_id: Optional[int] = None
+    touched: Optional[datetime] = None
     user_id: str = "default_user"
 
 class SavedArticleUpdate(BaseModel):
@@ -25,17 +39,81 @@ class SavedArticleUpdate(BaseModel):
 class SavedArticleInDB(ArticleBase):
     id: int
     word_count: Optional[int] = None
-    frequent_words: Optional[List[dict]] = None
+    frequent_words: Optional[List[WordFrequency]] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     personal_notes: Optional[str] = None
+    revision_id: Optional[int] = None
+    touched: Optional[datetime] = None
+    last_checked_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
-class WordFrequency(BaseModel):
+class SavedArticleFullText(BaseModel):
+    id: int
+    wikipedia_id: str
+    full_text: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SavedArticleSearchResult(SavedArticleInDB):
+    rank: float
+
+class SavedArticleSearchResponse(BaseModel):
+    results: List[SavedArticleSearchResult]
+    total: int
+
+
+class CorpusWordStat(BaseModel):
     word: str
     count: int
+    articles: int
+
+class CorpusEntityStat(BaseModel):
+    text: str
+    type: str
+    mentions: int
+    articles: int
+
+class WordCountBucket(BaseModel):
+    # Sin límites: artículos guardados sin conteo de palabras
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    articles: int
+
+class ArticleStatsResponse(BaseModel):
+    total_articles: int
+    total_words: int
+    average_words: float
+    top_words: List[CorpusWordStat]
+    top_entities: List[CorpusEntityStat]
+    word_count_distribution: List[WordCountBucket]
+
+
+# Máximo de elementos por operación masiva
+BULK_MAX_ITEMS = 500
+
+
+class BulkSaveRequest(BaseModel):
+    items: List[SavedArticleCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+    # Completar full_text (y el resumen) desde Wikipedia si falta
+    fetch_content: bool = False
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    status: Literal["created", "duplicate", "error", "deleted", "not_found"]
+    id: Optional[int] = None
+    wikipedia_id: Optional[str] = None
+    detail: Optional[str] = None
+
+class BulkOperationResponse(BaseModel):
+    results: List[BulkItemResult]
+    counts: Dict[str, int]
+
 
 class SentimentAnalysis(BaseModel):
     label: str
@@ -43,12 +121,6 @@ class SentimentAnalysis(BaseModel):
     negative: float
     neutral: float
 
-class Entity(BaseModel):
-    text: str
-    type: str
-    start: int
-    end: int
-
 class ArticleAnalysis(BaseModel):
     word_count: int
     frequent_words: List[WordFrequency] = Field(..., max_length=10)
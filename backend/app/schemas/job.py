@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+from pydantic import ConfigDict
+from app.schemas.article import BULK_MAX_ITEMS, BulkSaveRequest
+
+JobType = Literal["fetch_article", "fetch_full_text", "analyze_article", "import_articles", "reanalyze_articles"]
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class JobCreate(BaseModel):
+    type: JobType
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    # Mayor prioridad, antes se reclama
+    priority: int = Field(0, ge=-100, le=100)
+    max_attempts: int = Field(3, ge=1, le=10)
+
+class JobResponse(BaseModel):
+    id: int
+    type: str
+    payload: Dict[str, Any]
+    status: JobStatus
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_after: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Payload de cada tipo de trabajo
+
+class FetchArticlePayload(BaseModel):
+    # Descarga el artículo completo de Wikipedia, lo analiza y lo guarda
+    page_id: int
+    user_id: str = "default_user"
+
+class FetchFullTextPayload(BaseModel):
+    # Completa el texto completo de un artículo guardado sin él
+    article_id: int
+
+class AnalyzeArticlePayload(BaseModel):
+    # Calcula el análisis de la vista de detalle y lo deja guardado
+    page_id: int
+
+class ImportArticlesPayload(BulkSaveRequest):
+    # Analizar los elementos con texto completo que no traen análisis
+    analyze: bool = True
+
+class ReanalyzeArticlesPayload(BaseModel):
+    # Sin article_ids, todos los artículos del usuario con texto completo
+    article_ids: Optional[List[int]] = Field(None, min_length=1, max_length=BULK_MAX_ITEMS)
+    user_id: str = "default_user"
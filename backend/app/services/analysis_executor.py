@@ -0,0 +1,332 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Callable, Collection, Dict, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.schemas.article import ArticleAnalysis
+from app.services.analysis_store import content_hash
+from app.services.analyzer import ANALYSIS_PARTS, TextAnalyzer
+from app.services.model_registry import ModelNotAvailableError, get_model_registry
+from app.services.single_flight import SingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Segundos que un proceso del pool espera a los demás al calentarse
+WARM_UP_TIMEOUT = 300.0
+
+# Analizador propio de cada proceso del pool, creado una sola vez al arrancar
+_worker_analyzer: Optional[TextAnalyzer] = None
+# Barrera compartida por los procesos del pool para calentarlos todos
+_warm_up_barrier: Optional[Any] = None
+
+
+def _init_worker(barrier: Optional[Any] = None) -> None:
+    global _worker_analyzer, _warm_up_barrier
+    _worker_analyzer = TextAnalyzer()
+    _warm_up_barrier = barrier
+    if settings.MODELS_WARM_UP:
+        # Un error aquí rompería el pool; se vuelve a lanzar, con su mensaje,
+        # al pedir el modelo
+        try:
+            get_model_registry().warm_up()
+        except ModelNotAvailableError as e:
+            logger.error(str(e))
+
+
+def _warm_up_models() -> Tuple[int, Dict[str, Any]]:
+    status = get_model_registry().warm_up()
+    if _warm_up_barrier is not None:
+        # Hasta que todos lleguen ningún proceso acepta otra tarea, así que
+        # cada una de las max_workers tareas de calentamiento cae en uno distinto
+        _warm_up_barrier.wait(timeout=WARM_UP_TIMEOUT)
+    return os.getpid(), status
+
+
+def _run_analysis(text: str, top_n: int, parts: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    analyzer = _worker_analyzer or TextAnalyzer()
+    return analyzer.analyze_text(text, top_n=top_n, parts=parts).model_dump()
+
+
+def _run_part(text: str, top_n: int, part: Optional[str]) -> Dict[str, Any]:
+    analyzer = _worker_analyzer or TextAnalyzer()
+    return analyzer.analyze_part(text, part, top_n)
+
+
+def _run_batch(texts: List[str], top_n: int, parts: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    analyzer = _worker_analyzer or TextAnalyzer()
+    return [analysis.model_dump() for analysis in analyzer.analyze_texts(texts, top_n=top_n, parts=parts)]
+
+
+# Clave de un lote: textos con el mismo top_n y las mismas partes
+BatchKey = Tuple[int, Optional[Tuple[str, ...]]]
+
+
+class AnalysisQueueFullError(Exception):
+    """Se alcanzó el máximo de análisis pendientes"""
+
+
+class AnalysisExecutor:
+    """
+    Ejecuta el análisis de texto (spaCy/TextBlob) fuera del event loop.
+
+    Con max_workers > 0 usa un pool de procesos que carga el modelo una vez
+    por proceso; con 0 usa el pool de hilos por defecto del event loop.
+    Como máximo admite max_pending análisis en curso o en cola; por encima
+    rechaza con AnalysisQueueFullError para aplicar contrapresión.
+
+    Con batch_window > 0 los análisis que llegan dentro de esa ventana (en
+    segundos) se agrupan en un solo trabajo de hasta batch_size textos, que
+    el worker procesa con nlp.pipe.
+
+    Los análisis concurrentes del mismo texto se calculan una sola vez
+    (single-flight), con un plazo de `timeout` segundos.
+    """
+
+    def __init__(
+            self,
+            max_workers: int,
+            max_pending: int,
+            batch_window: float = 0.0,
+            batch_size: int = 8,
+            timeout: Optional[float] = None
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.batch_window = batch_window
+        self.batch_size = batch_size
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.batches = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._batches: Dict[BatchKey, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self.flight = SingleFlight(timeout=timeout)
+        self._worker_models: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if self.max_workers > 0 and self._pool is None:
+            logger.info(f"Iniciando pool de análisis con {self.max_workers} procesos")
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(context.Barrier(self.max_workers),)
+            )
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """
+        Carga los modelos donde se analiza: en cada proceso del pool, que se
+        arrancan todos aquí en lugar de con las primeras solicitudes, o, sin
+        pool, en este mismo proceso. Lanza ModelNotAvailableError si falta
+        alguno.
+        """
+        self.start()
+        if self._pool is None:
+            _, status = await self._run(_warm_up_models)
+            return status
+
+        results = await asyncio.gather(*(self._run(_warm_up_models) for _ in range(self.max_workers)))
+        self._worker_models = {
+            "ready": all(status["ready"] for _, status in results),
+            "workers": len({pid for pid, _ in results}),
+            "models": results[0][1]["models"],
+        }
+        return self._worker_models
+
+    def models_status(self) -> Dict[str, Any]:
+        """
+        Estado de los modelos para la comprobación de disponibilidad; con
+        pool, listo solo cuando todos sus procesos los cargaron
+        """
+        if self.max_workers > 0:
+            return self._worker_models or {"ready": False, "models": {}}
+        return get_model_registry().status()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _reserve(self) -> None:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise AnalysisQueueFullError("Demasiados análisis pendientes, intente más tarde")
+
+        self.start()
+        self.pending += 1
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def analyze(
+            self,
+            text: str,
+            top_n: int = 10,
+            parts: Optional[Collection[str]] = None
+    ) -> ArticleAnalysis:
+        """
+        Analiza el texto; `parts` limita las partes opcionales (ver
+        ANALYSIS_PARTS), por defecto todas
+        """
+        parts = tuple(sorted(parts)) if parts is not None else None
+
+        # Solo el primero de los llamadores con el mismo texto ocupa un hueco
+        return await self.flight.do(self._flight_key(text, top_n, parts), lambda: self._analyze(text, top_n, parts))
+
+    async def analyze_stages(
+            self,
+            text: str,
+            top_n: int = 10,
+            parts: Optional[Collection[str]] = None
+    ) -> AsyncIterator[ArticleAnalysis]:
+        """
+        Como analyze, pero calcula las partes una tras otra (primero el conteo
+        y las palabras frecuentes, después sentimiento y entidades) y entrega
+        el análisis acumulado al terminar cada una; el último es el completo.
+
+        Ocupa un solo hueco y comparte el single-flight con analyze: si el
+        mismo análisis ya estaba en curso, solo se entrega el resultado final.
+        """
+        parts = tuple(sorted(parts)) if parts is not None else None
+        progress: asyncio.Queue = asyncio.Queue()
+
+        async def run() -> ArticleAnalysis:
+            self._reserve()
+            try:
+                analysis = ArticleAnalysis.model_validate(await self._run(_run_part, text, top_n, None))
+                progress.put_nowait(analysis)
+                for part in ANALYSIS_PARTS:
+                    if parts is None or part in parts:
+                        fields = await self._run(_run_part, text, top_n, part)
+                        analysis = ArticleAnalysis.model_validate({**analysis.model_dump(), **fields})
+                        progress.put_nowait(analysis)
+                self.completed += 1
+                return analysis
+            finally:
+                self.pending -= 1
+
+        flight = asyncio.ensure_future(self.flight.do(self._flight_key(text, top_n, parts), run))
+        flight.add_done_callback(lambda _: progress.put_nowait(None))
+        try:
+            analysis = None
+            while (partial := await progress.get()) is not None:
+                analysis = partial
+                yield analysis
+            if flight.result() is not analysis:
+                yield flight.result()
+        finally:
+            if not flight.done():
+                flight.cancel()
+
+    @staticmethod
+    def _flight_key(text: str, top_n: int, parts: Optional[Tuple[str, ...]]) -> str:
+        return f"{content_hash(text)}:{top_n}:{'*' if parts is None else ','.join(parts)}"
+
+    async def _analyze(self, text: str, top_n: int, parts: Optional[Tuple[str, ...]]) -> ArticleAnalysis:
+        self._reserve()
+        try:
+            if self.batch_window > 0:
+                data = await self._add_to_batch(text, (top_n, parts))
+            else:
+                data = await self._run(_run_analysis, text, top_n, parts)
+            self.completed += 1
+            return ArticleAnalysis.model_validate(data)
+        finally:
+            self.pending -= 1
+
+    async def analyze_many(self, texts: Sequence[str], top_n: int = 10) -> List[ArticleAnalysis]:
+        """
+        Analiza varios textos en un solo trabajo (p. ej. reanálisis masivo)
+        """
+        self._reserve()
+        try:
+            data = await self._run(_run_batch, list(texts), top_n, None)
+            self.completed += len(data)
+            return [ArticleAnalysis.model_validate(item) for item in data]
+        finally:
+            self.pending -= 1
+
+    def _add_to_batch(self, text: str, key: BatchKey) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._batches.setdefault(key, [])
+        batch.append((text, future))
+
+        if len(batch) >= self.batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.batch_window, self._flush, key)
+
+        return future
+
+    def _flush(self, key: BatchKey) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._batches.pop(key, [])
+        if not batch:
+            return
+
+        self.batches += 1
+        top_n, parts = key
+        task = asyncio.ensure_future(self._run(_run_batch, [text for text, _ in batch], top_n, parts))
+
+        def resolve(task: asyncio.Future) -> None:
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                elif task.exception() is not None:
+                    future.set_exception(task.exception())
+                else:
+                    future.set_result(task.result()[index])
+
+        task.add_done_callback(resolve)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "single_flight": self.flight.stats(),
+        }
+
+
+_executor: Optional[AnalysisExecutor] = None
+
+
+def get_analysis_executor() -> AnalysisExecutor:
+    global _executor
+
+    if _executor is None:
+        workers = settings.ANALYSIS_WORKERS
+        if workers is None:
+            workers = os.cpu_count() or 1
+        _executor = AnalysisExecutor(
+            max_workers=workers,
+            max_pending=settings.ANALYSIS_MAX_PENDING,
+            batch_window=settings.ANALYSIS_BATCH_WINDOW_MS / 1000,
+            batch_size=settings.ANALYSIS_BATCH_SIZE,
+            timeout=settings.ANALYSIS_TIMEOUT
+        )
+
+    return _executor
+
+
+def shutdown_analysis_executor() -> None:
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
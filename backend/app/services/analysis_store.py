@@ -0,0 +1,92 @@
+import hashlib
+from typing import Optional
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.dialects import dialect_insert
+from app.db.models import ArticleAnalysisRecord
+from app.schemas.article import ArticleAnalysis
+from app.services.analyzer import ANALYZER_VERSION
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class AnalysisStore:
+    """
+    Guarda los análisis calculados con la clave
+    (wikipedia_id, hash del contenido, versión del analizador).
+
+    Si Wikipedia publica una revisión nueva cambia el hash del contenido, y si
+    cambia el analizador cambia la versión; en ambos casos la búsqueda falla
+    y el análisis viejo se reemplaza al guardar el nuevo. Textos distintos de
+    la misma revisión (el texto guardado y el de Wikipedia) conservan cada
+    uno su análisis.
+    """
+
+    def __init__(self, db: AsyncSession, analyzer_version: str = ANALYZER_VERSION):
+        self.db = db
+        self.analyzer_version = analyzer_version
+
+    async def get(self, wikipedia_id: str, digest: str) -> Optional[ArticleAnalysis]:
+        record = await self.db.scalar(select(ArticleAnalysisRecord).filter(
+            ArticleAnalysisRecord.wikipedia_id == wikipedia_id,
+            ArticleAnalysisRecord.content_hash == digest,
+            ArticleAnalysisRecord.analyzer_version == self.analyzer_version
+        ).limit(1))
+
+        if record is None:
+            return None
+
+        return ArticleAnalysis(
+            word_count=record.word_count,
+            frequent_words=record.frequent_words,
+            sentiment=record.sentiment,
+            entities=record.entities
+        )
+
+    async def save(
+            self,
+            wikipedia_id: str,
+            digest: str,
+            analysis: ArticleAnalysis,
+            revision_id: Optional[int] = None
+    ) -> None:
+        """
+        Guarda el análisis sin confirmar la transacción: quien llama hace commit
+        """
+        # Los análisis de otras versiones del analizador, y los de otras
+        # revisiones si se conoce la actual, ya no sirven
+        stale = ArticleAnalysisRecord.analyzer_version != self.analyzer_version
+        if revision_id is not None:
+            stale = or_(stale, and_(
+                ArticleAnalysisRecord.revision_id.is_not(None),
+                ArticleAnalysisRecord.revision_id != revision_id
+            ))
+        await self.db.execute(delete(ArticleAnalysisRecord).where(
+            ArticleAnalysisRecord.wikipedia_id == wikipedia_id, stale
+        ).execution_options(synchronize_session=False))
+
+        data = analysis.model_dump()
+        insert = dialect_insert(self.db)
+        # Otra solicitud puede haber guardado el mismo análisis al mismo tiempo
+        await self.db.execute(insert(ArticleAnalysisRecord).values(
+            wikipedia_id=wikipedia_id,
+            content_hash=digest,
+            analyzer_version=self.analyzer_version,
+            revision_id=revision_id,
+            word_count=data["word_count"],
+            frequent_words=data["frequent_words"],
+            sentiment=data["sentiment"],
+            entities=data["entities"]
+        ).on_conflict_do_nothing(
+            index_elements=[
+                ArticleAnalysisRecord.wikipedia_id,
+                ArticleAnalysisRecord.content_hash,
+                ArticleAnalysisRecord.analyzer_version
+            ]
+        ))
+        logger.info(f"Análisis guardado para el artículo {wikipedia_id}")
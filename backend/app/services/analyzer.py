@@ -1,103 +1,160 @@
-from typing import List
-import re
-import nltk
-from collections import Counter
+from typing import Any, Collection, Dict, FrozenSet, List, Optional, Sequence, Union
+from app.core.config import settings
 from app.schemas.article import WordFrequency, ArticleAnalysis, SentimentAnalysis, Entity
-from textblob import TextBlob
-import spacy
+from app.services.entities import EntityEngine
+from app.services.model_registry import ModelRegistry, get_model_registry
+from app.services.sentiment import SentimentBackend, polarity_to_sentiment
+from app.services.tokenizer import TokenFilter, TokenizedDocument
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Cambiar cuando el análisis produzca resultados distintos para el mismo texto;
+# invalida los análisis guardados en el AnalysisStore. Otro motor de
+# sentimiento da otra polaridad, así que forma parte de la versión.
+ANALYZER_VERSION = "2" if settings.SENTIMENT_BACKEND == "textblob" else f"2-{settings.SENTIMENT_BACKEND}"
 
-from nltk.corpus import stopwords
+# Partes opcionales del análisis; el conteo y las palabras frecuentes se
+# calculan siempre porque son baratos
+ANALYSIS_PARTS = ("sentiment", "entities")
 
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    import subprocess
 
-    subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+class TextAnalyzer:
+    """
+    Servicio para analizar textos.
 
+    Crear uno es barato: los modelos vienen del ModelRegistry del proceso,
+    que los carga la primera vez que se usan y los comparte entre instancias.
+    """
 
-class TextAnalyzer:
-    """Servicio para analizar textos"""
+    def __init__(self, language: str = "english", registry: Optional[ModelRegistry] = None):
+        self.language = language
+        self.registry = registry or get_model_registry()
+        self._entity_engine: Optional[EntityEngine] = None
+
+    @property
+    def stop_words(self) -> FrozenSet[str]:
+        return self.registry.stop_words(self.language)
 
-    def __init__(self, language: str = "english"):
-        self.stop_words = set(stopwords.words(language))
+    @property
+    def token_filter(self) -> TokenFilter:
+        return self.registry.token_filter(self.language, min_length=3)
 
-    def count_words(self, text: str) -> int:
-        words = re.findall(r'\b\w+\b', text.lower())
-        return len(words)
+    @property
+    def entity_engine(self) -> EntityEngine:
+        if self._entity_engine is None:
+            self._entity_engine = EntityEngine(self.registry.ner())
+        return self._entity_engine
 
-    def get_frequent_words(self, text: str, top_n: int = 10) -> List[WordFrequency]:
-        words = re.findall(r'\b\w+\b', text.lower())
+    @property
+    def sentiment_backend(self) -> SentimentBackend:
+        return self.registry.sentiment()
 
-        # Filtrar stop words
-        filtered_words = [word for word in words if word not in self.stop_words and len(word) > 2]
+    @staticmethod
+    def tokenize(text: Union[str, TokenizedDocument]) -> TokenizedDocument:
+        if isinstance(text, TokenizedDocument):
+            return text
+        return TokenizedDocument(text)
 
-        word_counts = Counter(filtered_words)
+    def count_words(self, text: Union[str, TokenizedDocument]) -> int:
+        return self.tokenize(text).word_count
 
-        most_common = word_counts.most_common(top_n)
+    def get_frequent_words(self, text: Union[str, TokenizedDocument], top_n: int = 10) -> List[WordFrequency]:
+        # Filtrar stop words y palabras de menos de 3 letras
+        most_common = self.tokenize(text).frequent_words(top_n=top_n, token_filter=self.token_filter)
 
         return [WordFrequency(word=word, count=count) for word, count in most_common]
 
-    def analyze_sentiment(self, text: str) -> SentimentAnalysis:
-        blob = TextBlob(text)
-
-        polarity = blob.sentiment.polarity
-
-        # Convertir polaridad a etiquetas
-        if polarity > 0.1:
-            label = "Positive"
-            positive = 0.5 + polarity / 2
-            negative = 0.5 - polarity / 2
-            neutral = 0.5 - abs(polarity) / 2
-        elif polarity < -0.1:
-            label = "Negative"
-            positive = 0.5 + polarity / 2
-            negative = 0.5 - polarity / 2
-            neutral = 0.5 - abs(polarity) / 2
-        else:
-            label = "Neutral"
-            positive = 0.5 + polarity
-            negative = 0.5 - polarity
-            neutral = 0.8
-
-        return SentimentAnalysis(
-            label=label,
-            positive=positive,
-            negative=negative,
-            neutral=neutral
-        )
+    def analyze_sentiment(self, text: Union[str, TokenizedDocument]) -> SentimentAnalysis:
+        if isinstance(text, TokenizedDocument):
+            text = text.text
+
+        return polarity_to_sentiment(self.sentiment_backend.polarity(text))
 
     def extract_entities(self, text: str, max_entities: int = 20) -> List[Entity]:
-        # Limitar a 50k caracteres para rendimiento
-        doc = nlp(text[:50000])
-
-        entities = []
-        for ent in doc.ents:
-            entity = Entity(
-                text=ent.text,
-                type=ent.label_,
-                start=ent.start_char,
-                end=ent.end_char
-            )
-            entities.append(entity)
-
-        return entities[:max_entities]
-
-    def analyze_text(self, text: str, top_n: int = 10) -> ArticleAnalysis:
-        word_count = self.count_words(text)
-        frequent_words = self.get_frequent_words(text, top_n)
-        sentiment = self.analyze_sentiment(text)
-        entities = self.extract_entities(text)
+        """
+        Extrae las entidades de todo el texto, procesado por fragmentos
+        """
+        return self.entity_engine.extract(text, max_entities)
+
+    def extract_entities_many(self, texts: Sequence[str], max_entities: int = 20) -> List[List[Entity]]:
+        """
+        Extrae las entidades de varios textos en lotes con nlp.pipe
+        """
+        return self.entity_engine.extract_many(texts, max_entities)
+
+    def analyze_text(
+            self,
+            text: str,
+            top_n: int = 10,
+            parts: Optional[Collection[str]] = None
+    ) -> ArticleAnalysis:
+        """
+        Analiza el texto; `parts` limita las partes opcionales que se calculan
+        (por defecto todas)
+        """
+        parts = ANALYSIS_PARTS if parts is None else parts
+
+        # Una sola tokenización para el conteo y las frecuencias
+        document = TokenizedDocument(text)
+
+        word_count = self.count_words(document)
+        frequent_words = self.get_frequent_words(document, top_n)
+        sentiment = self.analyze_sentiment(document) if "sentiment" in parts else None
+        entities = self.extract_entities(text) if "entities" in parts else None
 
         return ArticleAnalysis(
             word_count=word_count,
             frequent_words=frequent_words,
             sentiment=sentiment,
             entities=entities
-        )
\ No newline at end of file
+        )
+
+    def analyze_part(self, text: str, part: Optional[str] = None, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Calcula una sola parte del análisis: None para el conteo y las
+        palabras frecuentes, o una de ANALYSIS_PARTS. Devuelve los campos de
+        ArticleAnalysis que le corresponden.
+        """
+        if part is None:
+            document = TokenizedDocument(text)
+            return {
+                "word_count": self.count_words(document),
+                "frequent_words": self.get_frequent_words(document, top_n)
+            }
+        if part == "sentiment":
+            return {"sentiment": self.analyze_sentiment(text)}
+        if part == "entities":
+            return {"entities": self.extract_entities(text)}
+        raise ValueError(f"Parte del análisis desconocida: {part}")
+
+    def analyze_texts(
+            self,
+            texts: Sequence[str],
+            top_n: int = 10,
+            parts: Optional[Collection[str]] = None
+    ) -> List[ArticleAnalysis]:
+        """
+        Analiza varios textos a la vez; las entidades y el sentimiento se
+        procesan en lote
+        """
+        parts = ANALYSIS_PARTS if parts is None else parts
+
+        if "entities" in parts:
+            entities_per_text = self.extract_entities_many(texts)
+        else:
+            entities_per_text = [None] * len(texts)
+
+        if "sentiment" in parts:
+            sentiments = [polarity_to_sentiment(polarity) for polarity in self.sentiment_backend.polarities(texts)]
+        else:
+            sentiments = [None] * len(texts)
+
+        analyses = []
+        for text, sentiment, entities in zip(texts, sentiments, entities_per_text):
+            document = TokenizedDocument(text)
+            analyses.append(ArticleAnalysis(
+                word_count=self.count_words(document),
+                frequent_words=self.get_frequent_words(document, top_n),
+                sentiment=sentiment,
+                entities=entities
+            ))
+
+        return analyses
@@ -0,0 +1,270 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models import SavedArticle
+from app.db.session import AsyncSessionLocal
+from app.services.analysis_executor import AnalysisExecutor, get_analysis_executor
+from app.services.analysis_store import AnalysisStore, content_hash
+from app.services.resilience import get_upstream_guard
+from app.services.saved_articles import replace_article_analysis
+from app.services.single_flight import get_single_flight
+from app.services.wiki_service import AsyncWikipediaService, parse_touched
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def revision_values(page: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Revisión de Wikipedia que se guarda con el artículo. El título y el
+    resumen no se tocan: el usuario puede haberlos editado.
+    """
+    return {
+        "revision_id": page.get("revision_id"),
+        "touched": parse_touched(page.get("touched")),
+    }
+
+
+async def refresh_saved_articles(
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor,
+        batch_size: int = 500,
+        concurrency: int = 4
+) -> Dict[str, int]:
+    """
+    Revisa los batch_size artículos guardados que hace más tiempo que no se
+    comprueban. Las revisiones se piden sin texto, 50 páginas por solicitud,
+    y solo se descargan y analizan de nuevo las páginas cuya revisión cambió,
+    de concurrency en concurrency. El coste depende de cuántos artículos
+    cambian, no del tamaño de la biblioteca.
+
+    Los artículos sin revisión conocida (guardados antes de registrarla)
+    solo anotan la actual, sin descargar ni analizar nada. Se actualizan el
+    análisis y la revisión, y el texto completo solo si ya estaba guardado.
+
+    Las páginas que fallan no se marcan como comprobadas, así que se
+    reintentan en la siguiente pasada.
+    """
+    rows = (await db.execute(
+        select(
+            SavedArticle.id,
+            SavedArticle.user_id,
+            SavedArticle.wikipedia_id,
+            SavedArticle.revision_id,
+            SavedArticle.full_text.is_not(None).label("has_text"),
+            SavedArticle.word_count,
+            SavedArticle.frequent_words,
+            SavedArticle.entities
+        )
+        # Primero los nunca comprobados (False < True), luego los más antiguos
+        .order_by(SavedArticle.last_checked_at.is_not(None), SavedArticle.last_checked_at, SavedArticle.id)
+        .limit(batch_size)
+    )).all()
+
+    result = {
+        "checked": len(rows), "changed_pages": 0, "refreshed": 0, "baselined": 0,
+        "missing_pages": 0, "failed_pages": 0
+    }
+    if not rows:
+        return result
+
+    # Varios usuarios pueden tener guardada la misma página
+    by_page: Dict[int, List[Row]] = {}
+    for row in rows:
+        if row.wikipedia_id.isdigit():
+            by_page.setdefault(int(row.wikipedia_id), []).append(row)
+
+    revisions = await wiki_service.get_revisions(list(by_page))
+    result["missing_pages"] = sum(1 for page_id in by_page if page_id not in revisions)
+
+    changed = []
+    for page_id, page_rows in by_page.items():
+        if page_id not in revisions:
+            continue
+        current = revisions[page_id]["revision_id"]
+        if any(row.revision_id is not None and row.revision_id != current for row in page_rows):
+            changed.append(page_id)
+            continue
+
+        unknown = [row.id for row in page_rows if row.revision_id is None]
+        if unknown:
+            await db.execute(
+                update(SavedArticle)
+                .where(SavedArticle.id.in_(unknown))
+                .values(**revision_values(revisions[page_id]), updated_at=SavedArticle.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            result["baselined"] += len(unknown)
+    await db.commit()
+    result["changed_pages"] = len(changed)
+
+    failed = set()
+    for start in range(0, len(changed), concurrency):
+        chunk = changed[start:start + concurrency]
+
+        page_errors: Dict[int, Exception] = {}
+        try:
+            details = await wiki_service.get_articles_details(chunk, include_content=True, errors=page_errors)
+        except Exception as e:
+            logger.error(f"Error al descargar artículos para refrescar: {str(e)}")
+            failed.update(chunk)
+            continue
+        for page_id, error in page_errors.items():
+            logger.error(f"Error al descargar el artículo {page_id} para refrescar: {str(error)}")
+            failed.add(page_id)
+
+        pages = [page_id for page_id in chunk if page_id in details]
+        analyses = await asyncio.gather(
+            *(executor.analyze(details[page_id].get("content") or "") for page_id in pages),
+            return_exceptions=True
+        )
+
+        analyzed = []
+        for page_id, analysis in zip(pages, analyses):
+            if isinstance(analysis, BaseException):
+                logger.error(f"Error al analizar el artículo {page_id}: {str(analysis)}")
+                failed.add(page_id)
+                continue
+
+            page = details[page_id]
+            stale = [row for row in by_page[page_id] if row.revision_id != page.get("revision_id")]
+            with_text = [row for row in stale if row.has_text]
+            without_text = [row for row in stale if not row.has_text]
+            if with_text:
+                await replace_article_analysis(
+                    db, with_text, analysis, full_text=page.get("content"), **revision_values(page)
+                )
+            if without_text:
+                await replace_article_analysis(db, without_text, analysis, **revision_values(page))
+            result["refreshed"] += len(stale)
+            analyzed.append((page_id, analysis))
+
+        await db.commit()
+
+        # El análisis nuevo también sirve a la vista de detalle
+        store = AnalysisStore(db)
+        for page_id, analysis in analyzed:
+            page = details[page_id]
+            await store.save(
+                str(page_id), content_hash(page.get("content") or ""), analysis, revision_id=page.get("revision_id")
+            )
+        await db.commit()
+
+    result["failed_pages"] = len(failed)
+
+    checked_ids = [
+        row.id for row in rows
+        if not (row.wikipedia_id.isdigit() and int(row.wikipedia_id) in failed)
+    ]
+    await db.execute(
+        update(SavedArticle)
+        .where(SavedArticle.id.in_(checked_ids))
+        .values(last_checked_at=func.now(), updated_at=SavedArticle.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    return result
+
+
+class ArticleRefresher:
+    """
+    Tarea en segundo plano que ejecuta refresh_saved_articles cada
+    `interval` segundos, con su propia sesión de base de datos
+    """
+
+    def __init__(
+            self,
+            wiki_service: AsyncWikipediaService,
+            interval: float,
+            batch_size: int,
+            concurrency: int
+    ):
+        self.wiki_service = wiki_service
+        self.interval = interval
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.runs = 0
+        self.errors = 0
+        self.totals: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            logger.info(f"Refresco de artículos guardados cada {self.interval:.0f} s")
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> Dict[str, int]:
+        async with AsyncSessionLocal() as db:
+            result = await refresh_saved_articles(
+                db, self.wiki_service, get_analysis_executor(), self.batch_size, self.concurrency
+            )
+
+        self.runs += 1
+        for key, value in result.items():
+            self.totals[key] = self.totals.get(key, 0) + value
+        logger.info(f"Artículos guardados comprobados: {result}")
+        return result
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error al refrescar los artículos guardados: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "errors": self.errors,
+            **self.totals,
+        }
+
+
+_refresher: Optional[ArticleRefresher] = None
+
+
+def get_article_refresher() -> ArticleRefresher:
+    global _refresher
+
+    if _refresher is None:
+        # Sin caché de respuestas: una revisión nueva debe descargarse de verdad
+        _refresher = ArticleRefresher(
+            AsyncWikipediaService(
+                flight=get_single_flight("wikipedia", timeout=settings.WIKIPEDIA_SINGLE_FLIGHT_TIMEOUT),
+                guard=get_upstream_guard()
+            ),
+            interval=settings.ARTICLE_REFRESH_INTERVAL,
+            batch_size=settings.ARTICLE_REFRESH_BATCH_SIZE,
+            concurrency=settings.ARTICLE_REFRESH_CONCURRENCY
+        )
+
+    return _refresher
+
+
+async def shutdown_article_refresher() -> None:
+    global _refresher
+
+    if _refresher is not None:
+        await _refresher.stop()
+        _refresher = None
+
+
+def article_refresher_stats() -> Optional[Dict[str, Any]]:
+    return _refresher.stats() if _refresher is not None else None
@@ -0,0 +1,77 @@
+import re
+from typing import List, Tuple
+from sqlalchemy import Float, column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.dialects import dialect_name
+from app.db.fulltext import FTS_TABLE, SEARCH_CONFIG, SEARCH_DOCUMENT
+from app.db.models import SavedArticle
+
+_TERM = re.compile(r"\w+")
+
+
+def _fts5_query(query: str) -> str:
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura: cada término
+    entre comillas y todos obligatorios, como plainto_tsquery
+    """
+    return " ".join(f'"{term}"' for term in _TERM.findall(query))
+
+
+async def search_saved_articles(
+        db: AsyncSession,
+        user_id: str,
+        query: str,
+        limit: int = 20
+) -> Tuple[List[Tuple[SavedArticle, float]], int]:
+    """
+    Busca en título, resumen, notas y texto completo de los artículos
+    guardados del usuario. Devuelve los `limit` primeros (artículo,
+    relevancia), de mayor a menor relevancia, y el total de coincidencias.
+    """
+    if not _TERM.search(query):
+        return [], 0
+
+    name = dialect_name(db)
+
+    if name == "postgresql":
+        document = literal_column(SEARCH_DOCUMENT)
+        ts_query = func.plainto_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), query)
+        rank = func.ts_rank(document, ts_query).label("rank")
+        statement = select(SavedArticle, rank).filter(
+            SavedArticle.user_id == user_id,
+            document.op("@@")(ts_query)
+        ).order_by(rank.desc(), SavedArticle.id)
+
+    elif name == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"))
+        # bm25 devuelve valores menores cuanto más relevante
+        rank = (-func.bm25(literal_column(FTS_TABLE), type_=Float)).label("rank")
+        statement = select(SavedArticle, rank).join(
+            fts, fts.c.rowid == SavedArticle.id
+        ).filter(
+            SavedArticle.user_id == user_id,
+            text(f"{FTS_TABLE} MATCH :match").bindparams(match=_fts5_query(query))
+        ).order_by(rank.desc(), SavedArticle.id)
+
+    else:
+        # Otros motores: coincidencia simple sin índice ni relevancia
+        pattern = f"%{query}%"
+        statement = select(SavedArticle, literal(0.0).label("rank")).filter(
+            SavedArticle.user_id == user_id,
+            or_(
+                SavedArticle.title.ilike(pattern),
+                SavedArticle.summary.ilike(pattern),
+                SavedArticle.personal_notes.ilike(pattern),
+                SavedArticle.full_text.ilike(pattern)
+            )
+        ).order_by(SavedArticle.id)
+
+    rows = (await db.execute(statement.limit(limit))).all()
+    matches = [(row.SavedArticle, row.rank) for row in rows]
+
+    # Solo hace falta contar si puede haber más coincidencias que las
+    # devueltas; bm25 no admite funciones de ventana, así que se cuenta aparte
+    if len(rows) < limit:
+        return matches, len(rows)
+    total = await db.scalar(statement.with_only_columns(func.count(SavedArticle.id)).order_by(None))
+    return matches, total
@@ -0,0 +1,184 @@
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.dialects import dialect_insert
+from app.db.models import EntityStat, WordCountBucketStat, WordStat
+from app.schemas.article import (
+    ArticleStatsResponse,
+    CorpusEntityStat,
+    CorpusWordStat,
+    WordCountBucket
+)
+
+# Límites inferiores de los intervalos de longitud (en palabras)
+WORD_COUNT_BUCKETS = (0, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+UNKNOWN_BUCKET = -1
+
+# Filas por INSERT ... ON CONFLICT (límite de parámetros de SQLite)
+UPSERT_CHUNK = 1000
+
+
+def word_count_bucket(word_count: Optional[int]) -> int:
+    if word_count is None:
+        return UNKNOWN_BUCKET
+    return WORD_COUNT_BUCKETS[max(bisect_right(WORD_COUNT_BUCKETS, word_count) - 1, 0)]
+
+
+def _field(item: Any, name: str, default: Any = None) -> Any:
+    # Los elementos llegan como modelos de Pydantic o como dicts leídos del JSON
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+class StatsDelta:
+    """
+    Cambios en los acumulados por usuario que produce guardar (+1) o
+    eliminar (-1) artículos. Se agrupan por clave antes de escribir, así cada
+    tabla se actualiza con unas pocas sentencias INSERT ... ON CONFLICT.
+
+    Las palabras se acumulan a partir de las frecuentes de cada artículo
+    (frequent_words), que es lo que se guarda de él.
+    """
+
+    def __init__(self):
+        self.words: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+        self.entities: Dict[Tuple[str, str, str], List[int]] = defaultdict(lambda: [0, 0])
+        self.lengths: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        self.removes = False
+
+    def __bool__(self) -> bool:
+        return bool(self.lengths)
+
+    def add(
+            self,
+            user_id: str,
+            word_count: Optional[int],
+            frequent_words: Optional[Iterable[Any]],
+            entities: Optional[Iterable[Any]],
+            sign: int = 1
+    ) -> None:
+        if sign < 0:
+            self.removes = True
+
+        length = self.lengths[(user_id, word_count_bucket(word_count))]
+        length[0] += sign
+        length[1] += sign * (word_count or 0)
+
+        for item in frequent_words or []:
+            word = self.words[(user_id, _field(item, "word")[:100])]
+            word[0] += sign * _field(item, "count", 0)
+            word[1] += sign
+
+        seen = set()
+        for item in entities or []:
+            key = (user_id, _field(item, "text")[:255], _field(item, "type")[:50])
+            entity = self.entities[key]
+            entity[0] += sign * _field(item, "count", 1)
+            if key not in seen:
+                entity[1] += sign
+                seen.add(key)
+
+    def statements(self, insert: Callable) -> List[Any]:
+        """
+        Sentencias que aplican el cambio; sirven tanto para una sesión
+        asíncrona como para una conexión síncrona
+        """
+        statements = []
+
+        tables = (
+            (WordStat, ("user_id", "word"), ("total_count", "article_count"), self.words),
+            (EntityStat, ("user_id", "text", "type"), ("mentions", "article_count"), self.entities),
+            (WordCountBucketStat, ("user_id", "bucket"), ("article_count", "word_total"), self.lengths),
+        )
+
+        for model, keys, counters, deltas in tables:
+            rows = [
+                {**dict(zip(keys, key)), **dict(zip(counters, values))}
+                for key, values in deltas.items()
+                if any(values)
+            ]
+
+            for start in range(0, len(rows), UPSERT_CHUNK):
+                statement = insert(model).values(rows[start:start + UPSERT_CHUNK])
+                statements.append(statement.on_conflict_do_update(
+                    index_elements=[getattr(model, key) for key in keys],
+                    set_={
+                        counter: getattr(model, counter) + getattr(statement.excluded, counter)
+                        for counter in counters
+                    }
+                ))
+
+            if self.removes:
+                users = {key[0] for key in deltas}
+                statements.append(delete(model).filter(
+                    model.user_id.in_(users),
+                    model.article_count <= 0
+                ))
+
+        return statements
+
+
+async def apply_stats_delta(db: AsyncSession, delta: StatsDelta) -> None:
+    """
+    Aplica el cambio dentro de la transacción en curso; quien llama hace commit
+    """
+    if not delta:
+        return
+
+    for statement in delta.statements(dialect_insert(db)):
+        await db.execute(statement)
+
+
+async def get_article_stats(db: AsyncSession, user_id: str, top_n: int = 20) -> ArticleStatsResponse:
+    """
+    Lee las estadísticas de la biblioteca del usuario de las tablas acumuladas,
+    sin recorrer los artículos guardados
+    """
+    words = await db.execute(
+        select(WordStat).filter(WordStat.user_id == user_id)
+        .order_by(WordStat.total_count.desc(), WordStat.word).limit(top_n)
+    )
+    entities = await db.execute(
+        select(EntityStat).filter(EntityStat.user_id == user_id)
+        .order_by(EntityStat.article_count.desc(), EntityStat.mentions.desc(), EntityStat.text).limit(top_n)
+    )
+    buckets = (await db.execute(
+        select(WordCountBucketStat).filter(WordCountBucketStat.user_id == user_id)
+        .order_by(WordCountBucketStat.bucket)
+    )).scalars().all()
+
+    distribution = []
+    for bucket in buckets:
+        if bucket.bucket == UNKNOWN_BUCKET:
+            distribution.append(WordCountBucket(articles=bucket.article_count))
+            continue
+
+        index = WORD_COUNT_BUCKETS.index(bucket.bucket)
+        upper = WORD_COUNT_BUCKETS[index + 1] - 1 if index + 1 < len(WORD_COUNT_BUCKETS) else None
+        distribution.append(WordCountBucket(
+            min_words=bucket.bucket,
+            max_words=upper,
+            articles=bucket.article_count
+        ))
+
+    total_articles = sum(bucket.article_count for bucket in buckets)
+    counted_articles = sum(bucket.article_count for bucket in buckets if bucket.bucket != UNKNOWN_BUCKET)
+    total_words = sum(bucket.word_total for bucket in buckets)
+
+    return ArticleStatsResponse(
+        total_articles=total_articles,
+        total_words=total_words,
+        average_words=total_words / counted_articles if counted_articles else 0.0,
+        top_words=[
+            CorpusWordStat(word=stat.word, count=stat.total_count, articles=stat.article_count)
+            for stat in words.scalars()
+        ],
+        top_entities=[
+            CorpusEntityStat(text=stat.text, type=stat.type, mentions=stat.mentions, articles=stat.article_count)
+            for stat in entities.scalars()
+        ],
+        word_count_distribution=distribution
+    )
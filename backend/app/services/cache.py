@@ -0,0 +1,422 @@
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import urlencode
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_cache_key(namespace: str, **params: Any) -> str:
+    """
+    Construye una clave a partir de parámetros normalizados: orden fijo,
+    texto sin espacios repetidos y en minúsculas
+    """
+    normalized = []
+    for name, value in sorted(params.items()):
+        if isinstance(value, str):
+            value = _WHITESPACE.sub(" ", value).strip().lower()
+        elif isinstance(value, bool):
+            value = int(value)
+        normalized.append((name, value))
+
+    return f"{namespace}:{urlencode(normalized)}"
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Tamaño aproximado en bytes de un valor de la caché: la longitud de sus
+    textos más una cantidad fija por elemento. Basta para que los detalles
+    con el texto completo de un artículo pesen lo que ocupan.
+    """
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return 64 + sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 64 + sum(approximate_size(item) for item in value)
+    return 16
+
+
+class TTLCache:
+    """
+    Caché LRU en memoria del proceso con expiración por entrada.
+
+    Una entrada es fresca durante `ttl` segundos y después se conserva como
+    obsoleta durante `stale_ttl` segundos más para servirla mientras se revalida.
+    Pasado ese plazo aún se guarda `fallback_ttl` segundos, pero solo se
+    devuelve con get_fallback() cuando no se puede obtener una respuesta nueva.
+
+    Guarda como mucho max_entries entradas y, con max_bytes, como mucho ese
+    tamaño aproximado en total; un valor mayor que max_bytes no se guarda.
+    """
+
+    def __init__(
+            self,
+            max_entries: int,
+            ttl: float,
+            stale_ttl: float = 0.0,
+            clock: Callable[[], float] = time.monotonic,
+            fallback_ttl: float = 0.0,
+            max_bytes: Optional[int] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.fallback_ttl = fallback_ttl
+        self.clock = clock
+        self.bytes = 0
+        # Clave -> (valor, momento en que se guardó, tamaño aproximado)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _delete(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Devuelve (valor, es_fresco) o None si no existe o ya caducó del todo
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, stored_at, _ = entry
+        age = self.clock() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            if age > self.ttl + self.stale_ttl + self.fallback_ttl:
+                self._delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value, age <= self.ttl
+
+    def get_fallback(self, key: str) -> Optional[Any]:
+        """
+        Devuelve el valor guardado, por antiguo que sea, mientras no haya
+        superado ttl + stale_ttl + fallback_ttl
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, stored_at, _ = entry
+        if self.clock() - stored_at > self.ttl + self.stale_ttl + self.fallback_ttl:
+            self._delete(key)
+            return None
+
+        return value
+
+    def set(self, key: str, value: Any, age: float = 0.0) -> None:
+        if key in self._entries:
+            self._delete(key)
+
+        size = approximate_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        self._entries[key] = (value, self.clock() - age, size)
+        self.bytes += size
+
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            self._delete(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+
+class SQLiteCacheBackend:
+    """
+    Nivel compartido de la caché en un archivo SQLite, para que varios
+    workers de uvicorn reutilicen las mismas respuestas.
+
+    Los valores se guardan como JSON. Con max_bytes, al purgar se borran
+    las entradas más antiguas hasta que el total de los valores no lo supere.
+    """
+
+    # Cada cuántas escrituras se purgan las entradas caducadas
+    PURGE_EVERY = 256
+
+    def __init__(
+            self,
+            path: str,
+            ttl: float,
+            stale_ttl: float = 0.0,
+            clock: Callable[[], float] = time.time,
+            max_bytes: Optional[int] = None
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._written_bytes = 0
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Devuelve (valor, antigüedad en segundos) o None si no existe o ya caducó
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        value, stored_at = row
+        age = self.clock() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            return None
+
+        return json.loads(value), age
+
+    def set(self, key: str, value: Any) -> None:
+        now = self.clock()
+        encoded = json.dumps(value)
+        if self.max_bytes is not None and len(encoded) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, encoded, now)
+            )
+
+            self._writes += 1
+            self._written_bytes += len(encoded)
+            # También tras escribir una fracción de max_bytes, para que unos
+            # pocos artículos enormes no hagan crecer el archivo sin límite
+            if self._writes % self.PURGE_EVERY == 0 or (
+                    self.max_bytes is not None and self._written_bytes > self.max_bytes / 4
+            ):
+                self._purge(now)
+
+    def _purge(self, now: float) -> None:
+        self._written_bytes = 0
+        self._conn.execute(
+            "DELETE FROM response_cache WHERE stored_at < ?",
+            (now - self.ttl - self.stale_ttl,)
+        )
+        if self.max_bytes is None:
+            return
+
+        total = 0
+        evicted = []
+        for key, size in self._conn.execute(
+                "SELECT key, LENGTH(value) FROM response_cache ORDER BY stored_at DESC"
+        ):
+            total += size
+            if total > self.max_bytes:
+                evicted.append((key,))
+        self._conn.executemany("DELETE FROM response_cache WHERE key = ?", evicted)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """
+    Caché por niveles: LRU local primero y, si está configurado, el nivel
+    compartido en SQLite.
+
+    Las entradas obsoletas se sirven de inmediato y se revalidan en segundo
+    plano (stale-while-revalidate); si el origen falla, se sirven las
+    caducadas que aún conserve el nivel local.
+    """
+
+    def __init__(self, local: TTLCache, shared: Optional[SQLiteCacheBackend] = None):
+        self.local = local
+        self.shared = shared
+        self.hits = 0
+        self.shared_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fallback_hits = 0
+        self.refresh_errors = 0
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def lookup(
+            self,
+            key: str,
+            decode: Callable[[Any], Any] = lambda value: value
+    ) -> Optional[Tuple[Any, bool]]:
+        """
+        Busca en los dos niveles sin contar aciertos; devuelve (valor, es_fresco)
+        """
+        cached = self.local.get(key)
+
+        if cached is None and self.shared is not None:
+            shared_entry = await asyncio.to_thread(self.shared.get, key)
+            if shared_entry is not None:
+                value, age = shared_entry
+                cached = decode(value), age <= self.shared.ttl
+                # Se conserva la antigüedad para no alargar la vida de la entrada
+                self.local.set(key, cached[0], age=age)
+                self.shared_hits += 1
+
+        return cached
+
+    async def set(self, key: str, value: Any, encode: Callable[[Any], Any] = lambda value: value) -> None:
+        self.local.set(key, value)
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.set, key, encode(value))
+
+    async def get_or_load(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            encode: Callable[[Any], Any] = lambda value: value,
+            decode: Callable[[Any], Any] = lambda value: value
+    ) -> Any:
+        """
+        Devuelve el valor de la caché o lo calcula con `loader`.
+
+        `encode`/`decode` convierten entre el valor y su forma JSON para el
+        nivel compartido; el nivel local guarda el valor tal cual.
+        """
+        cached = await self.lookup(key, decode)
+
+        if cached is not None:
+            value, fresh = cached
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._schedule_refresh(key, loader, encode)
+            return value
+
+        self.misses += 1
+        try:
+            value = await loader()
+        except Exception:
+            fallback = self.fallback(key)
+            if fallback is None:
+                raise
+            return fallback
+
+        await self.set(key, value, encode)
+        return value
+
+    def fallback(self, key: str) -> Optional[Any]:
+        """
+        Respuesta caducada para cuando el origen falla (por ejemplo, con el
+        circuito de Wikipedia abierto); solo en el nivel local
+        """
+        value = self.local.get_fallback(key)
+        if value is not None:
+            self.fallback_hits += 1
+            logger.warning(f"Origen no disponible; se sirve la respuesta caducada de {key}")
+        return value
+
+    def _schedule_refresh(
+            self,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            encode: Callable[[Any], Any]
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                await self.set(key, await loader(), encode)
+            except Exception as e:
+                self.refresh_errors += 1
+                logger.warning(f"No se pudo revalidar la entrada de caché {key}: {str(e)}")
+            finally:
+                self._refreshing.discard(key)
+
+        self._refreshing.add(key)
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fallback_hits": self.fallback_hits,
+            "refresh_errors": self.refresh_errors,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "local_entries": len(self.local),
+            "local_bytes": self.local.bytes,
+        }
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self.shared is not None:
+            self.shared.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def create_response_cache() -> ResponseCache:
+    local = TTLCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        ttl=settings.CACHE_TTL_SECONDS,
+        stale_ttl=settings.CACHE_STALE_SECONDS,
+        fallback_ttl=settings.CACHE_FALLBACK_SECONDS,
+        max_bytes=settings.CACHE_MAX_BYTES or None,
+    )
+
+    shared = None
+    if settings.CACHE_SQLITE_PATH:
+        shared = SQLiteCacheBackend(
+            settings.CACHE_SQLITE_PATH,
+            ttl=settings.CACHE_TTL_SECONDS,
+            stale_ttl=settings.CACHE_STALE_SECONDS,
+            max_bytes=settings.CACHE_SQLITE_MAX_BYTES or None,
+        )
+
+    return ResponseCache(local, shared)
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Devuelve la caché del proceso, creándola si todavía no existe
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = create_response_cache()
+
+    return _cache
+
+
+async def close_response_cache() -> None:
+    global _cache
+
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
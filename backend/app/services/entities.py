@@ -0,0 +1,148 @@
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.schemas.article import Entity
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+# Componentes de los pipelines de spaCy que la extracción de entidades no usa
+UNUSED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer"]
+
+# Fin de oración: signo de puntuación (y cierre de comillas o paréntesis) seguido de espacio
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s")
+
+
+def _find_cut(text: str, start: int, end: int) -> int:
+    """
+    Busca el mejor punto de corte en text[start:end]: fin de párrafo, fin de
+    línea, fin de oración o espacio, en ese orden de preferencia. Los cortes
+    por párrafo, línea u oración deben caer en la segunda mitad de la ventana
+    para no generar fragmentos diminutos.
+    """
+    middle = start + (end - start) // 2
+
+    for separator in ("\n\n", "\n"):
+        cut = text.rfind(separator, middle, end)
+        if cut >= middle:
+            return cut + len(separator)
+
+    last_sentence = None
+    for match in _SENTENCE_END.finditer(text, middle, end):
+        last_sentence = match
+    if last_sentence is not None:
+        return last_sentence.end()
+
+    cut = text.rfind(" ", start, end)
+    if cut > start:
+        return cut + 1
+
+    return end
+
+
+def split_into_chunks(text: str, max_chars: int) -> Iterator[Tuple[int, str]]:
+    """
+    Divide el texto en fragmentos de como máximo max_chars caracteres,
+    cortando preferentemente entre párrafos u oraciones.
+
+    Devuelve (posición inicial en el texto, fragmento); los fragmentos que
+    solo contienen espacios se omiten.
+    """
+    start = 0
+    length = len(text)
+
+    while start < length:
+        end = min(start + max_chars, length)
+        if end < length:
+            end = _find_cut(text, start, end)
+
+        chunk = text[start:end]
+        if chunk.strip():
+            yield start, chunk
+        start = end
+
+
+def load_ner_pipeline(model_name: str) -> "Language":
+    """
+    Carga un modelo de spaCy solo con lo necesario para NER.
+
+    El tok2vec compartido se elimina si el componente ner no lo escucha
+    (en los modelos *_sm el ner tiene su propia capa de embeddings).
+    spaCy se importa aquí porque su importación ya tarda casi un segundo.
+    """
+    import spacy
+
+    nlp = spacy.load(model_name, exclude=UNUSED_COMPONENTS)
+
+    if "tok2vec" in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+        if "ner" not in listeners:
+            nlp.remove_pipe("tok2vec")
+
+    return nlp
+
+
+class EntityEngine:
+    """
+    Extrae entidades nombradas de uno o varios documentos con nlp.pipe.
+
+    Los documentos se procesan completos, divididos en fragmentos de tamaño
+    acotado; las entidades se unen con sus posiciones globales, sin
+    duplicados y ordenadas por frecuencia.
+    """
+
+    def __init__(
+            self,
+            nlp: "Language",
+            batch_size: Optional[int] = None,
+            n_process: Optional[int] = None,
+            chunk_size: Optional[int] = None
+    ):
+        self.nlp = nlp
+        self.batch_size = batch_size or settings.NER_BATCH_SIZE
+        self.n_process = n_process or settings.NER_N_PROCESS
+        self.chunk_size = chunk_size or settings.NER_CHUNK_SIZE
+
+    def _chunks(self, texts: Iterable[str]) -> Iterator[Tuple[str, Tuple[int, int]]]:
+        for index, text in enumerate(texts):
+            for offset, chunk in split_into_chunks(text, self.chunk_size):
+                yield chunk, (index, offset)
+
+    def extract(self, text: str, max_entities: int = 20) -> List[Entity]:
+        return self.extract_many([text], max_entities)[0]
+
+    def extract_many(self, texts: Sequence[str], max_entities: int = 20) -> List[List[Entity]]:
+        counts: List[Counter] = [Counter() for _ in texts]
+        first_seen: List[Dict[Tuple[str, str], Tuple[int, int]]] = [{} for _ in texts]
+
+        docs = self.nlp.pipe(
+            self._chunks(texts),
+            as_tuples=True,
+            batch_size=self.batch_size,
+            n_process=self.n_process
+        )
+
+        for doc, (index, offset) in docs:
+            for ent in doc.ents:
+                key = (ent.text, ent.label_)
+                counts[index][key] += 1
+                if key not in first_seen[index]:
+                    first_seen[index][key] = (offset + ent.start_char, offset + ent.end_char)
+
+        results = []
+        for doc_counts, doc_first_seen in zip(counts, first_seen):
+            # sorted es estable: los empates quedan en orden de aparición
+            ranked = sorted(doc_first_seen, key=lambda key: -doc_counts[key])[:max_entities]
+            results.append([
+                Entity(
+                    text=text,
+                    type=label,
+                    start=doc_first_seen[(text, label)][0],
+                    end=doc_first_seen[(text, label)][1],
+                    count=doc_counts[(text, label)]
+                )
+                for text, label in ranked
+            ])
+
+        return results
@@ -0,0 +1,53 @@
+import httpx
+from typing import Optional
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Crea un cliente HTTP/1.1 con keep-alive y pool de conexiones.
+
+    Todo el tráfico va al mismo host (la API de Wikipedia), por lo que los
+    límites del pool funcionan como límites por host.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.WIKIPEDIA_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.WIKIPEDIA_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.WIKIPEDIA_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.WIKIPEDIA_TIMEOUT,
+        connect=settings.WIKIPEDIA_CONNECT_TIMEOUT,
+    )
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        headers={"User-Agent": f"{settings.PROJECT_NAME}/{settings.VERSION}"},
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Devuelve el cliente compartido, creándolo si todavía no existe
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+
+    if _client is not None:
+        logger.info("Cerrando cliente HTTP compartido")
+        await _client.aclose()
+        _client = None
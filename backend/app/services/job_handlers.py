@@ -0,0 +1,177 @@
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models import SavedArticle
+from app.schemas.article import SavedArticleCreate
+from app.schemas.job import (
+    AnalyzeArticlePayload,
+    FetchArticlePayload,
+    FetchFullTextPayload,
+    ImportArticlesPayload,
+    ReanalyzeArticlesPayload
+)
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.analysis_store import AnalysisStore, content_hash
+from app.services.job_queue import PermanentJobError
+from app.services.saved_articles import import_articles, replace_article_analysis
+from app.services.wiki_service import AsyncWikipediaService
+
+JobHandler = Callable[[BaseModel, AsyncSession, AsyncWikipediaService, AnalysisExecutor], Awaitable[Dict[str, Any]]]
+
+
+async def _fetch_page(wiki_service: AsyncWikipediaService, page_id: int) -> Dict[str, Any]:
+    details = await wiki_service.get_articles_details([page_id], include_content=True)
+    if page_id not in details:
+        raise PermanentJobError(f"Artículo {page_id} no encontrado en Wikipedia")
+    return details[page_id]
+
+
+async def fetch_article(
+        payload: FetchArticlePayload,
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor
+) -> Dict[str, Any]:
+    page = await _fetch_page(wiki_service, payload.page_id)
+    article = SavedArticleCreate(
+        title=page.get("title") or "",
+        wikipedia_id=str(payload.page_id),
+        wikipedia_url=page.get("url") or "",
+        summary=page.get("summary"),
+        full_text=page.get("content"),
+        revision_id=page.get("revision_id"),
+        touched=page.get("touched"),
+        user_id=payload.user_id
+    )
+    [result] = await import_articles(db, [article], wiki_service, executor=executor)
+    return result.model_dump()
+
+
+async def fetch_full_text(
+        payload: FetchFullTextPayload,
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor
+) -> Dict[str, Any]:
+    article = (await db.execute(
+        select(SavedArticle.wikipedia_id, SavedArticle.full_text.is_not(None).label("has_text"))
+        .where(SavedArticle.id == payload.article_id)
+    )).first()
+    if article is None or article.has_text:
+        return {"updated": 0}
+    if not article.wikipedia_id.isdigit():
+        raise PermanentJobError(f"wikipedia_id {article.wikipedia_id} no es un ID de página válido")
+
+    page = await _fetch_page(wiki_service, int(article.wikipedia_id))
+    updated = await db.execute(
+        update(SavedArticle)
+        .where(SavedArticle.id == payload.article_id, SavedArticle.full_text.is_(None))
+        .values(full_text=page.get("content"), updated_at=SavedArticle.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return {"updated": updated.rowcount}
+
+
+async def analyze_article(
+        payload: AnalyzeArticlePayload,
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor
+) -> Dict[str, Any]:
+    page = await _fetch_page(wiki_service, payload.page_id)
+    content = page.get("content") or ""
+
+    store = AnalysisStore(db)
+    digest = content_hash(content)
+    analysis = await store.get(str(payload.page_id), digest)
+    cached = analysis is not None
+    if not cached:
+        analysis = await executor.analyze(content)
+        await store.save(str(payload.page_id), digest, analysis, revision_id=page.get("revision_id"))
+        await db.commit()
+
+    return {"page_id": payload.page_id, "word_count": analysis.word_count, "cached": cached}
+
+
+async def import_articles_job(
+        payload: ImportArticlesPayload,
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor
+) -> Dict[str, Any]:
+    results = await import_articles(
+        db, payload.items, wiki_service, payload.fetch_content, executor if payload.analyze else None
+    )
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {"results": [result.model_dump() for result in results], "counts": counts}
+
+
+async def reanalyze_articles(
+        payload: ReanalyzeArticlesPayload,
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor
+) -> Dict[str, Any]:
+    """
+    Vuelve a analizar el texto completo guardado (por ejemplo tras cambiar
+    de analizador), en lotes que se confirman uno a uno
+    """
+    query = select(
+        SavedArticle.id,
+        SavedArticle.user_id,
+        SavedArticle.full_text,
+        SavedArticle.word_count,
+        SavedArticle.frequent_words,
+        SavedArticle.entities
+    ).where(SavedArticle.user_id == payload.user_id, SavedArticle.full_text.is_not(None))
+    if payload.article_ids is not None:
+        query = query.where(SavedArticle.id.in_(payload.article_ids))
+    rows = (await db.execute(query.order_by(SavedArticle.id))).all()
+
+    batch_size = max(settings.ANALYSIS_BATCH_SIZE, 1)
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        analyses = await executor.analyze_many([row.full_text for row in batch])
+        for row, analysis in zip(batch, analyses):
+            await replace_article_analysis(db, [row], analysis)
+        await db.commit()
+
+    return {"reanalyzed": len(rows)}
+
+
+# Tipo de trabajo -> (modelo del payload, función que lo ejecuta)
+JOB_HANDLERS: Dict[str, Tuple[Type[BaseModel], JobHandler]] = {
+    "fetch_article": (FetchArticlePayload, fetch_article),
+    "fetch_full_text": (FetchFullTextPayload, fetch_full_text),
+    "analyze_article": (AnalyzeArticlePayload, analyze_article),
+    "import_articles": (ImportArticlesPayload, import_articles_job),
+    "reanalyze_articles": (ReanalyzeArticlesPayload, reanalyze_articles),
+}
+
+
+def validate_payload(job_type: str, payload: Dict[str, Any]) -> BaseModel:
+    """
+    Valida el payload con el modelo del tipo de trabajo; lanza
+    pydantic.ValidationError si no es válido
+    """
+    if job_type not in JOB_HANDLERS:
+        raise PermanentJobError(f"Tipo de trabajo desconocido: {job_type}")
+    model, _ = JOB_HANDLERS[job_type]
+    return model.model_validate(payload)
+
+
+async def run_job(
+        job_type: str,
+        payload: Dict[str, Any],
+        db: AsyncSession,
+        wiki_service: AsyncWikipediaService,
+        executor: AnalysisExecutor
+) -> Dict[str, Any]:
+    validated = validate_payload(job_type, payload)
+    _, handler = JOB_HANDLERS[job_type]
+    return await handler(validated, db, wiki_service, executor)
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Collection, Dict, List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.dialects import dialect_name
+from app.db.models import Job
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """El trabajo no puede completarse; no se reintenta"""
+
+
+def utcnow() -> datetime:
+    """
+    Fecha actual en UTC sin zona horaria, como las columnas DateTime de jobs
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def enqueue(
+        db: AsyncSession,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        max_attempts: int = 3
+) -> Job:
+    job = Job(
+        type=job_type,
+        payload=payload,
+        status="queued",
+        priority=priority,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=utcnow()
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[Job]:
+    return await db.get(Job, job_id)
+
+
+async def claim_jobs(
+        db: AsyncSession,
+        worker_id: str,
+        limit: int,
+        exclude_types: Collection[str] = ()
+) -> List[Job]:
+    """
+    Marca como en curso hasta `limit` trabajos pendientes, los de mayor
+    prioridad primero, y los devuelve. Es una sola sentencia UPDATE, así que
+    dos workers nunca reclaman el mismo trabajo; en PostgreSQL las filas
+    bloqueadas por otro worker se saltan (SKIP LOCKED).
+    """
+    if limit <= 0:
+        return []
+
+    now = utcnow()
+    candidates = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_after <= now)
+        .order_by(Job.priority.desc(), Job.id)
+        .limit(limit)
+    )
+    if exclude_types:
+        candidates = candidates.where(Job.type.not_in(list(exclude_types)))
+    if dialect_name(db) == "postgresql":
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    jobs = list(await db.scalars(
+        update(Job)
+        .where(Job.id.in_(candidates.scalar_subquery()), Job.status == "queued")
+        .values(
+            status="running",
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            locked_at=now,
+            started_at=now
+        )
+        .returning(Job)
+        # Los trabajos ya cargados en la sesión se actualizan con las filas devueltas
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ))
+    await db.commit()
+
+    return sorted(jobs, key=lambda job: (-job.priority, job.id))
+
+
+async def renew_job_lock(db: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """
+    Renueva el bloqueo de un trabajo en curso de este worker para que no se
+    tome por abandonado; devuelve False si ya no es suyo (se reencoló)
+    """
+    renewed = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+        .values(locked_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return renewed.rowcount > 0
+
+
+async def complete_job(
+        db: AsyncSession,
+        job_id: int,
+        worker_id: str,
+        result: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    Marca como completado un trabajo en curso de este worker; devuelve False
+    si ya no es suyo (se reencoló por abandonado y quizá lo tiene otro)
+    """
+    completed = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+        .values(status="succeeded", result=result, error=None, finished_at=utcnow(), locked_by=None, locked_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return completed.rowcount > 0
+
+
+async def fail_job(db: AsyncSession, job: Job, worker_id: str, error: str, permanent: bool = False) -> Optional[str]:
+    """
+    Registra el error del intento y vuelve a encolar el trabajo con espera
+    exponencial (JOB_RETRY_DELAY, el doble, ...) o, si era permanente o no
+    quedan intentos, lo marca como fallido. Devuelve el estado nuevo, o
+    None si el trabajo ya no era de este worker.
+    """
+    values: Dict[str, Any] = {"error": error, "locked_by": None, "locked_at": None}
+
+    if permanent or job.attempts >= job.max_attempts:
+        values.update(status="failed", finished_at=utcnow())
+    else:
+        delay = settings.JOB_RETRY_DELAY * 2 ** max(job.attempts - 1, 0)
+        values.update(status="queued", run_after=utcnow() + timedelta(seconds=delay))
+
+    failed = await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "running", Job.locked_by == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    return values["status"] if failed.rowcount else None
+
+
+async def requeue_stale_jobs(db: AsyncSession, lock_timeout: float) -> int:
+    """
+    Devuelve a la cola los trabajos en curso cuyo worker no renovó el
+    bloqueo en lock_timeout segundos (se cayó o lo detuvieron); los que ya
+    agotaron sus intentos se marcan como fallidos
+    """
+    now = utcnow()
+    stale = (Job.status == "running", Job.locked_at < now - timedelta(seconds=lock_timeout))
+    unlocked = {"locked_by": None, "locked_at": None, "error": "El worker no completó el trabajo a tiempo"}
+
+    failed = await db.execute(
+        update(Job)
+        .where(*stale, Job.attempts >= Job.max_attempts)
+        .values(status="failed", finished_at=now, **unlocked)
+        .execution_options(synchronize_session=False)
+    )
+    requeued = await db.execute(
+        update(Job)
+        .where(*stale)
+        .values(status="queued", run_after=now, **unlocked)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+    if failed.rowcount or requeued.rowcount:
+        logger.warning(f"Trabajos abandonados: {requeued.rowcount} reencolados, {failed.rowcount} fallidos")
+    return requeued.rowcount
+
@@ -0,0 +1,210 @@
+import asyncio
+import os
+import socket
+import time
+from typing import Any, Dict, Optional, Set
+from pydantic import ValidationError as PayloadValidationError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.db.models import Job
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.job_handlers import run_job
+from app.services.job_queue import (
+    PermanentJobError,
+    claim_jobs,
+    complete_job,
+    fail_job,
+    renew_job_lock,
+    requeue_stale_jobs
+)
+from app.services.wiki_service import AsyncWikipediaService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Reclama trabajos de la cola y los ejecuta, como máximo `concurrency` a
+    la vez y, para los tipos de type_limits, como máximo ese número del
+    tipo. Los límites son de este proceso: con varios workers se suman.
+
+    Cada trabajo usa su propia sesión de base de datos y renueva su
+    bloqueo cada lock_timeout / 3 segundos mientras se ejecuta, así que
+    solo vuelve a la cola si el worker deja de responder. Si falla se
+    reintenta con espera exponencial hasta agotar sus intentos, salvo los
+    errores permanentes (payload inválido, artículo inexistente).
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker,
+            wiki_service: AsyncWikipediaService,
+            executor: AnalysisExecutor,
+            concurrency: int = 4,
+            type_limits: Optional[Dict[str, int]] = None,
+            poll_interval: float = 1.0,
+            lock_timeout: float = 600.0,
+            worker_id: Optional[str] = None
+    ):
+        self.session_factory = session_factory
+        self.wiki_service = wiki_service
+        self.executor = executor
+        self.concurrency = concurrency
+        self.type_limits = type_limits or {}
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.lost = 0
+        # Tipo de cada trabajo en curso (por id) y las tareas que los ejecutan
+        self._running: Dict[int, str] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self._last_stale_check = 0.0
+
+    def _blocked_types(self) -> Set[str]:
+        running: Dict[str, int] = {}
+        for job_type in self._running.values():
+            running[job_type] = running.get(job_type, 0) + 1
+        return {job_type for job_type, limit in self.type_limits.items() if running.get(job_type, 0) >= limit}
+
+    async def _claim(self) -> int:
+        """
+        Reclama trabajos para los huecos libres y los lanza; devuelve cuántos
+        """
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+
+        async with self.session_factory() as db:
+            if time.monotonic() - self._last_stale_check >= self.lock_timeout / 4:
+                self._last_stale_check = time.monotonic()
+                await requeue_stale_jobs(db, self.lock_timeout)
+
+            claimed = 0
+            # De uno en uno mientras haya tipos con límite, para no reclamar
+            # más trabajos de un tipo de los que admite
+            limit = 1 if self.type_limits else free
+            while claimed < free:
+                jobs = await claim_jobs(db, self.worker_id, limit, exclude_types=self._blocked_types())
+                for job in jobs:
+                    self._running[job.id] = job.type
+                    task = asyncio.create_task(self._process(job))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                claimed += len(jobs)
+                if len(jobs) < limit:
+                    break
+
+        return claimed
+
+    async def _process(self, job: Job) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self._execute(job)
+        finally:
+            heartbeat.cancel()
+            # Antes de que termine la tarea: quien la espera ya ve el hueco libre
+            self._running.pop(job.id, None)
+
+    async def _heartbeat(self, job: Job) -> None:
+        while True:
+            await asyncio.sleep(self.lock_timeout / 3)
+            try:
+                async with self.session_factory() as db:
+                    if not await renew_job_lock(db, job.id, self.worker_id):
+                        logger.warning(f"Trabajo {job.id} ya no está bloqueado por este worker")
+                        return
+            except Exception as e:
+                logger.error(f"Error al renovar el bloqueo del trabajo {job.id}: {str(e)}")
+
+    async def _execute(self, job: Job) -> None:
+        logger.info(f"Trabajo {job.id} ({job.type}), intento {job.attempts} de {job.max_attempts}")
+        start = time.perf_counter()
+
+        try:
+            async with self.session_factory() as db:
+                result = await run_job(job.type, job.payload, db, self.wiki_service, self.executor)
+        except Exception as e:
+            permanent = isinstance(e, (PermanentJobError, PayloadValidationError))
+            async with self.session_factory() as db:
+                status = await fail_job(db, job, self.worker_id, str(e) or type(e).__name__, permanent=permanent)
+            if status is None:
+                self._lost(job)
+            elif status == "failed":
+                self.failed += 1
+                logger.error(f"Trabajo {job.id} fallido: {str(e)}")
+            else:
+                self.retried += 1
+                logger.warning(f"Trabajo {job.id} se reintentará: {str(e)}")
+            return
+
+        async with self.session_factory() as db:
+            if not await complete_job(db, job.id, self.worker_id, result):
+                self._lost(job)
+                return
+        self.succeeded += 1
+        logger.info(f"Trabajo {job.id} completado en {time.perf_counter() - start:.2f} s")
+
+    def _lost(self, job: Job) -> None:
+        # Se reencoló por abandonado mientras se ejecutaba: el resultado de
+        # este intento se descarta y el estado lo decide quien lo tenga ahora
+        self.lost += 1
+        logger.warning(f"Trabajo {job.id} ya no está bloqueado por este worker; se descarta el resultado")
+
+    async def _wait(self) -> None:
+        """
+        Espera a que termine algún trabajo, a que se pida parar o, como
+        mucho, poll_interval segundos
+        """
+        stop = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait({stop, *self._tasks}, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop.cancel()
+
+    async def run(self) -> None:
+        """
+        Bucle principal hasta stop(); al parar deja terminar los trabajos en curso
+        """
+        logger.info(f"Worker {self.worker_id} escuchando la cola ({self.concurrency} trabajos a la vez)")
+
+        while not self._stopping.is_set():
+            try:
+                await self._claim()
+            except Exception as e:
+                logger.error(f"Error al reclamar trabajos: {str(e)}")
+            await self._wait()
+
+        if self._tasks:
+            logger.info(f"Esperando a {len(self._tasks)} trabajos en curso")
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def drain(self) -> None:
+        """
+        Ejecuta trabajos hasta que no quede ninguno listo ni en curso
+        """
+        while True:
+            # Un trabajo que termina durante la reclamación puede dejar libre
+            # un tipo bloqueado: solo se para tras una ronda sin nada en curso
+            idle = not self._tasks
+            claimed = await self._claim()
+            if idle and not claimed:
+                return
+            if self._tasks:
+                await asyncio.wait(set(self._tasks), return_when=asyncio.FIRST_COMPLETED)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "lost": self.lost,
+        }
@@ -0,0 +1,145 @@
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Optional
+from app.core.config import settings
+from app.services.entities import load_ner_pipeline
+from app.services.sentiment import SentimentBackend, create_sentiment_backend
+from app.services.tokenizer import TokenFilter
+import logging
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotAvailableError(RuntimeError):
+    """Un modelo no está instalado; no se descarga en tiempo de ejecución"""
+
+
+def _load_stop_words(language: str) -> FrozenSet[str]:
+    from nltk.corpus import stopwords
+
+    # LookupError si falta el corpus, OSError si falta solo ese idioma
+    try:
+        return frozenset(stopwords.words(language))
+    except (LookupError, OSError) as e:
+        raise ModelNotAvailableError(
+            f"Faltan las stop words de NLTK para {language}; instálelas con: python -m nltk.downloader stopwords"
+        ) from e
+
+
+def _load_ner(model_name: str) -> "Language":
+    try:
+        return load_ner_pipeline(model_name)
+    except OSError as e:
+        raise ModelNotAvailableError(
+            f"Falta el modelo de spaCy {model_name}; instálelo con: python -m spacy download {model_name}"
+        ) from e
+
+
+class ModelRegistry:
+    """
+    Modelos de NLP compartidos por todos los TextAnalyzer del proceso.
+
+    Cada modelo se carga una sola vez, la primera vez que se pide o en
+    warm_up() al arrancar la aplicación. Nunca se descargan: si falta uno se
+    lanza ModelNotAvailableError con el comando para instalarlo.
+    """
+
+    def __init__(
+            self,
+            ner_model: Optional[str] = None,
+            sentiment_backend: Optional[str] = None,
+            language: str = "english"
+    ):
+        self.ner_model = ner_model or settings.NER_MODEL
+        self.sentiment_backend = sentiment_backend or settings.SENTIMENT_BACKEND
+        self.language = language
+        self._models: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        # Reentrante: un cargador puede pedir otro modelo (el filtro, las stop words)
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, loader: Callable[[], Any]) -> Any:
+        if name in self._models:
+            return self._models[name]
+
+        with self._lock:
+            if name not in self._models:
+                start = time.perf_counter()
+                try:
+                    self._models[name] = loader()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._load_seconds[name] = time.perf_counter() - start
+                self._errors.pop(name, None)
+                logger.info(f"Modelo {name} cargado en {self._load_seconds[name]:.2f} s")
+
+        return self._models[name]
+
+    def stop_words(self, language: Optional[str] = None) -> FrozenSet[str]:
+        language = language or self.language
+        return self._get(f"stopwords:{language}", lambda: _load_stop_words(language))
+
+    def token_filter(self, language: Optional[str] = None, min_length: int = 3) -> TokenFilter:
+        """
+        Filtro de palabras frecuentes del idioma, creado una vez por proceso
+        """
+        language = language or self.language
+        return self._get(
+            f"filter:{language}:{min_length}",
+            lambda: TokenFilter(self.stop_words(language), min_length)
+        )
+
+    def ner(self) -> "Language":
+        return self._get(f"spacy:{self.ner_model}", lambda: _load_ner(self.ner_model))
+
+    def sentiment(self) -> SentimentBackend:
+        return self._get(
+            f"sentiment:{self.sentiment_backend}",
+            lambda: create_sentiment_backend(self.sentiment_backend)
+        )
+
+    def _required(self) -> Dict[str, Callable[[], Any]]:
+        return {
+            f"stopwords:{self.language}": self.stop_words,
+            f"spacy:{self.ner_model}": self.ner,
+            f"sentiment:{self.sentiment_backend}": self.sentiment,
+        }
+
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Carga todos los modelos; lanza ModelNotAvailableError si falta alguno
+        """
+        for load in self._required().values():
+            load()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        models = {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+            for name in self._required()
+        }
+        return {
+            "ready": all(model["loaded"] for model in models.values()),
+            "models": models,
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    global _registry
+
+    if _registry is None:
+        _registry = ModelRegistry()
+
+    return _registry
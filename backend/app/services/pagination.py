@@ -0,0 +1,29 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    """El cursor de paginación no es válido"""
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Codifica la posición de la última fila devuelta como un token opaco
+    """
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Cursor de paginación inválido") from e
+
+    if not isinstance(values, dict):
+        raise InvalidCursorError("Cursor de paginación inválido")
+
+    return values
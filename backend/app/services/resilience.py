@@ -0,0 +1,306 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+import httpx
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Respuestas que indican un problema pasajero de Wikipedia y se reintentan
+RETRYABLE_STATUS = frozenset((429, 500, 502, 503, 504))
+
+
+class UpstreamUnavailableError(Exception):
+    """
+    Wikipedia no respondió tras los reintentos o el circuito está abierto;
+    retry_after son los segundos recomendados antes de volver a intentarlo
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Segundos de la cabecera Retry-After, que puede ser un número o una fecha HTTP
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+def backoff_delay(
+        attempt: int,
+        base_delay: float,
+        max_delay: float,
+        rng: Callable[[], float] = random.random
+) -> float:
+    """
+    Espera antes del reintento `attempt` (0 = primero): exponencial con
+    jitter completo, un valor al azar entre 0 y base_delay * 2^attempt
+    (como mucho max_delay), para que los clientes no reintenten a la vez
+    """
+    return min(max_delay, base_delay * 2 ** attempt) * rng()
+
+
+class TokenBucket:
+    """
+    Limitador de solicitudes: rate por segundo de media, con ráfagas de
+    hasta capacity. Cada llamada reserva un token; si no quedan, el saldo
+    pasa a negativo y la llamada espera su turno, así que las esperas se
+    reparten en orden de llegada.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    def reserve(self) -> float:
+        """
+        Toma un token y devuelve cuántos segundos hay que esperar para usarlo
+        """
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            self.throttled += 1
+            self.waited_seconds += delay
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "throttled": self.throttled,
+            "waited_seconds": self.waited_seconds,
+        }
+
+
+class CircuitBreaker:
+    """
+    Tras failure_threshold fallos seguidos el circuito se abre y las
+    solicitudes fallan de inmediato durante reset_timeout segundos; después
+    deja pasar una de prueba (semiabierto) que lo cierra si sale bien o lo
+    vuelve a abrir si falla
+    """
+
+    def __init__(
+            self,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(self.reset_timeout - (self.clock() - self._opened_at), 0.0)
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Circuito de Wikipedia cerrado")
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        Libera la prueba del circuito semiabierto sin resultado (la solicitud
+        se canceló o falló por otra causa) para que otra la haga
+        """
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        probe_failed = self._probing
+        self._probing = False
+
+        if probe_failed or (self._opened_at is None and self.failures >= self.failure_threshold):
+            self._opened_at = self.clock()
+            self.opened += 1
+            logger.warning(f"Circuito de Wikipedia abierto durante {self.reset_timeout:.0f} s tras {self.failures} fallos")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class UpstreamGuard:
+    """
+    Envuelve las solicitudes a Wikipedia: limita su ritmo, reintenta los
+    errores de red y las respuestas 429/5xx con espera exponencial con
+    jitter (o la que pida Retry-After) y corta con el circuito mientras
+    Wikipedia no responde. Las demás respuestas se devuelven tal cual.
+    """
+
+    def __init__(
+            self,
+            limiter: Optional[TokenBucket] = None,
+            breaker: Optional[CircuitBreaker] = None,
+            max_retries: int = 2,
+            base_delay: float = 0.5,
+            max_delay: float = 10.0,
+            rng: Callable[[], float] = random.random
+    ):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def call(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        attempt = 0
+        while True:
+            probe = False
+            if self.breaker is not None:
+                if not self.breaker.allow():
+                    raise UpstreamUnavailableError(
+                        "Wikipedia no está disponible temporalmente", retry_after=self.breaker.retry_after()
+                    )
+                # Sigue semiabierto solo si esta es la solicitud de prueba
+                probe = self.breaker.state == "half_open"
+
+            retry_after = None
+            try:
+                if self.limiter is not None:
+                    await self.limiter.acquire()
+                self.requests += 1
+                response = await send()
+            except httpx.TransportError as e:
+                # Tiempo agotado, conexión rechazada o cortada
+                error = str(e) or type(e).__name__
+            except BaseException:
+                # Cancelada o error ajeno a Wikipedia: sin esto la prueba
+                # quedaría tomada y el circuito no volvería a cerrarse
+                if probe:
+                    self.breaker.release_probe()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    if self.breaker is not None:
+                        self.breaker.record_success()
+                    return response
+                error = f"HTTP {response.status_code}"
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            delay = retry_after if retry_after is not None else backoff_delay(
+                attempt, self.base_delay, self.max_delay, self.rng
+            )
+            # Si Retry-After pide esperar más de lo admitido no se reintenta, y
+            # tampoco si falló la prueba del circuito semiabierto
+            if probe or attempt >= self.max_retries or delay > self.max_delay:
+                # El circuito cuenta llamadas fallidas, no intentos
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                self.failures += 1
+                logger.error(f"Wikipedia no respondió tras {attempt + 1} intentos: {error}")
+                raise UpstreamUnavailableError(f"Error al conectar con Wikipedia: {error}", retry_after=retry_after)
+
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"Reintento {attempt} a Wikipedia en {delay:.2f} s: {error}")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "limiter": self.limiter.stats() if self.limiter is not None else None,
+            "breaker": self.breaker.stats() if self.breaker is not None else None,
+        }
+
+
+_guard: Optional[UpstreamGuard] = None
+
+
+def get_upstream_guard() -> UpstreamGuard:
+    """
+    Protección compartida por todas las solicitudes a Wikipedia del proceso
+    """
+    global _guard
+
+    if _guard is None:
+        limiter = None
+        if settings.WIKIPEDIA_RATE_LIMIT > 0:
+            limiter = TokenBucket(settings.WIKIPEDIA_RATE_LIMIT, settings.WIKIPEDIA_RATE_BURST)
+        _guard = UpstreamGuard(
+            limiter=limiter,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.WIKIPEDIA_BREAKER_THRESHOLD,
+                reset_timeout=settings.WIKIPEDIA_BREAKER_RESET_SECONDS
+            ),
+            max_retries=settings.WIKIPEDIA_MAX_RETRIES,
+            base_delay=settings.WIKIPEDIA_RETRY_BASE_DELAY,
+            max_delay=settings.WIKIPEDIA_RETRY_MAX_DELAY
+        )
+
+    return _guard
+
+
+def upstream_stats() -> Optional[Dict[str, Any]]:
+    return _guard.stats() if _guard is not None else None
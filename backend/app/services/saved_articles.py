@@ -0,0 +1,205 @@
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.dialects import dialect_insert
+from app.db.models import SavedArticle
+from app.schemas.article import ArticleAnalysis, BulkItemResult, SavedArticleCreate
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.article_stats import StatsDelta, apply_stats_delta
+from app.services.wiki_service import AsyncWikipediaService, parse_touched
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Filas por INSERT en el guardado masivo (límite de parámetros de SQLite)
+BULK_INSERT_CHUNK = 200
+
+
+def article_values(article: SavedArticleCreate) -> Dict[str, Any]:
+    return {
+        "title": article.title,
+        "wikipedia_id": article.wikipedia_id,
+        "wikipedia_url": article.wikipedia_url,
+        "summary": article.summary,
+        "full_text": article.full_text,
+        "word_count": article.word_count,
+        "frequent_words": [wf.model_dump() for wf in article.frequent_words] if article.frequent_words else None,
+        "entities": [entity.model_dump() for entity in article.entities] if article.entities else None,
+        "revision_id": article.revision_id,
+        "touched": parse_touched(article.touched),
+        "user_id": article.user_id,
+    }
+
+
+async def complete_from_wikipedia(
+        items: Dict[int, SavedArticleCreate],
+        wiki_service: AsyncWikipediaService,
+        fetch_content: bool
+) -> Dict[int, str]:
+    """
+    Completa en su sitio el resumen (y, con fetch_content, el texto completo)
+    de los elementos que no lo traen, pidiendo a Wikipedia varios pageids por
+    solicitud. Devuelve los errores por índice del elemento.
+    """
+    errors = {}
+    pending = {}
+    for index, item in items.items():
+        if (fetch_content and not item.full_text) or not item.summary:
+            if item.wikipedia_id.isdigit():
+                pending[index] = int(item.wikipedia_id)
+            else:
+                errors[index] = "wikipedia_id no es un ID de página válido"
+
+    if not pending:
+        return errors
+
+    page_errors: Dict[int, Exception] = {}
+    try:
+        details = await wiki_service.get_articles_details(
+            list(pending.values()), include_content=fetch_content, errors=page_errors
+        )
+    except Exception as e:
+        logger.error(f"Error al obtener artículos de Wikipedia: {str(e)}")
+        return {**errors, **{index: "No se pudo obtener el artículo de Wikipedia" for index in pending}}
+
+    for index, page_id in pending.items():
+        if page_id in page_errors:
+            logger.error(f"Error al obtener el artículo {page_id} de Wikipedia: {str(page_errors[page_id])}")
+            errors[index] = "No se pudo obtener el artículo de Wikipedia"
+            continue
+
+        page = details.get(page_id)
+        if page is None:
+            errors[index] = "Artículo no encontrado en Wikipedia"
+            continue
+
+        update = {"summary": items[index].summary or page.get("summary")}
+        if fetch_content and not items[index].full_text:
+            update["full_text"] = page.get("content")
+        if items[index].revision_id is None:
+            update["revision_id"] = page.get("revision_id")
+            update["touched"] = page.get("touched")
+        items[index] = items[index].model_copy(update=update)
+
+    return errors
+
+
+async def _analyze_missing(items: Dict[int, SavedArticleCreate], executor: AnalysisExecutor) -> None:
+    """
+    Analiza, en lotes, los elementos con texto completo pero sin análisis
+    """
+    pending = [index for index, item in items.items() if item.full_text and item.word_count is None]
+    batch_size = max(settings.ANALYSIS_BATCH_SIZE, 1)
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        analyses = await executor.analyze_many([items[index].full_text for index in batch])
+        for index, analysis in zip(batch, analyses):
+            items[index] = items[index].model_copy(update={
+                "word_count": analysis.word_count,
+                "frequent_words": analysis.frequent_words,
+                "entities": analysis.entities,
+            })
+
+
+async def import_articles(
+        db: AsyncSession,
+        articles: Sequence[SavedArticleCreate],
+        wiki_service: AsyncWikipediaService,
+        fetch_content: bool = False,
+        executor: Optional[AnalysisExecutor] = None
+) -> List[BulkItemResult]:
+    """
+    Guarda varios artículos en una sola transacción con inserciones de
+    varias filas; devuelve el resultado de cada elemento en el mismo orden.
+    Con executor, los que tienen texto completo y no traen análisis se
+    analizan antes de guardarlos.
+    """
+    results: Dict[int, BulkItemResult] = {}
+    pending: Dict[int, SavedArticleCreate] = {}
+    seen = set()
+
+    for index, item in enumerate(articles):
+        key = (item.user_id, item.wikipedia_id)
+        if key in seen:
+            results[index] = BulkItemResult(
+                status="duplicate", wikipedia_id=item.wikipedia_id, detail="Repetido en la solicitud"
+            )
+            continue
+        seen.add(key)
+        pending[index] = item
+
+    errors = await complete_from_wikipedia(pending, wiki_service, fetch_content)
+    for index, detail in errors.items():
+        item = pending.pop(index)
+        results[index] = BulkItemResult(status="error", wikipedia_id=item.wikipedia_id, detail=detail)
+
+    if executor is not None:
+        await _analyze_missing(pending, executor)
+
+    created = {}
+    if pending:
+        insert = dialect_insert(db)
+        items = list(pending.values())
+        for start in range(0, len(items), BULK_INSERT_CHUNK):
+            statement = insert(SavedArticle).values(
+                [article_values(item) for item in items[start:start + BULK_INSERT_CHUNK]]
+            ).on_conflict_do_nothing(
+                index_elements=[SavedArticle.user_id, SavedArticle.wikipedia_id]
+            ).returning(SavedArticle.id, SavedArticle.user_id, SavedArticle.wikipedia_id)
+
+            for row in await db.execute(statement):
+                created[(row.user_id, row.wikipedia_id)] = row.id
+
+        delta = StatsDelta()
+        for item in items:
+            if (item.user_id, item.wikipedia_id) in created:
+                delta.add(item.user_id, item.word_count, item.frequent_words, item.entities)
+        await apply_stats_delta(db, delta)
+
+        await db.commit()
+
+    for index, item in pending.items():
+        article_id = created.get((item.user_id, item.wikipedia_id))
+        if article_id is None:
+            results[index] = BulkItemResult(
+                status="duplicate", wikipedia_id=item.wikipedia_id, detail="El artículo ya está guardado"
+            )
+        else:
+            results[index] = BulkItemResult(status="created", id=article_id, wikipedia_id=item.wikipedia_id)
+
+    return [results[index] for index in range(len(articles))]
+
+
+async def replace_article_analysis(
+        db: AsyncSession,
+        rows: Sequence[Row],
+        analysis: ArticleAnalysis,
+        **values: Any
+) -> None:
+    """
+    Sustituye el análisis de los artículos guardados `rows` (con id, user_id
+    y el análisis anterior) y ajusta los acumulados; `values` actualiza
+    además otras columnas. Quien llama hace commit.
+    """
+    data = analysis.model_dump()
+
+    delta = StatsDelta()
+    for row in rows:
+        delta.add(row.user_id, row.word_count, row.frequent_words, row.entities, sign=-1)
+        delta.add(row.user_id, analysis.word_count, analysis.frequent_words, analysis.entities)
+
+    await db.execute(
+        update(SavedArticle)
+        .where(SavedArticle.id.in_([row.id for row in rows]))
+        .values(
+            word_count=data["word_count"],
+            frequent_words=data["frequent_words"],
+            entities=data["entities"],
+            **values
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await apply_stats_delta(db, delta)
@@ -0,0 +1,222 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.analysis_executor import AnalysisExecutor, AnalysisQueueFullError
+from app.services.analysis_store import AnalysisStore, content_hash
+from app.services.wiki_service import AsyncWikipediaService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SearchPrefetcher:
+    """
+    Precarga especulativa de los primeros resultados de una búsqueda: descarga
+    su contenido (que queda en la caché de respuestas) y calcula su análisis
+    (que queda en AnalysisStore), para que abrir uno no pague ambos en frío.
+
+    Es trabajo de baja prioridad: como máximo max_in_flight páginas a la
+    vez, de una en una por tarea, y solo mientras el pool de análisis tenga
+    menos de load_threshold de su capacidad ocupada; si se supera se
+    descarta lo pendiente y se cancelan las precargas en curso.
+
+    La tasa de aciertos es la fracción de páginas precargadas que luego se
+    abren en los ttl segundos siguientes.
+    """
+
+    def __init__(
+            self,
+            top_k: int = 3,
+            max_in_flight: int = 4,
+            load_threshold: float = 0.5,
+            ttl: float = 600.0,
+            session_factory: async_sessionmaker = AsyncSessionLocal,
+            max_tracked: int = 1024
+    ):
+        self.top_k = top_k
+        self.max_in_flight = max_in_flight
+        self.load_threshold = load_threshold
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self.max_tracked = max_tracked
+        self.scheduled = 0
+        self.prefetched = 0
+        self.hits = 0
+        self.skipped = 0
+        self.cancelled = 0
+        self.errors = 0
+        # Páginas precargadas que aún no se han abierto, con su hora de precarga
+        self._ready: "OrderedDict[int, float]" = OrderedDict()
+        self._in_flight: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _overloaded(self, executor: AnalysisExecutor) -> bool:
+        return executor.pending >= executor.max_pending * self.load_threshold
+
+    def _is_ready(self, page_id: int) -> bool:
+        prefetched_at = self._ready.get(page_id)
+        return prefetched_at is not None and time.monotonic() - prefetched_at < self.ttl
+
+    def schedule(
+            self,
+            page_ids: Sequence[int],
+            wiki_service: AsyncWikipediaService,
+            executor: AnalysisExecutor
+    ) -> List[int]:
+        """
+        Lanza en segundo plano la precarga de los top_k primeros page_ids que
+        no estén ya precargados o en curso, dentro del presupuesto; devuelve
+        los que se van a precargar
+        """
+        candidates = [
+            page_id for page_id in dict.fromkeys(page_ids[:self.top_k])
+            if page_id not in self._in_flight and not self._is_ready(page_id)
+        ]
+        if not candidates:
+            return []
+
+        if self._overloaded(executor):
+            self.skipped += len(candidates)
+            self.cancel()
+            return []
+
+        budget = max(self.max_in_flight - len(self._in_flight), 0)
+        self.skipped += max(len(candidates) - budget, 0)
+        selected = candidates[:budget]
+        if not selected:
+            return []
+
+        self.scheduled += len(selected)
+        self._in_flight.update(selected)
+        task = asyncio.create_task(self._prefetch(selected, wiki_service, executor))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return selected
+
+    async def _prefetch(
+            self,
+            page_ids: List[int],
+            wiki_service: AsyncWikipediaService,
+            executor: AnalysisExecutor
+    ) -> None:
+        pending = list(page_ids)
+        try:
+            # Resúmenes e información por lotes de pageids y el texto de cada
+            # página en paralelo; con caché, cada página queda con la misma
+            # clave que usa la vista de detalle
+            details = await wiki_service.get_articles_details(page_ids, include_content=True)
+
+            async with self.session_factory() as db:
+                store = AnalysisStore(db)
+                while pending:
+                    if self._overloaded(executor):
+                        self.cancelled += len(pending)
+                        logger.info(f"Precarga de {len(pending)} artículos cancelada por carga")
+                        return
+
+                    page_id = pending.pop(0)
+                    page = details.get(page_id)
+                    if page is None:
+                        continue
+
+                    content = page.get("content") or ""
+                    digest = content_hash(content)
+                    if await store.get(str(page_id), digest) is None:
+                        analysis = await executor.analyze(content)
+                        await store.save(str(page_id), digest, analysis, revision_id=page.get("revision_id"))
+                        await db.commit()
+
+                    self._mark_ready(page_id)
+
+        except asyncio.CancelledError:
+            self.cancelled += len(pending)
+            raise
+        except AnalysisQueueFullError:
+            self.cancelled += len(pending) + 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Error en la precarga de artículos {page_ids}: {str(e)}")
+        finally:
+            self._in_flight.difference_update(page_ids)
+
+    def _mark_ready(self, page_id: int) -> None:
+        self.prefetched += 1
+        self._ready[page_id] = time.monotonic()
+        self._ready.move_to_end(page_id)
+        while len(self._ready) > self.max_tracked:
+            self._ready.popitem(last=False)
+
+    def record_access(self, page_id: int) -> bool:
+        """
+        Anota que se abrió un artículo; devuelve si estaba precargado
+        """
+        hit = self._is_ready(page_id)
+        if hit:
+            self.hits += 1
+        self._ready.pop(page_id, None)
+        return hit
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    async def close(self) -> None:
+        self.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "top_k": self.top_k,
+            "scheduled": self.scheduled,
+            "prefetched": self.prefetched,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.prefetched if self.prefetched else 0.0,
+            "skipped": self.skipped,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+        }
+
+
+_prefetcher: Optional[SearchPrefetcher] = None
+
+
+def get_search_prefetcher() -> Optional[SearchPrefetcher]:
+    """
+    Precargador compartido del proceso; None si SEARCH_PREFETCH_TOP_K es 0
+    """
+    global _prefetcher
+
+    if settings.SEARCH_PREFETCH_TOP_K <= 0:
+        return None
+
+    if _prefetcher is None:
+        _prefetcher = SearchPrefetcher(
+            top_k=settings.SEARCH_PREFETCH_TOP_K,
+            max_in_flight=settings.SEARCH_PREFETCH_MAX_IN_FLIGHT,
+            load_threshold=settings.SEARCH_PREFETCH_LOAD_THRESHOLD,
+            ttl=settings.SEARCH_PREFETCH_TTL
+        )
+
+    return _prefetcher
+
+
+def record_prefetch_access(page_id: int) -> None:
+    if _prefetcher is not None:
+        _prefetcher.record_access(page_id)
+
+
+async def shutdown_search_prefetcher() -> None:
+    global _prefetcher
+
+    if _prefetcher is not None:
+        await _prefetcher.close()
+        _prefetcher = None
+
+
+def search_prefetch_stats() -> Optional[Dict[str, Any]]:
+    return _prefetcher.stats() if _prefetcher is not None else None
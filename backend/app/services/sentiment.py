@@ -0,0 +1,177 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence
+import numpy as np
+from app.schemas.article import SentimentAnalysis
+
+# Tokens como los ve TextBlob, que separa los apóstrofos ("isn't" -> is n ' t),
+# más los signos de exclamación
+_TOKEN_PATTERN = re.compile(r"\w+|!")
+
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+EXCLAMATION_BOOST = 1.25
+
+
+def polarity_to_sentiment(polarity: float) -> SentimentAnalysis:
+    """
+    Convierte la polaridad (-1 a 1) en etiqueta y puntuaciones
+    """
+    if polarity > 0.1:
+        label = "Positive"
+        positive = 0.5 + polarity / 2
+        negative = 0.5 - polarity / 2
+        neutral = 0.5 - abs(polarity) / 2
+    elif polarity < -0.1:
+        label = "Negative"
+        positive = 0.5 + polarity / 2
+        negative = 0.5 - polarity / 2
+        neutral = 0.5 - abs(polarity) / 2
+    else:
+        label = "Neutral"
+        positive = 0.5 + polarity
+        negative = 0.5 - polarity
+        neutral = 0.8
+
+    return SentimentAnalysis(
+        label=label,
+        positive=positive,
+        negative=negative,
+        neutral=neutral
+    )
+
+
+class SentimentBackend(ABC):
+    """Calcula la polaridad (-1 a 1) de uno o varios textos"""
+
+    name: str
+
+    @abstractmethod
+    def polarity(self, text: str) -> float:
+        ...
+
+    def polarities(self, texts: Sequence[str]) -> List[float]:
+        return [self.polarity(text) for text in texts]
+
+
+class TextBlobSentimentBackend(SentimentBackend):
+    """
+    Motor de referencia: TextBlob (PatternAnalyzer) sobre el texto completo
+    """
+
+    name = "textblob"
+
+    def polarity(self, text: str) -> float:
+        from textblob import TextBlob
+
+        return TextBlob(text).sentiment.polarity
+
+
+class LexiconSentimentBackend(SentimentBackend):
+    """
+    Aplica el léxico de TextBlob con NumPy: el léxico se compila una vez en
+    un vocabulario y arrays de polaridad, intensidad y modificadores, y los
+    tokens de todos los textos se puntúan juntos.
+
+    Reproduce las reglas principales de PatternAnalyzer (modificadores como
+    "very good", negaciones como "not good" o "not a good" y el refuerzo de
+    "!"); no tiene en cuenta los emoticonos ni los modificadores separados
+    de la palabra que modifican, así que la polaridad puede diferir
+    ligeramente.
+    """
+
+    name = "lexicon"
+
+    def __init__(self, lexicon: Dict[str, Dict]):
+        words = sorted(lexicon)
+        self.vocabulary = {word: index for index, word in enumerate(words)}
+
+        # Valores promediados entre categorías gramaticales (clave None), que
+        # son los que usa TextBlob con texto sin etiquetar
+        scores = np.array([lexicon[word][None] for word in words], dtype=np.float64).reshape(-1, 3)
+        self.polarity_of = scores[:, 0]
+        self.intensity_of = scores[:, 2]
+        self.is_modifier = np.array(["RB" in lexicon[word] for word in words], dtype=bool)
+
+    @classmethod
+    def from_textblob(cls) -> "LexiconSentimentBackend":
+        from textblob.en import sentiment as pattern_sentiment
+
+        pattern_sentiment.load()
+        return cls(dict(pattern_sentiment))
+
+    def polarity(self, text: str) -> float:
+        return self.polarities([text])[0]
+
+    def polarities(self, texts: Sequence[str]) -> List[float]:
+        tokens: List[str] = []
+        offsets = [0]
+        for text in texts:
+            tokens.extend(_TOKEN_PATTERN.findall(text.lower()))
+            offsets.append(len(tokens))
+
+        if not tokens:
+            return [0.0] * len(texts)
+
+        lookup = self.vocabulary.get
+        index = np.fromiter((lookup(token, -1) for token in tokens), dtype=np.int64, count=len(tokens))
+        lengths = np.diff(offsets)
+        document = np.repeat(np.arange(len(texts)), lengths)
+
+        known = index >= 0
+        safe_index = np.where(known, index, 0)
+        polarity = np.where(known, self.polarity_of[safe_index], 0.0)
+
+        # El token anterior solo cuenta si es del mismo texto
+        same_document = np.zeros(len(tokens), dtype=bool)
+        same_document[1:] = document[1:] == document[:-1]
+        previous = np.roll(safe_index, 1)
+        previous_known = np.roll(known, 1) & same_document
+
+        # "not good" y "not a good": la negación se mantiene sobre palabras de
+        # una letra
+        is_negation = np.fromiter((token in NEGATIONS for token in tokens), dtype=bool, count=len(tokens))
+        is_short = np.fromiter((len(token) <= 1 for token in tokens), dtype=bool, count=len(tokens))
+        negated = np.zeros(len(tokens), dtype=bool)
+        negated[1:] = is_negation[:-1] & same_document[1:]
+        negated[2:] |= is_negation[:-2] & is_short[1:-1] & same_document[1:-1] & same_document[2:]
+
+        # "very good": la intensidad del modificador multiplica la polaridad
+        # (la inversa si está negado, "not very good") y ambos forman una sola
+        # valoración, que hereda la negación del modificador
+        modified = known & previous_known & self.is_modifier[previous]
+        intensity = self.intensity_of[previous]
+        intensity = np.where(np.roll(negated, 1), 1.0 / intensity, intensity)
+        polarity = np.where(modified, np.clip(polarity * intensity, -1.0, 1.0), polarity)
+        negated[1:] |= modified[1:] & negated[:-1]
+
+        assessed = known.copy()
+        assessed[:-1] &= ~modified[1:]
+
+        # "love it!": cada signo de exclamación refuerza la última valoración
+        # anterior del mismo texto
+        positions = np.arange(len(tokens))
+        last_assessed = np.maximum.accumulate(np.where(assessed, positions, -1))
+        starts = np.repeat(np.asarray(offsets[:-1]), lengths)
+        exclamations = np.fromiter((token == "!" for token in tokens), dtype=bool, count=len(tokens))
+        targets = last_assessed[exclamations & (last_assessed >= starts)]
+        boosts = np.bincount(targets, minlength=len(tokens))
+        polarity = np.clip(polarity * EXCLAMATION_BOOST ** boosts, -1.0, 1.0)
+
+        polarity = np.where(negated, polarity * -0.5, polarity)
+
+        totals = np.bincount(document[assessed], weights=polarity[assessed], minlength=len(texts))
+        counts = np.bincount(document[assessed], minlength=len(texts))
+
+        return (totals / np.maximum(counts, 1)).tolist()
+
+
+SENTIMENT_BACKENDS = {
+    TextBlobSentimentBackend.name: TextBlobSentimentBackend,
+    LexiconSentimentBackend.name: LexiconSentimentBackend.from_textblob,
+}
+
+
+def create_sentiment_backend(name: str) -> SentimentBackend:
+    if name not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Motor de sentimiento desconocido: {name}. Válidos: {', '.join(SENTIMENT_BACKENDS)}")
+    return SENTIMENT_BACKENDS[name]()
@@ -0,0 +1,101 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes con la misma clave: la primera ejecuta la
+    operación y las demás esperan su resultado (o su excepción).
+
+    Con timeout, la operación compartida se cancela al cumplirse el plazo y
+    todos los que la esperaban reciben asyncio.TimeoutError; la clave queda
+    libre para el siguiente intento. Si un llamador se cancela, la operación
+    sigue para el resto; si se cancelan todos, se cancela también.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.timeout = timeout
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(self._run(fn))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(task) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def _run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        if self.timeout is None:
+            return await fn()
+        return await asyncio.wait_for(fn(), self.timeout)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        if task.cancelled():
+            return
+
+        # Se consulta siempre para que no quede una excepción sin recuperar
+        # si todos los llamadores se cancelaron
+        error = task.exception()
+        if isinstance(error, asyncio.TimeoutError):
+            self.timeouts += 1
+            logger.warning(f"Tiempo agotado en la operación compartida {key}")
+        elif error is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": len(self._in_flight),
+            "coalesced_ratio": self.coalesced / total if total else 0.0,
+        }
+
+
+_flights: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str, timeout: Optional[float] = None) -> SingleFlight:
+    """
+    Devuelve el grupo compartido del proceso con ese nombre, creándolo si
+    todavía no existe
+    """
+    if name not in _flights:
+        _flights[name] = SingleFlight(timeout=timeout)
+
+    return _flights[name]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: flight.stats() for name, flight in _flights.items()}
@@ -0,0 +1,86 @@
+import heapq
+import re
+from collections import Counter
+from operator import itemgetter
+from typing import AbstractSet, List, Mapping, Optional, Tuple
+
+# Equivale a \b\w+\b: las secuencias máximas de \w ya están entre límites de palabra
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class TokenFilter:
+    """
+    Regla de las palabras frecuentes: sin stop words y con al menos
+    min_length caracteres. Es inmutable, así que se crea una vez por idioma
+    (ver ModelRegistry.token_filter) y la comparten todos los analizadores.
+    """
+
+    __slots__ = ("stop_words", "min_length")
+
+    def __init__(self, stop_words: AbstractSet[str] = frozenset(), min_length: int = 3):
+        self.stop_words = frozenset(stop_words)
+        self.min_length = min_length
+
+    def __contains__(self, word: str) -> bool:
+        return len(word) >= self.min_length and word not in self.stop_words
+
+    def top(self, counts: Mapping[str, int], top_n: int) -> List[Tuple[str, int]]:
+        """
+        Las top_n palabras más frecuentes que pasan el filtro; con un montículo
+        en lugar de ordenar todas, y los empates en el orden de counts
+        """
+        stop_words = self.stop_words
+        min_length = self.min_length
+        return heapq.nlargest(
+            top_n,
+            ((word, count) for word, count in counts.items() if len(word) >= min_length and word not in stop_words),
+            key=itemgetter(1)
+        )
+
+
+class TokenizedDocument:
+    """
+    Texto tokenizado una sola vez (en minúsculas) para que el conteo de
+    palabras, las frecuencias y otros analizadores compartan los mismos tokens
+    """
+
+    __slots__ = ("text", "tokens", "_counts")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[str] = WORD_PATTERN.findall(text.lower())
+        self._counts: Optional[Counter] = None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def counts(self) -> Counter:
+        """
+        Frecuencia de cada token, calculada la primera vez que se pide
+        """
+        if self._counts is None:
+            self._counts = Counter(self.tokens)
+        return self._counts
+
+    def frequent_words(
+            self,
+            stop_words: AbstractSet[str] = frozenset(),
+            min_length: int = 3,
+            top_n: int = 10,
+            token_filter: Optional[TokenFilter] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Palabras más frecuentes sin stop words ni palabras cortas; con
+        token_filter se usa ese filtro ya creado en lugar de los otros
+        parámetros.
+
+        Se filtran los tokens distintos en lugar de cada aparición, y los
+        empates mantienen el orden de primera aparición.
+        """
+        token_filter = token_filter or TokenFilter(stop_words, min_length)
+        return token_filter.top(self.counts, top_n)
@@ -1,52 +1,164 @@
+import asyncio
+import re
 import requests
-from typing import Dict, Any, Optional
+import httpx
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterable, List, Optional, Union
 from app.core.config import settings
 from app.schemas.article import WikiSearchResult, WikiSearchResponse
+from app.services.http_client import get_http_client
+from app.services.cache import ResponseCache, make_cache_key
+from app.services.resilience import UpstreamGuard
+from app.services.single_flight import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Máximo de extractos por solicitud que acepta TextExtracts (exlimit)
+EXTRACTS_BATCH_SIZE = 20
+
+# Máximo de pageids por solicitud de la API para clientes sin permisos de bot
+REVISIONS_BATCH_SIZE = 50
+
+# Solicitudes simultáneas de una misma llamada a get_articles_details
+DETAILS_CONCURRENCY = 8
+
+# En texto plano las secciones empiezan con líneas "== Título =="
+_SECTION_HEADING = re.compile(r"^==.*==[ \t]*$", re.MULTILINE)
+
+
+def _search_params(query: str, limit: int) -> Dict[str, Any]:
+    return {
+        "action": "query",
+        "format": "json",
+        "list": "search",
+        "srsearch": query,
+        "srlimit": limit,
+        "srinfo": "totalhits",
+        "srprop": "snippet"
+    }
+
+
+def _extract_params(page_id: Union[int, str], intro: bool) -> Dict[str, Any]:
+    params = {
+        "action": "query",
+        "format": "json",
+        "prop": "extracts|info",
+        "pageids": page_id,
+        "inprop": "url",
+        "explaintext": 1
+    }
+
+    # MediaWiki considera verdadero cualquier parámetro booleano presente,
+    # incluso "exintro=False", así que solo se envía cuando se quiere la intro
+    if intro:
+        params["exintro"] = 1
+
+    return params
+
+
+def _revisions_params(page_ids: Iterable[int]) -> Dict[str, Any]:
+    return {
+        "action": "query",
+        "format": "json",
+        "prop": "info",
+        "pageids": "|".join(str(page_id) for page_id in page_ids)
+    }
+
+
+def parse_touched(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """
+    Convierte el `touched` de MediaWiki ("2024-01-01T00:00:00Z") a un
+    datetime UTC sin zona horaria, como las demás columnas DateTime
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _details_params(page_ids: Iterable[int], intro: bool) -> Dict[str, Any]:
+    params = _extract_params("|".join(str(page_id) for page_id in page_ids), intro)
+    if intro:
+        params["exlimit"] = EXTRACTS_BATCH_SIZE
+    return params
+
+
+def _lead_section(content: str) -> str:
+    """
+    Obtiene la introducción (lo anterior a la primera sección) de un extracto
+    completo, equivalente a lo que devuelve exintro
+    """
+    match = _SECTION_HEADING.search(content)
+    lead = content[:match.start()] if match else content
+    return lead.strip()
+
+
+def _parse_search_response(data: Dict[str, Any]) -> WikiSearchResponse:
+    search_results = data.get("query", {}).get("search", [])
+    total_hits = data.get("query", {}).get("searchinfo", {}).get("totalhits", 0)
+
+    results = []
+    for item in search_results:
+        page_id = item.get("pageid")
+        title = item.get("title")
+        article_url = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+
+        result = WikiSearchResult(
+            page_id=page_id,
+            title=title,
+            snippet=item.get("snippet", ""),
+            url=article_url
+        )
+        results.append(result)
+
+    return WikiSearchResponse(results=results, total=total_hits)
+
+
+def _parse_page(data: Dict[str, Any], page_id: int, field: str) -> Dict[str, Any]:
+    page_data = data.get("query", {}).get("pages", {}).get(str(page_id), {})
+
+    return {
+        "page_id": page_id,
+        "title": page_data.get("title", ""),
+        field: page_data.get("extract", ""),
+        "url": page_data.get("fullurl", f"https://en.wikipedia.org/?curid={page_id}")
+    }
+
+
+def _parse_details(page_data: Dict[str, Any], page_id: int, content: Optional[str]) -> Dict[str, Any]:
+    extract = page_data.get("extract", "")
+
+    return {
+        "page_id": page_id,
+        "title": page_data.get("title", ""),
+        "content": content,
+        "summary": _lead_section(extract) if content is not None else extract.strip(),
+        "url": page_data.get("fullurl", f"https://en.wikipedia.org/?curid={page_id}"),
+        "revision_id": page_data.get("lastrevid"),
+        "touched": page_data.get("touched")
+    }
+
 
 class WikipediaService:
     def __init__(self, api_url: Optional[str] = None):
         self.api_url = api_url or settings.WIKIPEDIA_API_URL
+        # (conexión, lectura): sin plazo, una solicitud colgada bloquea el worker
+        self.timeout = (settings.WIKIPEDIA_CONNECT_TIMEOUT, settings.WIKIPEDIA_TIMEOUT)
 
     def search_articles(self, query: str, limit: int = 10) -> WikiSearchResponse:
         logger.info(f"Buscando artículos con término: {query}")
 
-        params = {
-            "action": "query",
-            "format": "json",
-            "list": "search",
-            "srsearch": query,
-            "srlimit": limit,
-            "srinfo": "totalhits",
-            "srprop": "snippet"
-        }
+        params = _search_params(query, limit)
 
         try:
-            response = requests.get(self.api_url, params=params)
+            response = requests.get(self.api_url, params=params, timeout=self.timeout)
             response.raise_for_status()
 
-            data = response.json()
-            search_results = data.get("query", {}).get("search", [])
-            total_hits = data.get("query", {}).get("searchinfo", {}).get("totalhits", 0)
-
-            results = []
-            for item in search_results:
-                page_id = item.get("pageid")
-                title = item.get("title")
-                article_url = f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
-
-                result = WikiSearchResult(
-                    page_id=page_id,
-                    title=title,
-                    snippet=item.get("snippet", ""),
-                    url=article_url
-                )
-                results.append(result)
-
-            return WikiSearchResponse(results=results, total=total_hits)
+            return _parse_search_response(response.json())
 
         except requests.RequestException as e:
             logger.error(f"Error en la solicitud a Wikipedia API: {str(e)}")
@@ -61,29 +173,13 @@ class WikipediaService:
         """
         logger.info(f"Obteniendo contenido completo del artículo con ID: {page_id}")
 
-        params = {
-            "action": "query",
-            "format": "json",
-            "prop": "extracts|info",
-            "pageids": page_id,
-            "inprop": "url",
-            "explaintext": True,
-            "exintro": False
-        }
+        params = _extract_params(page_id, intro=False)
 
         try:
-            response = requests.get(self.api_url, params=params)
+            response = requests.get(self.api_url, params=params, timeout=self.timeout)
             response.raise_for_status()
 
-            data = response.json()
-            page_data = data.get("query", {}).get("pages", {}).get(str(page_id), {})
-
-            return {
-                "page_id": page_id,
-                "title": page_data.get("title", ""),
-                "content": page_data.get("extract", ""),
-                "url": page_data.get("fullurl", f"https://en.wikipedia.org/?curid={page_id}")
-            }
+            return _parse_page(response.json(), page_id, "content")
         except requests.RequestException as e:
             logger.error(f"Error en la solicitud a Wikipedia API: {str(e)}")
             raise Exception(f"Error al conectar con Wikipedia: {str(e)}")
@@ -97,32 +193,290 @@ class WikipediaService:
         """
         logger.info(f"Obteniendo resumen del artículo con ID: {page_id}")
 
-        params = {
-            "action": "query",
-            "format": "json",
-            "prop": "extracts|info",
-            "pageids": page_id,
-            "inprop": "url",
-            "explaintext": True,
-            "exintro": True
-        }
+        params = _extract_params(page_id, intro=True)
 
         try:
-            response = requests.get(self.api_url, params=params)
+            response = requests.get(self.api_url, params=params, timeout=self.timeout)
             response.raise_for_status()
 
-            data = response.json()
-            page_data = data.get("query", {}).get("pages", {}).get(str(page_id), {})
-
-            return {
-                "page_id": page_id,
-                "title": page_data.get("title", ""),
-                "summary": page_data.get("extract", ""),
-                "url": page_data.get("fullurl", f"https://en.wikipedia.org/?curid={page_id}")
-            }
+            return _parse_page(response.json(), page_id, "summary")
         except requests.RequestException as e:
             logger.error(f"Error en la solicitud a Wikipedia API: {str(e)}")
             raise Exception(f"Error al conectar con Wikipedia: {str(e)}")
         except Exception as e:
             logger.error(f"Error al procesar resumen de Wikipedia: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+
+class AsyncWikipediaService:
+    """
+    Variante asíncrona de WikipediaService para usar dentro de rutas async.
+
+    Usa el cliente HTTP compartido (pool de conexiones keep-alive) en lugar
+    de abrir una conexión nueva por solicitud. Con `flight`, las solicitudes
+    idénticas que coinciden en el tiempo se hacen una sola vez. Con `guard`,
+    las solicitudes se limitan, se reintentan y se cortan si Wikipedia falla.
+    """
+
+    def __init__(
+            self,
+            client: Optional[httpx.AsyncClient] = None,
+            api_url: Optional[str] = None,
+            flight: Optional[SingleFlight] = None,
+            guard: Optional[UpstreamGuard] = None
+    ):
+        self.client = client or get_http_client()
+        self.api_url = api_url or settings.WIKIPEDIA_API_URL
+        self.flight = flight
+        self.guard = guard
+
+    async def _get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.flight is None:
+            return await self._request(params)
+
+        key = make_cache_key("wikipedia", api_url=self.api_url, **params)
+        return await self.flight.do(key, lambda: self._request(params))
+
+    async def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            if self.guard is None:
+                response = await self.client.get(self.api_url, params=params)
+            else:
+                response = await self.guard.call(lambda: self.client.get(self.api_url, params=params))
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"Error en la solicitud a Wikipedia API: {str(e)}")
+            raise Exception(f"Error al conectar con Wikipedia: {str(e)}")
+
+    async def search_articles(self, query: str, limit: int = 10) -> WikiSearchResponse:
+        logger.info(f"Buscando artículos con término: {query}")
+
+        data = await self._get(_search_params(query, limit))
+
+        try:
+            return _parse_search_response(data)
+        except Exception as e:
+            logger.error(f"Error al procesar resultados de Wikipedia: {str(e)}")
+            raise
+
+    async def get_article_content(self, page_id: int) -> Dict[str, Any]:
+        """
+        Obtiene el contenido completo de un artículo de Wikipedia
+        """
+        logger.info(f"Obteniendo contenido completo del artículo con ID: {page_id}")
+
+        data = await self._get(_extract_params(page_id, intro=False))
+
+        try:
+            return _parse_page(data, page_id, "content")
+        except Exception as e:
+            logger.error(f"Error al procesar contenido de Wikipedia: {str(e)}")
+            raise
+
+    async def get_article_summary(self, page_id: int) -> Dict[str, Any]:
+        """
+        Obtiene solo el resumen (introducción) de un artículo de Wikipedia
+        """
+        logger.info(f"Obteniendo resumen del artículo con ID: {page_id}")
+
+        data = await self._get(_extract_params(page_id, intro=True))
+
+        try:
+            return _parse_page(data, page_id, "summary")
+        except Exception as e:
+            logger.error(f"Error al procesar resumen de Wikipedia: {str(e)}")
+            raise
+
+    async def peek_article_details(self, page_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Detalles del artículo ya descargados, sin llamar a Wikipedia; sin
+        caché nunca los hay
+        """
+        return None
+
+    async def get_article_details(self, page_id: int) -> Dict[str, Any]:
+        """
+        Obtiene en una sola solicitud el contenido completo, el resumen y la
+        información de la página (URL y revisión) de un artículo
+        """
+        logger.info(f"Obteniendo detalles del artículo con ID: {page_id}")
+
+        data = await self._get(_details_params([page_id], intro=False))
+
+        try:
+            page_data = data.get("query", {}).get("pages", {}).get(str(page_id), {})
+            return _parse_details(page_data, page_id, page_data.get("extract", ""))
+        except Exception as e:
+            logger.error(f"Error al procesar detalles de Wikipedia: {str(e)}")
+            raise
+
+    async def get_revisions(self, page_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Obtiene la última revisión (lastrevid) y la fecha de modificación
+        (touched) de varias páginas, en lotes de REVISIONS_BATCH_SIZE pageids
+        y sin descargar su texto. Las páginas inexistentes no aparecen en el
+        resultado.
+        """
+        unique_ids = list(dict.fromkeys(page_ids))
+        logger.info(f"Consultando revisiones de {len(unique_ids)} artículos")
+
+        batches = [
+            unique_ids[i:i + REVISIONS_BATCH_SIZE]
+            for i in range(0, len(unique_ids), REVISIONS_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(self._get(_revisions_params(batch)) for batch in batches))
+
+        revisions = {}
+        for data in results:
+            for key, page_data in data.get("query", {}).get("pages", {}).items():
+                if "missing" in page_data or "invalid" in page_data:
+                    continue
+
+                revisions[int(key)] = {
+                    "revision_id": page_data.get("lastrevid"),
+                    "touched": page_data.get("touched")
+                }
+
+        return revisions
+
+    async def get_articles_details(
+            self,
+            page_ids: List[int],
+            include_content: bool = True,
+            errors: Optional[Dict[int, Exception]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Obtiene los detalles de varios artículos a la vez.
+
+        Sin contenido, los resúmenes y la información se piden en lotes de
+        pageids. TextExtracts solo devuelve un extracto completo por solicitud,
+        así que con contenido se hace una solicitud combinada por página, como
+        mucho DETAILS_CONCURRENCY a la vez. Las páginas inexistentes no
+        aparecen en el resultado.
+
+        Si se pasa `errors`, las páginas cuya solicitud falla se anotan ahí
+        con su error y se devuelven las demás; si no, se lanza el error.
+        """
+        unique_ids = list(dict.fromkeys(page_ids))
+        logger.info(f"Obteniendo detalles de {len(unique_ids)} artículos")
+
+        if include_content:
+            groups = [[page_id] for page_id in unique_ids]
+        else:
+            groups = [
+                unique_ids[i:i + EXTRACTS_BATCH_SIZE]
+                for i in range(0, len(unique_ids), EXTRACTS_BATCH_SIZE)
+            ]
+
+        semaphore = asyncio.Semaphore(DETAILS_CONCURRENCY)
+
+        async def fetch(group: List[int]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._get(_details_params(group, intro=not include_content))
+
+        results = await asyncio.gather(*(fetch(group) for group in groups), return_exceptions=True)
+
+        try:
+            details = {}
+            for group, data in zip(groups, results):
+                if isinstance(data, Exception):
+                    if errors is None:
+                        raise data
+                    errors.update({page_id: data for page_id in group})
+                    continue
+
+                for key, page_data in data.get("query", {}).get("pages", {}).items():
+                    if "missing" in page_data or "invalid" in page_data:
+                        continue
+
+                    page_id = int(key)
+                    content = page_data.get("extract", "") if include_content else None
+                    details[page_id] = _parse_details(page_data, page_id, content)
+
+            return details
+        except Exception as e:
+            logger.error(f"Error al procesar detalles de Wikipedia: {str(e)}")
+            raise
+
+
+class CachedWikipediaService(AsyncWikipediaService):
+    """
+    AsyncWikipediaService con caché de respuestas por niveles.
+
+    Las claves se construyen con los parámetros normalizados de cada consulta.
+    """
+
+    def __init__(
+            self,
+            cache: ResponseCache,
+            client: Optional[httpx.AsyncClient] = None,
+            api_url: Optional[str] = None,
+            flight: Optional[SingleFlight] = None,
+            guard: Optional[UpstreamGuard] = None
+    ):
+        super().__init__(client=client, api_url=api_url, flight=flight, guard=guard)
+        self.cache = cache
+
+    async def search_articles(self, query: str, limit: int = 10) -> WikiSearchResponse:
+        return await self.cache.get_or_load(
+            make_cache_key("search", q=query, limit=limit),
+            lambda: super(CachedWikipediaService, self).search_articles(query, limit),
+            encode=lambda response: response.model_dump(),
+            decode=WikiSearchResponse.model_validate
+        )
+
+    async def peek_article_details(self, page_id: int) -> Optional[Dict[str, Any]]:
+        cached = await self.cache.lookup(make_cache_key("details", page_id=page_id, content=True))
+        return cached[0] if cached is not None else None
+
+    async def get_article_details(self, page_id: int) -> Dict[str, Any]:
+        return await self.cache.get_or_load(
+            make_cache_key("details", page_id=page_id, content=True),
+            lambda: super(CachedWikipediaService, self).get_article_details(page_id)
+        )
+
+    async def get_articles_details(
+            self,
+            page_ids: List[int],
+            include_content: bool = True,
+            errors: Optional[Dict[int, Exception]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Cada página se guarda con su propia clave, así que solo se piden a
+        Wikipedia las que no están en caché. Si la solicitud de una página
+        falla, sirve su respuesta caducada si la hay.
+        """
+        details = {}
+        missing = []
+
+        for page_id in dict.fromkeys(page_ids):
+            cached = await self.cache.lookup(make_cache_key("details", page_id=page_id, content=include_content))
+            if cached is not None and cached[1]:
+                self.cache.hits += 1
+                details[page_id] = cached[0]
+            else:
+                self.cache.misses += 1
+                missing.append(page_id)
+
+        if missing:
+            failed: Dict[int, Exception] = {}
+            fetched = await super().get_articles_details(missing, include_content=include_content, errors=failed)
+
+            for page_id, page_details in fetched.items():
+                await self.cache.set(
+                    make_cache_key("details", page_id=page_id, content=include_content),
+                    page_details
+                )
+                details[page_id] = page_details
+
+            for page_id, error in failed.items():
+                fallback = self.cache.fallback(make_cache_key("details", page_id=page_id, content=include_content))
+                if fallback is not None:
+                    details[page_id] = fallback
+                elif errors is not None:
+                    errors[page_id] = error
+                else:
+                    raise error
+
+        return details
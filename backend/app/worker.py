@@ -0,0 +1,80 @@
+"""
+Worker de la cola de trabajos: python -m app.worker
+
+Ejecuta los trabajos encolados con POST /jobs (descarga de artículos,
+análisis, importación masiva y reanálisis) fuera de los procesos de la API,
+y el refresco periódico de los artículos guardados. Se pueden arrancar
+varios contra la misma base de datos; el refresco basta con tenerlo en uno
+(ARTICLE_REFRESH_INTERVAL=0 en los demás).
+"""
+import asyncio
+import signal
+import time
+from app.api.dependencies import get_wiki_service
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.db.base import Base
+from app.db.migrations import run_migrations
+from app.db.session import AsyncSessionLocal, async_engine, engine
+from app.services.analysis_executor import get_analysis_executor, shutdown_analysis_executor
+from app.services.article_refresher import (
+    article_refresher_stats,
+    get_article_refresher,
+    shutdown_article_refresher
+)
+from app.services.cache import close_response_cache
+from app.services.http_client import close_http_client
+from app.services.job_worker import JobWorker
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+    executor = get_analysis_executor()
+    executor.start()
+    if settings.MODELS_WARM_UP:
+        start = time.perf_counter()
+        await executor.warm_up()
+        logger.info(f"Modelos cargados en {time.perf_counter() - start:.2f} s")
+
+    worker = JobWorker(
+        AsyncSessionLocal,
+        get_wiki_service(),
+        executor,
+        concurrency=settings.JOB_CONCURRENCY,
+        type_limits=settings.JOB_TYPE_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        lock_timeout=settings.JOB_LOCK_TIMEOUT
+    )
+
+    if settings.ARTICLE_REFRESH_INTERVAL > 0:
+        get_article_refresher().start()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        logger.info(f"Worker detenido: {worker.stats()}")
+        if article_refresher_stats() is not None:
+            logger.info(f"Refresco de artículos guardados: {article_refresher_stats()}")
+        await shutdown_article_refresher()
+        shutdown_analysis_executor()
+        await close_response_cache()
+        await close_http_client()
+        await async_engine.dispose()
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
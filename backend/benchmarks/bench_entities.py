@@ -0,0 +1,73 @@
+"""
+Benchmark de extracción de entidades: pipeline completo documento a documento
+frente al pipeline solo-NER procesado en lotes con nlp.pipe.
+
+Uso (desde backend/, con el .env configurado):
+
+    python -m benchmarks.bench_entities --docs 200 --batch-size 32 --n-process 1
+"""
+import argparse
+import random
+import time
+import spacy
+from app.services.entities import EntityEngine, load_ner_pipeline
+
+SENTENCES = [
+    "Barack Obama was the president of the United States from 2009 to 2017.",
+    "The Eiffel Tower in Paris was completed in March 1889 by Gustave Eiffel.",
+    "Microsoft and Apple reported record earnings in the third quarter.",
+    "The Amazon River flows through Brazil, Peru and Colombia.",
+    "Marie Curie won the Nobel Prize in Physics in 1903 and in Chemistry in 1911.",
+    "The python programming language is widely used for data analysis.",
+]
+
+
+def make_documents(count: int, sentences_per_doc: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(SENTENCES) for _ in range(sentences_per_doc))
+        for _ in range(count)
+    ]
+
+
+def measure(label: str, fn, docs) -> float:
+    start = time.perf_counter()
+    fn(docs)
+    elapsed = time.perf_counter() - start
+    rate = len(docs) / elapsed
+    print(f"{label:<40} {elapsed:8.2f} s  {rate:10.1f} docs/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=40, help="Oraciones por documento")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    docs = make_documents(args.docs, args.sentences)
+
+    full_engine = EntityEngine(spacy.load(args.model))
+    print(f"Pipeline completo: {full_engine.nlp.pipe_names}")
+    before = measure(
+        "Antes: nlp(text) por documento",
+        lambda texts: [full_engine.extract(text) for text in texts],
+        docs
+    )
+
+    engine = EntityEngine(load_ner_pipeline(args.model), batch_size=args.batch_size, n_process=args.n_process)
+    print(f"Pipeline NER: {engine.nlp.pipe_names}")
+    after = measure(
+        f"Después: nlp.pipe (batch={args.batch_size}, n_process={args.n_process})",
+        engine.extract_many,
+        docs
+    )
+
+    print(f"Mejora: x{after / before:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark de sentimiento: TextBlob documento a documento frente al motor de
+léxico vectorizado con NumPy, uno a uno y en lote. Muestra también cuánto
+difieren las polaridades.
+
+Uso (desde backend/, con el .env configurado):
+
+    python -m benchmarks.bench_sentiment --docs 200 --sentences 200
+"""
+import argparse
+import time
+from benchmarks.bench_entities import make_documents
+from app.services.sentiment import LexiconSentimentBackend, TextBlobSentimentBackend, polarity_to_sentiment
+
+
+def measure(label: str, fn, docs):
+    start = time.perf_counter()
+    result = fn(docs)
+    elapsed = time.perf_counter() - start
+    rate = len(docs) / elapsed
+    print(f"{label:<40} {elapsed:8.2f} s  {rate:10.1f} docs/s")
+    return rate, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=200, help="Oraciones por documento")
+    args = parser.parse_args()
+
+    docs = make_documents(args.docs, args.sentences)
+
+    textblob = TextBlobSentimentBackend()
+    start = time.perf_counter()
+    lexicon = LexiconSentimentBackend.from_textblob()
+    print(f"Compilación del léxico: {time.perf_counter() - start:.3f} s")
+
+    before, reference = measure(
+        "TextBlob por documento",
+        lambda texts: [textblob.polarity(text) for text in texts],
+        docs
+    )
+    single, _ = measure(
+        "Léxico por documento",
+        lambda texts: [lexicon.polarity(text) for text in texts],
+        docs
+    )
+    after, polarities = measure("Léxico en lote", lexicon.polarities, docs)
+
+    difference = max(abs(a - b) for a, b in zip(reference, polarities))
+    same_label = sum(
+        polarity_to_sentiment(a).label == polarity_to_sentiment(b).label
+        for a, b in zip(reference, polarities)
+    )
+    print(f"Diferencia máxima de polaridad: {difference:.6f}")
+    print(f"Misma etiqueta: {same_label}/{len(docs)}")
+    print(f"Mejora: x{single / before:.2f} por documento, x{after / before:.2f} en lote")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark de arranque: tiempo de importar el analizador (sin cargar modelos)
+y de cargar cada modelo en el calentamiento, en un intérprete nuevo.
+
+Uso (desde backend/, con el .env configurado):
+
+    python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+MEASURE = """
+import json, time
+start = time.perf_counter()
+from app.services.analyzer import TextAnalyzer
+from app.services.model_registry import get_model_registry
+imported = time.perf_counter() - start
+analyzer = TextAnalyzer()
+status = get_model_registry().warm_up()
+print(json.dumps({
+    "import": imported,
+    "models": {name: model["load_seconds"] for name, model in status["models"].items()},
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for run in range(1, args.runs + 1):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+
+        print(f"Ejecución {run}: importación {result['import']:.2f} s")
+        for name, seconds in result["models"].items():
+            print(f"    {name:<30} {seconds:8.2f} s")
+        print(f"    {'total':<30} {result['import'] + sum(result['models'].values()):8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
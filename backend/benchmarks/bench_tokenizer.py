@@ -0,0 +1,95 @@
+"""
+Microbenchmark de tokenización: dos pasadas con re.findall (conteo y
+frecuencias por separado) frente a una sola TokenizedDocument compartida, y
+coste de las stop words por analizador frente al filtro en caché.
+
+Uso (desde backend/, con el .env configurado):
+
+    python -m benchmarks.bench_tokenizer --size-kb 500 --repeat 5
+"""
+import argparse
+import random
+import re
+import time
+from collections import Counter
+from nltk.corpus import stopwords
+from app.services.model_registry import ModelRegistry
+from app.services.tokenizer import TokenizedDocument
+
+VOCABULARY = (
+    "the of and in to a is was for on as with by he that from at his it an "
+    "python language programming data analysis wikipedia article history century "
+    "government university population river city war music science research"
+).split()
+
+
+def make_text(size_kb: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    words = []
+    size = 0
+    while size < size_kb * 1024:
+        word = rng.choice(VOCABULARY)
+        words.append(word.capitalize() if rng.random() < 0.1 else word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def two_pass(text: str, stop_words, top_n: int = 10):
+    word_count = len(re.findall(r'\b\w+\b', text.lower()))
+    words = re.findall(r'\b\w+\b', text.lower())
+    filtered = [word for word in words if word not in stop_words and len(word) > 2]
+    return word_count, Counter(filtered).most_common(top_n)
+
+
+def single_pass(text: str, stop_words, top_n: int = 10):
+    document = TokenizedDocument(text)
+    return document.word_count, document.frequent_words(stop_words, min_length=3, top_n=top_n)
+
+
+def measure(label: str, fn, text: str, stop_words, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text, stop_words)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{label:<32} mejor de {repeat}: {best * 1000:8.1f} ms")
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_text(args.size_kb)
+    stop_words = set(stopwords.words("english"))
+    print(f"Texto: {len(text) / 1024:.0f} KB")
+
+    before, expected = measure("Antes: dos pasadas findall", two_pass, text, stop_words, args.repeat)
+    after, result = measure("Después: TokenizedDocument", single_pass, text, stop_words, args.repeat)
+
+    assert result == expected, "Los resultados deben ser idénticos"
+    print(f"Mejora: x{before / after:.2f}")
+
+    # Stop words: releídas del corpus de NLTK en cada analizador frente al
+    # filtro compartido del registro
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        set(stopwords.words("english"))
+    per_analyzer = (time.perf_counter() - start) / args.repeat
+
+    registry = ModelRegistry()
+    registry.token_filter("english")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        registry.token_filter("english")
+    cached = (time.perf_counter() - start) / args.repeat
+
+    print(f"{'Stop words por analizador':<32} {per_analyzer * 1000:8.3f} ms")
+    print(f"{'Filtro compartido':<32} {cached * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
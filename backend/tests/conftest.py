@@ -1,24 +1,30 @@
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.migrations import run_migrations
+from app.db.session import get_async_db, get_async_session_factory, to_async_url
 from app.main import app
+from app.services.analysis_executor import AnalysisExecutor, get_analysis_executor
 
-# Base de datos en memoria para pruebas
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+
+@pytest.fixture(scope="function")
+def database_url(tmp_path):
+    # Archivo SQLite por prueba: lo comparten la sesión síncrona de las
+    # pruebas y el motor asíncrono de las rutas
+    return f"sqlite:///{tmp_path / 'test.db'}"
 
 
 @pytest.fixture(scope="function")
-def test_db():
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def test_db(database_url):
+    engine = create_engine(database_url)
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
 
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = TestingSessionLocal()
@@ -28,20 +34,38 @@ def test_db():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        engine.dispose()
 
 
 @pytest.fixture(scope="function")
-def client(test_db):
-    def override_get_db():
-        try:
-            yield test_db
-        finally:
-            pass
+def async_session_factory(test_db, database_url):
+    # NullPool: cada sesión abre su conexión en el event loop que la usa
+    engine = create_async_engine(to_async_url(database_url), poolclass=NullPool)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def async_db(async_session_factory):
+    async with async_session_factory() as db:
+        yield db
+
+
+@pytest.fixture(scope="function")
+def client(async_session_factory, monkeypatch):
+    # Sin calentar los modelos al arrancar: se cargan en las pruebas que los usan
+    monkeypatch.setattr(settings, "MODELS_WARM_UP", False)
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
 
-    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: async_session_factory
+    # Análisis en hilos del propio proceso para que los mocks se apliquen
+    app.dependency_overrides[get_analysis_executor] = lambda: AnalysisExecutor(max_workers=0, max_pending=8)
 
     # Crea un cliente de prueba
     with TestClient(app) as test_client:
         yield test_client
 
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
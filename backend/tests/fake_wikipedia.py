@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class _Server(ThreadingHTTPServer):
+    # El backlog por defecto (5) hace que ráfagas de conexiones esperen reintentos de SYN
+    request_queue_size = 128
+
+
+class FakeWikipediaServer:
+    """
+    Servidor MediaWiki falso en un hilo local para pruebas de integración
+    del cliente HTTP (latencia simulada, fallos inyectados y registro de
+    solicitudes)
+    """
+
+    def __init__(self, pages=None, delay: float = 0.0):
+        self.pages = pages or {}
+        self.delay = delay
+        self.requests = []
+        # Respuestas de error para las próximas solicitudes: (estado, Retry-After)
+        self.failures = []
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/w/api.php"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fail_next(self, count: int = 1, status: int = 503, retry_after=None):
+        """
+        Las próximas `count` solicitudes responden con `status`
+        """
+        with self._lock:
+            self.failures.extend([(status, retry_after)] * count)
+
+    def build_response(self, params):
+        if params.get("list") == "search":
+            query = params.get("srsearch", "")
+            results = [
+                {"pageid": page_id, "title": page["title"], "snippet": page.get("extract", "")[:50]}
+                for page_id, page in self.pages.items()
+                if query.lower() in page["title"].lower()
+            ]
+            return {"query": {"search": results, "searchinfo": {"totalhits": len(results)}}}
+
+        page_ids = [pid for pid in params.get("pageids", "").split("|") if pid]
+        pages = {}
+        for page_id in page_ids:
+            page = self.pages.get(int(page_id))
+            if page is None:
+                pages[page_id] = {"pageid": int(page_id), "missing": ""}
+                continue
+
+            data = {
+                "pageid": int(page_id),
+                "title": page["title"],
+                "fullurl": f"https://en.wikipedia.org/wiki/{page['title'].replace(' ', '_')}",
+                "lastrevid": page.get("revision_id", 1),
+                "touched": page.get("touched", "2024-01-01T00:00:00Z"),
+            }
+            if "extracts" in params.get("prop", ""):
+                extract = page.get("extract", "")
+                # Igual que MediaWiki: un booleano presente es verdadero
+                if "exintro" in params:
+                    extract = extract.split("\n\n\n==")[0]
+                data["extract"] = extract
+            pages[page_id] = data
+
+        return {"query": {"pages": pages}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                params = {k: v[-1] for k, v in parse_qs(urlparse(self.path).query).items()}
+                with server._lock:
+                    server.requests.append(params)
+                    failure = server.failures.pop(0) if server.failures else None
+
+                if server.delay:
+                    time.sleep(server.delay)
+
+                if failure is not None:
+                    status, retry_after = failure
+                    body = b'{"error": "fallo inyectado"}'
+                    self.send_response(status)
+                    if retry_after is not None:
+                        self.send_header("Retry-After", str(retry_after))
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                body = json.dumps(server.build_response(params)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -1,24 +1,20 @@
 from unittest.mock import patch
+import json
+from sqlalchemy import inspect
 from app.schemas.article import ArticleDetailResponse, SavedArticleInDB, ArticleAnalysis
-from app.db.models import SavedArticle
+from app.db.models import Job, SavedArticle
+from app.services.analysis_executor import AnalysisQueueFullError
 
 
 def test_get_article_detail(client):
     # Mock para los servicios de Wikipedia y analizador
-    with patch("app.services.wiki_service.WikipediaService.get_article_content") as mock_content, \
-            patch("app.services.wiki_service.WikipediaService.get_article_summary") as mock_summary, \
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
             patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
         # Configura las respuestas simuladas
-        mock_content.return_value = {
+        mock_details.return_value = {
             "page_id": 12345,
             "title": "Test Article",
             "content": "This is test content",
-            "url": "https://en.wikipedia.org/wiki/Test_Article"
-        }
-
-        mock_summary.return_value = {
-            "page_id": 12345,
-            "title": "Test Article",
             "summary": "This is a test summary",
             "url": "https://en.wikipedia.org/wiki/Test_Article"
         }
@@ -38,6 +34,8 @@ def test_get_article_detail(client):
         data = response.json()
         assert data["article"]["title"] == "Test Article"
         assert data["analysis"]["word_count"] == 4
+        assert data["article"]["summary"] == "This is a test summary"
+        mock_details.assert_called_once_with(12345)
 
 
 def test_save_article(client, test_db):
@@ -65,4 +63,474 @@ def test_save_article(client, test_db):
         SavedArticle.wikipedia_id == "12345"
     ).first()
     assert db_article is not None
-    assert db_article.title == "Test Article"
\ No newline at end of file
+    assert db_article.title == "Test Article"
+
+def test_get_article_detail_reuses_stored_analysis(client):
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_details.return_value = {
+            "page_id": 12345,
+            "title": "Test Article",
+            "content": "This is test content",
+            "summary": "This is a test summary",
+            "url": "https://en.wikipedia.org/wiki/Test_Article",
+            "revision_id": 1
+        }
+        mock_analyze.return_value = ArticleAnalysis(word_count=4, frequent_words=[])
+
+        first = client.get("/api/articles/detail/12345")
+        second = client.get("/api/articles/detail/12345")
+
+        assert first.status_code == 200
+        assert second.json()["analysis"] == first.json()["analysis"]
+        assert mock_analyze.call_count == 1
+
+
+def test_get_article_detail_saved_full_text_skips_wikipedia(client, test_db):
+    test_db.add(SavedArticle(
+        title="Test Article",
+        wikipedia_id="12345",
+        wikipedia_url="https://en.wikipedia.org/wiki/Test_Article",
+        full_text="This is the saved text",
+        user_id="default_user"
+    ))
+    test_db.commit()
+
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_analyze.return_value = ArticleAnalysis(word_count=5, frequent_words=[])
+
+        response = client.get("/api/articles/detail/12345")
+
+        assert response.status_code == 200
+        assert response.json()["article"]["title"] == "Test Article"
+        mock_details.assert_not_called()
+        mock_analyze.assert_called_once()
+        assert mock_analyze.call_args.args[0] == "This is the saved text"
+
+
+def test_get_article_detail_returns_429_when_analysis_queue_is_full(client):
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analysis_executor.AnalysisExecutor.analyze") as mock_analyze:
+        mock_details.return_value = {"page_id": 12345, "title": "Test Article", "content": "Text", "url": ""}
+        mock_analyze.side_effect = AnalysisQueueFullError("Demasiados análisis pendientes")
+
+        response = client.get("/api/articles/detail/12345")
+
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+
+
+def _save_articles(test_db, count):
+    for index in range(count):
+        test_db.add(SavedArticle(
+            title=f"Article {index}",
+            wikipedia_id=str(index),
+            wikipedia_url=f"https://en.wikipedia.org/wiki/Article_{index}",
+            user_id="default_user"
+        ))
+    test_db.commit()
+
+
+def test_get_saved_articles_cursor_pagination(client, test_db):
+    _save_articles(test_db, 5)
+
+    titles = []
+    totals = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/articles/", params=params)
+        assert response.status_code == 200
+        data = response.json()
+
+        titles.extend(item["title"] for item in data["items"])
+        totals.append(data["total"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert titles == [f"Article {index}" for index in range(5)]
+    assert totals == [5, 5, 5]
+
+
+def test_get_saved_articles_cursor_with_mixed_date_formats(client, test_db):
+    # CURRENT_TIMESTAMP y los datetime de Python se guardan en SQLite con
+    # formatos distintos; el cursor debe compararlos como fechas
+    _save_articles(test_db, 2)
+    created_at = test_db.query(SavedArticle).first().created_at
+    test_db.add(SavedArticle(
+        title="Article 2", wikipedia_id="2", wikipedia_url="https://en.wikipedia.org/wiki/Article_2",
+        user_id="default_user", created_at=created_at.replace(microsecond=500000)
+    ))
+    test_db.commit()
+
+    first = client.get("/api/articles/", params={"limit": 1}).json()
+    # El total se recalcula en cada página
+    test_db.add(SavedArticle(
+        title="Article 3", wikipedia_id="3", wikipedia_url="https://en.wikipedia.org/wiki/Article_3",
+        user_id="default_user", created_at=created_at.replace(microsecond=900000)
+    ))
+    test_db.commit()
+    second = client.get("/api/articles/", params={"limit": 10, "cursor": first["next_cursor"]}).json()
+
+    assert [item["title"] for item in first["items"] + second["items"]] == [
+        "Article 0", "Article 1", "Article 2", "Article 3"
+    ]
+    assert (first["total"], second["total"]) == (3, 4)
+
+
+def test_get_saved_articles_skip_and_optional_total(client, test_db):
+    _save_articles(test_db, 3)
+
+    data = client.get("/api/articles/", params={"skip": 2, "limit": 2}).json()
+    assert [item["title"] for item in data["items"]] == ["Article 2"]
+    assert data["total"] == 3
+    assert data["next_cursor"] is None
+
+    data = client.get("/api/articles/", params={"limit": 1, "include_total": False}).json()
+    assert data["total"] is None
+    assert data["next_cursor"] is not None
+
+
+def test_get_saved_articles_invalid_cursor(client):
+    response = client.get("/api/articles/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_saved_article_list_does_not_load_full_text(client, test_db):
+    test_db.add(SavedArticle(
+        title="Long Article",
+        wikipedia_id="1",
+        wikipedia_url="https://en.wikipedia.org/wiki/Long_Article",
+        full_text="word " * 1000,
+        user_id="default_user"
+    ))
+    test_db.commit()
+    test_db.expire_all()
+
+    article = test_db.query(SavedArticle).first()
+    assert "full_text" in inspect(article).unloaded
+
+    response = client.get(f"/api/articles/{article.id}/full-text")
+    assert response.status_code == 200
+    assert response.json()["full_text"] == "word " * 1000
+
+    assert client.get("/api/articles/999/full-text").status_code == 404
+
+
+def test_update_and_delete_article(client, test_db):
+    _save_articles(test_db, 1)
+    article_id = test_db.query(SavedArticle).first().id
+
+    response = client.patch(f"/api/articles/{article_id}", json={"personal_notes": "Para leer"})
+    assert response.status_code == 200
+    assert response.json()["personal_notes"] == "Para leer"
+
+    assert client.delete(f"/api/articles/{article_id}").status_code == 200
+    assert client.delete(f"/api/articles/{article_id}").status_code == 404
+
+
+def test_save_article_twice_reports_duplicate(client, test_db):
+    article_data = {
+        "title": "Test Article",
+        "wikipedia_id": "12345",
+        "wikipedia_url": "https://en.wikipedia.org/wiki/Test_Article",
+    }
+
+    assert client.post("/api/articles/", json=article_data).status_code == 200
+    response = client.post("/api/articles/", json=article_data)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "El artículo ya está guardado"
+    assert test_db.query(SavedArticle).count() == 1
+
+
+def test_bulk_save_articles(client, test_db):
+    _save_articles(test_db, 1)
+
+    def article(wikipedia_id, summary=None):
+        return {
+            "title": f"Article {wikipedia_id}",
+            "wikipedia_id": wikipedia_id,
+            "wikipedia_url": f"https://en.wikipedia.org/wiki/Article_{wikipedia_id}",
+            "summary": summary,
+        }
+
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_articles_details") as mock_details:
+        mock_details.return_value = {20: {"page_id": 20, "summary": "Fetched summary"}}
+
+        response = client.post("/api/articles/bulk", json={"items": [
+            article("10", summary="Own summary"),
+            article("20"),
+            article("10", summary="Own summary"),
+            article("0", summary="Already saved"),
+            article("30"),
+        ]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [result["status"] for result in data["results"]] == [
+        "created", "created", "duplicate", "duplicate", "error"
+    ]
+    assert data["counts"] == {"created": 2, "duplicate": 2, "error": 1}
+    mock_details.assert_called_once_with([20, 30], include_content=False, errors={})
+
+    saved = {a.wikipedia_id: a for a in test_db.query(SavedArticle).all()}
+    assert saved["20"].summary == "Fetched summary"
+    assert saved["10"].id == data["results"][0]["id"]
+
+
+def test_bulk_delete_articles(client, test_db):
+    _save_articles(test_db, 2)
+    ids = [a.id for a in test_db.query(SavedArticle).all()]
+
+    response = client.request("DELETE", "/api/articles/bulk", json={"ids": ids + [999]})
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == ["deleted", "deleted", "not_found"]
+    assert test_db.query(SavedArticle).count() == 0
+
+
+def test_search_saved_articles(client, test_db):
+    test_db.add_all([
+        SavedArticle(
+            title="Python", wikipedia_id="1", wikipedia_url="https://en.wikipedia.org/wiki/Python",
+            summary="A programming language", full_text="Python is a programming language. Python is popular.",
+            user_id="default_user"
+        ),
+        SavedArticle(
+            title="Snake", wikipedia_id="2", wikipedia_url="https://en.wikipedia.org/wiki/Snake",
+            summary="Reptiles", full_text="Some snakes are pythons.", user_id="default_user"
+        ),
+        SavedArticle(
+            title="Java", wikipedia_id="3", wikipedia_url="https://en.wikipedia.org/wiki/Java",
+            summary="Another programming language", user_id="default_user"
+        ),
+    ])
+    test_db.commit()
+
+    data = client.get("/api/articles/search", params={"q": "programming language"}).json()
+    assert {result["title"] for result in data["results"]} == {"Python", "Java"}
+    assert data["results"][0]["rank"] >= data["results"][1]["rank"]
+    assert data["total"] == 2
+
+    # total cuenta todas las coincidencias, no solo las devueltas
+    data = client.get("/api/articles/search", params={"q": "programming language", "limit": 1}).json()
+    assert (len(data["results"]), data["total"]) == (1, 2)
+
+    # Las actualizaciones se reflejan en el índice
+    java_id = next(result["id"] for result in data["results"] if result["title"] == "Java")
+    client.patch(f"/api/articles/{java_id}", json={"personal_notes": "Coffee island"})
+    data = client.get("/api/articles/search", params={"q": "coffee"}).json()
+    assert [result["id"] for result in data["results"]] == [java_id]
+
+    # La sintaxis de FTS5 del usuario no se interpreta
+    assert client.get("/api/articles/search", params={"q": 'python" OR'}).status_code == 200
+
+
+def test_saved_articles_stats_follow_saves_and_deletes(client):
+    def article(wikipedia_id, word_count, words, entities):
+        return {
+            "title": f"Article {wikipedia_id}",
+            "wikipedia_id": wikipedia_id,
+            "wikipedia_url": f"https://en.wikipedia.org/wiki/Article_{wikipedia_id}",
+            "summary": "Summary",
+            "word_count": word_count,
+            "frequent_words": [{"word": word, "count": count} for word, count in words],
+            "entities": [
+                {"text": text, "type": "ORG", "start": 0, "end": len(text), "count": count}
+                for text, count in entities
+            ],
+        }
+
+    first = client.post("/api/articles/", json=article("1", 300, [("python", 5), ("code", 2)], [("PSF", 2)])).json()
+    client.post("/api/articles/bulk", json={"items": [
+        article("2", 1200, [("python", 3)], [("PSF", 1), ("Google", 1)]),
+    ]})
+
+    stats = client.get("/api/articles/stats").json()
+    assert stats["total_articles"] == 2
+    assert stats["total_words"] == 1500
+    assert stats["top_words"][0] == {"word": "python", "count": 8, "articles": 2}
+    assert stats["top_entities"][0] == {"text": "PSF", "type": "ORG", "mentions": 3, "articles": 2}
+    assert stats["word_count_distribution"] == [
+        {"min_words": 0, "max_words": 499, "articles": 1},
+        {"min_words": 1000, "max_words": 2499, "articles": 1},
+    ]
+
+    client.delete(f"/api/articles/{first['id']}")
+
+    stats = client.get("/api/articles/stats").json()
+    assert stats["total_articles"] == 1
+    assert stats["top_words"] == [{"word": "python", "count": 3, "articles": 1}]
+    assert [bucket["min_words"] for bucket in stats["word_count_distribution"]] == [1000]
+
+
+def _stream_events(client, url):
+    with client.stream("GET", url) as response:
+        assert response.status_code == 200
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_stream_article_detail(client):
+    def analyze_part(text, part=None, top_n=10):
+        if part is None:
+            return {"word_count": 4, "frequent_words": [{"word": "test", "count": 2}]}
+        if part == "sentiment":
+            return {"sentiment": {"label": "Neutral", "positive": 0.5, "negative": 0.5, "neutral": 0.8}}
+        return {"entities": [{"text": "Test", "type": "ORG", "start": 0, "end": 4}]}
+
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_part", side_effect=analyze_part) as mock_analyze:
+        mock_details.return_value = {
+            "page_id": 12345,
+            "title": "Test Article",
+            "content": "This is test content",
+            "summary": "This is a test summary",
+            "url": "https://en.wikipedia.org/wiki/Test_Article"
+        }
+
+        events = _stream_events(client, "/api/articles/detail/12345/stream")
+        assert mock_analyze.call_count == 3
+
+        names = [event["event"] for event in events]
+        # Un solo análisis, parte por parte, sin repetir la tokenización
+        assert [call.args[1] for call in mock_analyze.call_args_list] == [None, "sentiment", "entities"]
+        assert names == ["article", "word_stats", "sentiment", "entities", "done"]
+
+        data = {event["event"]: event["data"] for event in events}
+        assert data["article"]["title"] == "Test Article"
+        assert data["word_stats"]["word_count"] == 4
+        assert data["sentiment"]["sentiment"]["label"] == "Neutral"
+        assert data["entities"]["entities"][0]["text"] == "Test"
+
+        # El análisis completo queda guardado y la siguiente vez no se recalcula
+        events = _stream_events(client, "/api/articles/detail/12345/stream")
+        assert [event["event"] for event in events] == ["article", "word_stats", "sentiment", "entities", "done"]
+        assert mock_analyze.call_count == 3
+
+
+def test_stream_article_detail_as_server_sent_events(client, test_db):
+    test_db.add(SavedArticle(
+        title="Saved", wikipedia_id="1", wikipedia_url="https://en.wikipedia.org/wiki/Saved",
+        full_text="Saved text", user_id="default_user"
+    ))
+    test_db.commit()
+
+    with patch("app.services.analyzer.TextAnalyzer.analyze_part") as mock_analyze:
+        mock_analyze.return_value = {"word_count": 2, "frequent_words": []}
+
+        with client.stream("GET", "/api/articles/detail/1/stream?format=sse&include=") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+
+    assert body.startswith("event: article\ndata: ")
+    assert body.rstrip().endswith("event: done\ndata: {}")
+
+
+def test_get_article_detail_with_field_mask(client):
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_details.return_value = {
+            "page_id": 12345,
+            "title": "Test Article",
+            "content": "This is test content",
+            "url": "https://en.wikipedia.org/wiki/Test_Article"
+        }
+        mock_analyze.return_value = ArticleAnalysis(word_count=4, frequent_words=[])
+
+        response = client.get("/api/articles/detail/12345", params={"include": ""})
+        assert response.status_code == 200
+        assert response.json()["analysis"]["word_count"] == 4
+        mock_analyze.assert_called_once_with("This is test content", top_n=10, parts=())
+
+        response = client.get("/api/articles/detail/12345", params={"include": "entities, sentiment"})
+        assert mock_analyze.call_args.kwargs["parts"] == ("entities", "sentiment")
+
+        assert client.get("/api/articles/detail/12345", params={"include": "syntax"}).status_code == 422
+
+
+def test_field_mask_reuses_stored_full_analysis(client):
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_details.return_value = {"page_id": 12345, "title": "Test Article", "content": "Text"}
+        mock_analyze.return_value = ArticleAnalysis(
+            word_count=1,
+            frequent_words=[],
+            sentiment={"label": "Neutral", "positive": 0.5, "negative": 0.5, "neutral": 0.8},
+            entities=[]
+        )
+
+        client.get("/api/articles/detail/12345")
+        response = client.get("/api/articles/detail/12345", params={"include": "entities"})
+
+    analysis = response.json()["analysis"]
+    assert mock_analyze.call_count == 1
+    assert analysis["sentiment"] is None
+    assert analysis["entities"] == []
+
+
+def test_readiness_reports_model_status(client):
+    with patch("app.services.analysis_executor.get_model_registry") as mock_registry:
+        mock_registry.return_value.status.return_value = {"ready": False, "models": {}}
+        assert client.get("/api/health/ready").status_code == 503
+
+        mock_registry.return_value.status.return_value = {"ready": True, "models": {}}
+        response = client.get("/api/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+
+def test_save_article_keeps_wikipedia_revision(client):
+    response = client.post("/api/articles/", json={
+        "title": "Test Article",
+        "wikipedia_id": "12345",
+        "wikipedia_url": "https://en.wikipedia.org/wiki/Test_Article",
+        "revision_id": 987654,
+        "touched": "2024-05-01T10:00:00Z"
+    })
+
+    assert response.status_code == 200
+    assert response.json()["revision_id"] == 987654
+    assert response.json()["touched"] == "2024-05-01T10:00:00"
+    assert response.json()["last_checked_at"] is None
+
+
+def test_save_article_takes_full_text_from_the_detail_view(client, test_db):
+    with patch("app.services.wiki_service.AsyncWikipediaService.get_article_details") as mock_details, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_details.return_value = {
+            "page_id": 12345, "title": "Test Article", "content": "This is test content",
+            "summary": "Summary", "url": "https://en.wikipedia.org/wiki/Test_Article"
+        }
+        mock_analyze.return_value = ArticleAnalysis(word_count=4, frequent_words=[])
+        assert "content" not in client.get("/api/articles/detail/12345").json()
+
+        response = client.post("/api/articles/", json={
+            "title": "Test Article",
+            "wikipedia_id": "12345",
+            "wikipedia_url": "https://en.wikipedia.org/wiki/Test_Article",
+        })
+
+    assert response.status_code == 200
+    # Sale de la caché: no vuelve a pedirse a Wikipedia ni se encola nada
+    assert mock_details.call_count == 1
+    assert test_db.query(SavedArticle).one().full_text == "This is test content"
+    assert test_db.query(Job).count() == 0
+
+
+def test_save_article_without_cached_text_enqueues_fetch(client, test_db):
+    response = client.post("/api/articles/", json={
+        "title": "Test Article",
+        "wikipedia_id": "12345",
+        "wikipedia_url": "https://en.wikipedia.org/wiki/Test_Article",
+    })
+
+    assert response.status_code == 200
+    job = test_db.query(Job).one()
+    assert job.type == "fetch_full_text"
+    assert job.payload == {"article_id": response.json()["id"]}
@@ -0,0 +1,26 @@
+def test_create_and_get_job(client):
+    response = client.post("/api/jobs/", json={"type": "fetch_article", "payload": {"page_id": 12345}, "priority": 5})
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["attempts"] == 0
+    # El payload se guarda ya validado, con sus valores por defecto
+    assert job["payload"] == {"page_id": 12345, "user_id": "default_user"}
+
+    response = client.get(f"/api/jobs/{job['id']}")
+    assert response.status_code == 200
+    assert response.json()["priority"] == 5
+
+
+def test_create_job_rejects_invalid_payload(client):
+    response = client.post("/api/jobs/", json={"type": "analyze_article", "payload": {}})
+    assert response.status_code == 422
+
+    response = client.post("/api/jobs/", json={"type": "unknown", "payload": {}})
+    assert response.status_code == 422
+
+
+def test_get_missing_job(client):
+    response = client.get("/api/jobs/999")
+    assert response.status_code == 404
@@ -1,10 +1,11 @@
 from unittest.mock import patch
 from app.schemas.article import WikiSearchResponse, WikiSearchResult
+from app.services.resilience import UpstreamUnavailableError
 
 
 def test_search_endpoint(client):
     # Configura el mock para no hacer llamadas reales a la API de Wikipedia
-    with patch("app.services.wiki_service.WikipediaService.search_articles") as mock_search:
+    with patch("app.services.wiki_service.AsyncWikipediaService.search_articles") as mock_search:
         # Configura la respuesta simulada
         mock_response = WikiSearchResponse(
             results=[
@@ -27,4 +28,28 @@ def test_search_endpoint(client):
         data = response.json()
         assert data["total"] == 1
         assert len(data["results"]) == 1
-        assert data["results"][0]["title"] == "Test Article"
\ No newline at end of file
+        assert data["results"][0]["title"] == "Test Article"
+
+def test_search_endpoint_is_cached(client):
+    with patch("app.services.wiki_service.AsyncWikipediaService.search_articles") as mock_search:
+        mock_search.return_value = WikiSearchResponse(results=[], total=0)
+
+        client.get("/api/search/?q=python")
+        response = client.get("/api/search/?q=Python")
+
+        assert response.status_code == 200
+        assert mock_search.call_count == 1
+
+        metrics = client.get("/api/metrics/").json()
+        assert metrics["cache"]["hits"] == 1
+        assert metrics["cache"]["misses"] == 1
+
+
+def test_search_returns_503_while_wikipedia_is_unavailable(client):
+    with patch("app.services.wiki_service.AsyncWikipediaService.search_articles") as mock_search:
+        mock_search.side_effect = UpstreamUnavailableError("Wikipedia no está disponible temporalmente", retry_after=12.5)
+
+        response = client.get("/api/search/?q=outage")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "13"
@@ -0,0 +1,111 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base import Base
+from app.db.migrations import run_migrations
+from app.db.models import AppliedMigration, SavedArticle, WordCountBucketStat, WordStat
+from app.schemas.article import SavedArticleInDB
+
+LEGACY_TABLE = """
+CREATE TABLE saved_articles (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    wikipedia_id VARCHAR(255) NOT NULL,
+    wikipedia_url VARCHAR(255) NOT NULL,
+    summary TEXT,
+    full_text TEXT,
+    personal_notes TEXT,
+    word_count INTEGER,
+    frequent_words TEXT,
+    user_id VARCHAR(255),
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+
+def _legacy_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_TABLE))
+        conn.execute(text(
+            "INSERT INTO saved_articles (id, title, wikipedia_id, wikipedia_url, frequent_words, user_id, created_at) "
+            "VALUES (1, 'Python', '23862', 'https://en.wikipedia.org/wiki/Python', :words, 'default_user', "
+            "CURRENT_TIMESTAMP)"
+        ), {"words": str([{"word": "python", "count": 5}, {"word": "language", "count": 3}])})
+        conn.execute(text(
+            "INSERT INTO saved_articles (id, title, wikipedia_id, wikipedia_url, frequent_words, user_id, created_at) "
+            "VALUES (2, 'Empty', '1', 'https://en.wikipedia.org/wiki/Empty', NULL, 'default_user', CURRENT_TIMESTAMP)"
+        ))
+    return engine
+
+
+def _migrate(engine):
+    # Igual que al arrancar la app: create_all crea solo las tablas nuevas
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+
+
+def test_legacy_frequent_words_are_converted_to_json():
+    engine = _legacy_engine()
+
+    _migrate(engine)
+    # Una segunda ejecución no debe cambiar nada
+    _migrate(engine)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        article = SavedArticleInDB.model_validate(db.get(SavedArticle, 1))
+        empty = SavedArticleInDB.model_validate(db.get(SavedArticle, 2))
+        word_stat = db.get(WordStat, ("default_user", "python"))
+    finally:
+        db.close()
+
+    assert [(wf.word, wf.count) for wf in article.frequent_words] == [("python", 5), ("language", 3)]
+    # Las estadísticas acumuladas se calculan para los artículos existentes
+    assert (word_stat.total_count, word_stat.article_count) == (5, 1)
+    assert empty.frequent_words is None
+
+
+def test_duplicated_saved_articles_are_removed_before_unique_index():
+    engine = _legacy_engine()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO saved_articles (id, title, wikipedia_id, wikipedia_url, user_id, created_at) "
+            "VALUES (3, 'Python again', '23862', 'https://en.wikipedia.org/wiki/Python', 'default_user', "
+            "CURRENT_TIMESTAMP)"
+        ))
+
+    _migrate(engine)
+
+    with engine.connect() as conn:
+        ids = [row[0] for row in conn.execute(text("SELECT id FROM saved_articles ORDER BY id"))]
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("saved_articles")}
+
+    assert ids == [1, 2]
+    assert indexes["uq_saved_articles_user_wikipedia"]["unique"]
+
+
+def test_stats_backfill_runs_once():
+    engine = _legacy_engine()
+    _migrate(engine)
+
+    # Sin la marca, un segundo proceso vería las tablas vacías y sumaría de nuevo
+    with engine.begin() as conn:
+        conn.execute(WordStat.__table__.delete())
+        conn.execute(WordCountBucketStat.__table__.delete())
+    _migrate(engine)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        marker = db.get(AppliedMigration, "backfill_article_stats")
+        word_stat = db.get(WordStat, ("default_user", "python"))
+    finally:
+        db.close()
+
+    assert marker is not None
+    assert word_stat is None
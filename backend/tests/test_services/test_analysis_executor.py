@@ -0,0 +1,131 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from app.schemas.article import ArticleAnalysis
+from app.services.analysis_executor import AnalysisExecutor, AnalysisQueueFullError
+
+
+def _slow_analysis(text, top_n=10, parts=None):
+    time.sleep(0.2)
+    return ArticleAnalysis(word_count=len(text.split()), frequent_words=[])
+
+
+@pytest.mark.asyncio
+async def test_analysis_runs_off_the_event_loop():
+    executor = AnalysisExecutor(max_workers=0, max_pending=4)
+
+    with patch("app.services.analyzer.TextAnalyzer.analyze_text", side_effect=_slow_analysis):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(executor.analyze(f"one two {index}") for index in range(4)))
+        elapsed = time.perf_counter() - start
+
+    assert all(result.word_count == 3 for result in results)
+    assert elapsed < 0.6, "Los análisis no deberían ejecutarse en serie"
+    assert executor.stats()["completed"] == 4
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full():
+    executor = AnalysisExecutor(max_workers=0, max_pending=1)
+
+    with patch("app.services.analyzer.TextAnalyzer.analyze_text", side_effect=_slow_analysis):
+        first = asyncio.create_task(executor.analyze("one"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AnalysisQueueFullError):
+            await executor.analyze("two")
+
+        await first
+
+    assert executor.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_process_pool_analysis():
+    executor = AnalysisExecutor(max_workers=1, max_pending=4)
+
+    try:
+        analysis = await executor.analyze("Python is a programming language. Python is popular.")
+    finally:
+        executor.shutdown()
+
+    assert analysis.word_count == 8
+    assert analysis.frequent_words[0].word == "python"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_starts_and_loads_every_pool_process():
+    executor = AnalysisExecutor(max_workers=2, max_pending=4)
+
+    try:
+        assert executor.models_status()["ready"] is False
+        status = await executor.warm_up()
+    finally:
+        executor.shutdown()
+
+    # Los procesos del pool se arrancan bajo demanda: cada uno debe haber
+    # cargado los modelos en el calentamiento
+    assert status["ready"] is True
+    assert status["workers"] == 2
+    assert executor.models_status() == status
+
+
+@pytest.mark.asyncio
+async def test_concurrent_analyses_are_coalesced_into_micro_batches():
+    executor = AnalysisExecutor(max_workers=0, max_pending=8, batch_window=0.05, batch_size=8)
+
+    def analyze_texts(texts, top_n=10, parts=None):
+        return [ArticleAnalysis(word_count=len(text.split()), frequent_words=[]) for text in texts]
+
+    with patch("app.services.analyzer.TextAnalyzer.analyze_texts", side_effect=analyze_texts) as mock_batch:
+        results = await asyncio.gather(
+            executor.analyze("one"),
+            executor.analyze("one two"),
+            executor.analyze("one two three")
+        )
+
+    assert [result.word_count for result in results] == [1, 2, 3]
+    assert mock_batch.call_count == 1
+    assert executor.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_analyses_of_the_same_text_run_once():
+    executor = AnalysisExecutor(max_workers=0, max_pending=1)
+
+    with patch("app.services.analyzer.TextAnalyzer.analyze_text", side_effect=_slow_analysis) as mock_analyze:
+        # Con max_pending=1, los llamadores agrupados no ocupan hueco
+        results = await asyncio.gather(*(executor.analyze("one two three") for _ in range(5)))
+
+    assert all(result.word_count == 3 for result in results)
+    assert mock_analyze.call_count == 1
+    assert executor.stats()["single_flight"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_staged_analysis_takes_one_slot_and_is_shared():
+    executor = AnalysisExecutor(max_workers=0, max_pending=1)
+
+    def analyze_part(text, part=None, top_n=10):
+        time.sleep(0.05)
+        if part is None:
+            return {"word_count": 2, "frequent_words": []}
+        if part == "sentiment":
+            return {"sentiment": {"label": "Neutral", "positive": 0.5, "negative": 0.5, "neutral": 0.8}}
+        return {"entities": []}
+
+    async def collect():
+        return [analysis async for analysis in executor.analyze_stages("one two")]
+
+    with patch("app.services.analyzer.TextAnalyzer.analyze_part", side_effect=analyze_part) as mock_part:
+        stages = asyncio.create_task(collect())
+        await asyncio.sleep(0.01)
+        # Con un solo hueco, el mismo análisis completo se une al que está en curso
+        full = await executor.analyze("one two")
+        partials = await stages
+
+    assert mock_part.call_count == 3
+    assert [analysis.sentiment is not None for analysis in partials] == [False, True, True]
+    assert partials[-1] == full
+    assert full.entities == []
@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import func, select
+from app.db.models import ArticleAnalysisRecord
+from app.schemas.article import ArticleAnalysis, WordFrequency
+from app.services.analysis_store import AnalysisStore, content_hash
+
+
+def _analysis(word_count: int) -> ArticleAnalysis:
+    return ArticleAnalysis(word_count=word_count, frequent_words=[WordFrequency(word="python", count=2)])
+
+
+@pytest.mark.asyncio
+async def test_store_roundtrip(async_db):
+    store = AnalysisStore(async_db)
+    digest = content_hash("Python text")
+
+    assert await store.get("1", digest) is None
+
+    await store.save("1", digest, _analysis(2), revision_id=10)
+    stored = await store.get("1", digest)
+
+    assert stored.word_count == 2
+    assert stored.frequent_words[0].word == "python"
+
+
+@pytest.mark.asyncio
+async def test_new_revision_replaces_old_analysis(async_db):
+    store = AnalysisStore(async_db)
+    old_digest = content_hash("Old revision")
+    new_digest = content_hash("New revision")
+
+    await store.save("1", old_digest, _analysis(2), revision_id=10)
+    await store.save("1", new_digest, _analysis(3), revision_id=11)
+
+    assert await store.get("1", old_digest) is None
+    assert (await store.get("1", new_digest)).word_count == 3
+    assert await async_db.scalar(select(func.count(ArticleAnalysisRecord.id))) == 1
+
+
+@pytest.mark.asyncio
+async def test_texts_of_the_same_revision_coexist(async_db):
+    store = AnalysisStore(async_db)
+    saved_digest = content_hash("Texto guardado")
+    upstream_digest = content_hash("Texto de Wikipedia")
+
+    await store.save("1", saved_digest, _analysis(2))
+    await store.save("1", upstream_digest, _analysis(3), revision_id=10)
+    await store.save("1", saved_digest, _analysis(2))
+
+    assert (await store.get("1", saved_digest)).word_count == 2
+    assert (await store.get("1", upstream_digest)).word_count == 3
+    assert await async_db.scalar(select(func.count(ArticleAnalysisRecord.id))) == 2
+
+
+@pytest.mark.asyncio
+async def test_analyzer_version_change_invalidates(async_db):
+    digest = content_hash("Python text")
+    await AnalysisStore(async_db, analyzer_version="1").save("1", digest, _analysis(2))
+
+    assert await AnalysisStore(async_db, analyzer_version="2").get("1", digest) is None
@@ -1,5 +1,6 @@
 import pytest
 from app.services.analyzer import TextAnalyzer
+from app.services.entities import split_into_chunks
 from app.schemas.article import WordFrequency, SentimentAnalysis, Entity
 
 
@@ -93,4 +94,52 @@ def test_extract_entities(analyzer):
     assert location_found, "Debería detectarse al menos una ubicación"
 
     date_found = any(entity.type in ["DATE", "TIME"] for entity in entities)
-    assert date_found, "Debería detectarse al menos una fecha"
\ No newline at end of file
+    assert date_found, "Debería detectarse al menos una fecha"
+
+def test_extract_entities_many_matches_single_extraction(analyzer):
+    """Prueba que el procesamiento en lote da el mismo resultado que uno a uno"""
+    texts = [
+        "Barack Obama was the president of the United States.",
+        "He visited New York in January 2015.",
+        "",
+    ]
+
+    batched = analyzer.extract_entities_many(texts)
+
+    assert len(batched) == len(texts)
+    for text, entities in zip(texts, batched):
+        assert entities == analyzer.extract_entities(text)
+
+
+def test_ner_pipeline_excludes_unused_components(analyzer):
+    """Prueba que el pipeline de entidades no carga componentes innecesarios"""
+    pipe_names = analyzer.entity_engine.nlp.pipe_names
+
+    assert not {"tagger", "parser", "lemmatizer"} & set(pipe_names)
+
+
+def test_split_into_chunks_keeps_offsets_and_bounds():
+    """Prueba que los fragmentos respetan el tamaño máximo y las posiciones originales"""
+    text = ("First paragraph sentence. Another sentence here.\n\n" * 50) + "x" * 300
+
+    chunks = list(split_into_chunks(text, max_chars=200))
+
+    assert all(len(chunk) <= 200 for _, chunk in chunks)
+    assert "".join(chunk for _, chunk in chunks) == text
+    for offset, chunk in chunks:
+        assert text[offset:offset + len(chunk)] == chunk
+
+
+def test_extract_entities_covers_full_text(analyzer):
+    """Prueba que se detectan entidades más allá de los primeros 50.000 caracteres"""
+    filler = "this sentence has nothing special in it at all. " * 20 + "\n\n"
+    mention = "Barack Obama visited New York.\n\n"
+    text = filler * 60 + mention + filler * 5 + mention
+
+    entities = analyzer.extract_entities(text)
+
+    obama = [entity for entity in entities if entity.text == "Barack Obama"]
+    assert len(obama) == 1, "Las entidades repetidas deben unirse"
+    assert obama[0].start > 50000
+    assert text[obama[0].start:obama[0].end] == "Barack Obama"
+    assert obama[0].count == 2
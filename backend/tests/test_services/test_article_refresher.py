@@ -0,0 +1,92 @@
+import httpx
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select
+from app.db.models import SavedArticle
+from app.schemas.article import ArticleAnalysis, WordFrequency
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.article_refresher import refresh_saved_articles
+from app.services.article_stats import StatsDelta, apply_stats_delta, get_article_stats
+from app.services.wiki_service import AsyncWikipediaService
+from tests.fake_wikipedia import FakeWikipediaServer
+
+
+async def _save(db, user_id, wikipedia_id, revision_id, word="old", full_text="Old text"):
+    frequent_words = [{"word": word, "count": 3}]
+    db.add(SavedArticle(
+        title=f"Article {wikipedia_id}",
+        wikipedia_id=str(wikipedia_id),
+        wikipedia_url="https://en.wikipedia.org/",
+        full_text=full_text,
+        word_count=10,
+        frequent_words=frequent_words,
+        revision_id=revision_id,
+        user_id=user_id
+    ))
+    delta = StatsDelta()
+    delta.add(user_id, 10, frequent_words, None)
+    await apply_stats_delta(db, delta)
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_refresh_only_reanalyzes_changed_revisions(async_db):
+    await _save(async_db, "default_user", 1, revision_id=5)
+    await _save(async_db, "default_user", 2, revision_id=3)
+    await _save(async_db, "other_user", 2, revision_id=3, full_text=None)
+    await _save(async_db, "default_user", 3, revision_id=None)
+    await _save(async_db, "default_user", 4, revision_id=8)
+
+    pages = {
+        1: {"title": "Article 1", "extract": "Unchanged", "revision_id": 5},
+        2: {"title": "Article 2 renamed", "extract": "New text\n\n\n== Section ==\nMore", "revision_id": 9},
+        3: {"title": "Article 3", "extract": "Text 3", "revision_id": 4, "touched": "2024-05-01T10:00:00Z"},
+    }
+    executor = AnalysisExecutor(max_workers=0, max_pending=8)
+
+    with FakeWikipediaServer(pages) as server, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_analyze.return_value = ArticleAnalysis(
+            word_count=2, frequent_words=[WordFrequency(word="new", count=1)]
+        )
+
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url)
+            result = await refresh_saved_articles(async_db, service, executor, concurrency=1)
+            first_requests = len(server.requests)
+            second = await refresh_saved_articles(async_db, service, executor)
+
+    # 1 consulta de revisiones + 1 descarga de la única página cambiada (2);
+    # la 3 no tenía revisión y solo anota la actual
+    assert first_requests == 2
+    assert mock_analyze.call_count == 1
+    assert result == {
+        "checked": 5, "changed_pages": 1, "refreshed": 2, "baselined": 1, "missing_pages": 1, "failed_pages": 0
+    }
+
+    # La segunda pasada no encuentra cambios: solo consulta revisiones
+    assert len(server.requests) == 3
+    assert second["changed_pages"] == 0 and second["refreshed"] == 0 and second["baselined"] == 0
+
+    articles = {
+        (article.user_id, article.wikipedia_id): article
+        for article in (await async_db.scalars(select(SavedArticle))).all()
+    }
+    # El título y el resumen que pudo editar el usuario no cambian
+    assert articles[("other_user", "2")].title == "Article 2"
+    assert articles[("other_user", "2")].revision_id == 9
+    assert articles[("default_user", "2")].summary is None
+    # El texto completo solo se actualiza donde ya estaba guardado
+    full_texts = dict((await async_db.execute(select(SavedArticle.user_id, SavedArticle.full_text).where(
+        SavedArticle.wikipedia_id == "2"
+    ))).all())
+    assert full_texts["default_user"].startswith("New text")
+    assert full_texts["other_user"] is None
+    assert articles[("default_user", "3")].revision_id == 4
+    assert articles[("default_user", "3")].touched.isoformat() == "2024-05-01T10:00:00"
+    assert articles[("default_user", "3")].word_count == 10
+    assert articles[("default_user", "1")].word_count == 10
+    assert all(article.last_checked_at is not None for article in articles.values())
+
+    stats = await get_article_stats(async_db, "default_user")
+    assert {word.word: word.articles for word in stats.top_words} == {"old": 3, "new": 1}
@@ -0,0 +1,147 @@
+import asyncio
+import httpx
+import pytest
+from app.services.cache import TTLCache, SQLiteCacheBackend, ResponseCache, make_cache_key
+from app.services.wiki_service import CachedWikipediaService
+from tests.fake_wikipedia import FakeWikipediaServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_cache_key_normalizes_params():
+    assert make_cache_key("search", q="  Python   Language ", limit=10) == \
+        make_cache_key("search", limit=10, q="python language")
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (1, True)
+    assert cache.get("c") == (3, True)
+
+
+def test_ttl_cache_is_bounded_by_size():
+    cache = TTLCache(max_entries=100, ttl=60, max_bytes=1000)
+    cache.set("a", {"content": "x" * 400})
+    cache.set("b", {"content": "x" * 400})
+    cache.get("a")
+    cache.set("c", {"content": "x" * 400})
+
+    # Cabe el tamaño de dos: sale la menos usada
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.bytes <= 1000
+
+    # Un valor mayor que todo el límite no se guarda ni desaloja a los demás
+    cache.set("huge", "x" * 5000)
+    assert cache.get("huge") is None
+    assert len(cache) == 2
+
+
+def test_shared_backend_is_bounded_by_size(tmp_path):
+    clock = FakeClock()
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), ttl=60, clock=clock, max_bytes=2000)
+
+    for index in range(10):
+        clock.now += 1
+        backend.set(f"details:page_id={index}", {"content": "x" * 300})
+    backend.set("details:page_id=huge", {"content": "x" * 5000})
+
+    total = backend._conn.execute("SELECT SUM(LENGTH(value)) FROM response_cache").fetchone()[0]
+    assert total <= 2000
+    # Se conservan las más recientes
+    assert backend.get("details:page_id=9") is not None
+    assert backend.get("details:page_id=0") is None
+    assert backend.get("details:page_id=huge") is None
+    backend.close()
+
+
+def test_ttl_cache_expiration_and_stale_window():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl=10, stale_ttl=20, clock=clock)
+    cache.set("key", "value")
+
+    clock.now += 15
+    assert cache.get("key") == ("value", False)
+
+    clock.now += 20
+    assert cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_stale_and_refreshes():
+    clock = FakeClock()
+    cache = ResponseCache(TTLCache(max_entries=10, ttl=10, stale_ttl=100, clock=clock))
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert await cache.get_or_load("key", loader) == 1
+    assert await cache.get_or_load("key", loader) == 1
+
+    clock.now += 30
+    # Se sirve el valor obsoleto y se revalida en segundo plano
+    assert await cache.get_or_load("key", loader) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert await cache.get_or_load("key", loader) == 2
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["stale_hits"] == 1
+    assert stats["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_is_reused_between_caches(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    worker_a = ResponseCache(TTLCache(10, ttl=60), SQLiteCacheBackend(path, ttl=60))
+    worker_b = ResponseCache(TTLCache(10, ttl=60), SQLiteCacheBackend(path, ttl=60))
+
+    async def loader():
+        return {"title": "Test Article"}
+
+    async def failing_loader():
+        raise AssertionError("No debería consultar Wikipedia")
+
+    await worker_a.get_or_load("details:page_id=1", loader)
+    value = await worker_b.get_or_load("details:page_id=1", failing_loader)
+
+    assert value == {"title": "Test Article"}
+    assert worker_b.stats()["shared_hits"] == 1
+
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_wikipedia_service_avoids_upstream_calls():
+    pages = {1: {"title": "Python", "extract": "Python text"}, 2: {"title": "Java", "extract": "Java text"}}
+    cache = ResponseCache(TTLCache(max_entries=100, ttl=60))
+
+    with FakeWikipediaServer(pages) as server:
+        async with httpx.AsyncClient() as client:
+            service = CachedWikipediaService(cache, client=client, api_url=server.url)
+
+            await service.search_articles("Python")
+            await service.search_articles("  python ")
+            await service.get_article_details(1)
+            details = await service.get_articles_details([1, 2])
+
+    # búsqueda + detalle de 1 + detalle de 2 (el 1 ya estaba en caché)
+    assert len(server.requests) == 3
+    assert details[1]["title"] == "Python"
+    assert details[2]["title"] == "Java"
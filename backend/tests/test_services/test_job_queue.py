@@ -0,0 +1,235 @@
+import asyncio
+from datetime import timedelta
+import httpx
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.db.models import Job, SavedArticle
+from app.schemas.article import ArticleAnalysis, WordFrequency
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.job_queue import claim_jobs, enqueue, fail_job, requeue_stale_jobs, utcnow
+from app.services.job_worker import JobWorker
+from app.services.wiki_service import AsyncWikipediaService
+from tests.fake_wikipedia import FakeWikipediaServer
+
+
+@pytest.mark.asyncio
+async def test_claim_jobs_by_priority_and_only_once(async_db):
+    low = await enqueue(async_db, "analyze_article", {"page_id": 1})
+    high = await enqueue(async_db, "analyze_article", {"page_id": 2}, priority=10)
+    later = await enqueue(async_db, "analyze_article", {"page_id": 3}, priority=50)
+    await async_db.execute(update(Job).where(Job.id == later.id).values(run_after=utcnow() + timedelta(hours=1)))
+    await async_db.commit()
+
+    first = await claim_jobs(async_db, "worker-1", limit=1)
+    second = await claim_jobs(async_db, "worker-2", limit=5)
+
+    assert [job.id for job in first] == [high.id]
+    assert [job.id for job in second] == [low.id]
+    assert first[0].status == "running" and first[0].attempts == 1 and first[0].locked_by == "worker-1"
+    assert await claim_jobs(async_db, "worker-3", limit=5) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_jobs_skips_excluded_types(async_db):
+    await enqueue(async_db, "import_articles", {"items": []}, priority=10)
+    analyze = await enqueue(async_db, "analyze_article", {"page_id": 1})
+
+    jobs = await claim_jobs(async_db, "worker", limit=5, exclude_types={"import_articles"})
+
+    assert [job.id for job in jobs] == [analyze.id]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_retries_with_backoff_until_attempts_run_out(async_db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_DELAY", 10.0)
+    job = await enqueue(async_db, "analyze_article", {"page_id": 1}, max_attempts=2)
+
+    [claimed] = await claim_jobs(async_db, "worker", limit=1)
+    assert await fail_job(async_db, claimed, "worker", "Wikipedia no responde") == "queued"
+
+    stored = await async_db.scalar(select(Job).where(Job.id == job.id).execution_options(populate_existing=True))
+    assert stored.error == "Wikipedia no responde"
+    assert stored.run_after > utcnow() + timedelta(seconds=5)
+    # La espera aún no ha pasado
+    assert await claim_jobs(async_db, "worker", limit=1) == []
+
+    await async_db.execute(update(Job).where(Job.id == job.id).values(run_after=utcnow()))
+    await async_db.commit()
+    [claimed] = await claim_jobs(async_db, "worker", limit=1)
+    assert claimed.attempts == 2
+    assert await fail_job(async_db, claimed, "worker", "Wikipedia no responde") == "failed"
+
+
+@pytest.mark.asyncio
+async def test_requeue_stale_jobs(async_db):
+    job = await enqueue(async_db, "analyze_article", {"page_id": 1})
+    await claim_jobs(async_db, "crashed-worker", limit=1)
+    await async_db.execute(update(Job).where(Job.id == job.id).values(locked_at=utcnow() - timedelta(hours=1)))
+    await async_db.commit()
+
+    assert await requeue_stale_jobs(async_db, lock_timeout=60) == 1
+
+    [claimed] = await claim_jobs(async_db, "worker", limit=1)
+    assert claimed.id == job.id and claimed.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_renews_lock_of_long_jobs(async_session_factory):
+    async with async_session_factory() as db:
+        job = await enqueue(db, "reanalyze_articles", {})
+
+    async def slow_job(*args):
+        # Más que lock_timeout: sin renovar el bloqueo se daría por abandonado
+        await asyncio.sleep(0.6)
+        async with async_session_factory() as db:
+            requeued.append(await requeue_stale_jobs(db, lock_timeout=0.3))
+        return {}
+
+    requeued = []
+    with patch("app.services.job_worker.run_job", slow_job):
+        async with httpx.AsyncClient() as client:
+            worker = JobWorker(
+                async_session_factory,
+                AsyncWikipediaService(client=client),
+                AnalysisExecutor(max_workers=0, max_pending=8),
+                lock_timeout=0.3
+            )
+            await worker.drain()
+
+    async with async_session_factory() as db:
+        stored = await db.get(Job, job.id)
+
+    assert requeued == [0]
+    assert stored.status == "succeeded" and stored.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_does_not_complete_a_job_it_lost(async_session_factory):
+    async with async_session_factory() as db:
+        job = await enqueue(db, "reanalyze_articles", {})
+
+    async def lost_job(*args):
+        # Se dio por abandonado y otro worker lo reclamó mientras se ejecutaba
+        async with async_session_factory() as db:
+            await db.execute(update(Job).where(Job.id == job.id).values(locked_at=utcnow() - timedelta(hours=1)))
+            await db.commit()
+            await requeue_stale_jobs(db, lock_timeout=60)
+            await claim_jobs(db, "other-worker", limit=1)
+        return {"done": True}
+
+    with patch("app.services.job_worker.run_job", lost_job):
+        async with httpx.AsyncClient() as client:
+            worker = JobWorker(
+                async_session_factory,
+                AsyncWikipediaService(client=client),
+                AnalysisExecutor(max_workers=0, max_pending=8)
+            )
+            await worker.drain()
+
+    async with async_session_factory() as db:
+        stored = await db.get(Job, job.id)
+
+    assert stored.status == "running" and stored.locked_by == "other-worker"
+    assert stored.result is None
+    assert worker.stats()["lost"] == 1 and worker.stats()["succeeded"] == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_and_respects_type_limits(async_session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_DELAY", 0.0)
+    pages = {
+        1: {"title": "Article 1", "extract": "Text one", "revision_id": 7},
+        2: {"title": "Article 2", "extract": "Text two", "revision_id": 8},
+    }
+
+    async with async_session_factory() as db:
+        fetch = await enqueue(db, "fetch_article", {"page_id": 1})
+        imports = [
+            await enqueue(db, "import_articles", {
+                "items": [{"title": "Article 2", "wikipedia_id": "2", "wikipedia_url": "https://en.wikipedia.org/"}],
+                "fetch_content": True,
+            })
+            for _ in range(2)
+        ]
+        missing = await enqueue(db, "fetch_article", {"page_id": 404})
+        invalid = await enqueue(db, "analyze_article", {"page_id": "not a number"})
+
+    running = {"import_articles": 0}
+    peak = {"import_articles": 0}
+    original_execute = JobWorker._execute
+
+    async def tracked_execute(self, job):
+        if job.type == "import_articles":
+            running["import_articles"] += 1
+            peak["import_articles"] = max(peak["import_articles"], running["import_articles"])
+            await asyncio.sleep(0.05)
+        try:
+            await original_execute(self, job)
+        finally:
+            if job.type == "import_articles":
+                running["import_articles"] -= 1
+
+    with FakeWikipediaServer(pages) as server, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_texts") as mock_analyze, \
+            patch.object(JobWorker, "_execute", tracked_execute):
+        mock_analyze.side_effect = lambda texts, **kwargs: [
+            ArticleAnalysis(word_count=2, frequent_words=[WordFrequency(word="text", count=1)]) for _ in texts
+        ]
+
+        async with httpx.AsyncClient() as client:
+            worker = JobWorker(
+                async_session_factory,
+                AsyncWikipediaService(client=client, api_url=server.url),
+                AnalysisExecutor(max_workers=0, max_pending=8),
+                concurrency=4,
+                type_limits={"import_articles": 1}
+            )
+            await worker.drain()
+
+    assert peak["import_articles"] == 1
+
+    async with async_session_factory() as db:
+        jobs = {job.id: job for job in await db.scalars(select(Job))}
+        articles = (await db.scalars(select(SavedArticle).order_by(SavedArticle.wikipedia_id))).all()
+
+    assert jobs[fetch.id].status == "succeeded"
+    assert jobs[fetch.id].result["status"] == "created"
+    assert [jobs[job.id].result["counts"] for job in imports] == [{"created": 1}, {"duplicate": 1}]
+    # Errores permanentes: no se reintentan
+    assert jobs[missing.id].status == "failed" and jobs[missing.id].attempts == 1
+    assert "no encontrado" in jobs[missing.id].error
+    assert jobs[invalid.id].status == "failed" and jobs[invalid.id].attempts == 1
+
+    assert [article.wikipedia_id for article in articles] == ["1", "2"]
+    assert [article.word_count for article in articles] == [2, 2]
+    assert articles[0].revision_id == 7
+    assert worker.stats()["succeeded"] == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_full_text_job_fills_missing_text(async_session_factory):
+    async with async_session_factory() as db:
+        article = SavedArticle(
+            title="Article 1", wikipedia_id="1", wikipedia_url="https://en.wikipedia.org/", user_id="default_user"
+        )
+        db.add(article)
+        await db.commit()
+        job = await enqueue(db, "fetch_full_text", {"article_id": article.id})
+
+    with FakeWikipediaServer({1: {"title": "Article 1", "extract": "Full text"}}) as server:
+        async with httpx.AsyncClient() as client:
+            worker = JobWorker(
+                async_session_factory,
+                AsyncWikipediaService(client=client, api_url=server.url),
+                AnalysisExecutor(max_workers=0, max_pending=8)
+            )
+            await worker.drain()
+
+    async with async_session_factory() as db:
+        stored = await db.get(Job, job.id)
+        full_text = await db.scalar(select(SavedArticle.full_text).where(SavedArticle.id == article.id))
+
+    assert stored.status == "succeeded" and stored.result == {"updated": 1}
+    assert full_text == "Full text"
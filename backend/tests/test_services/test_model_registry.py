@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import patch
+from app.services import model_registry
+from app.services.analyzer import TextAnalyzer
+from app.services.model_registry import ModelNotAvailableError, ModelRegistry
+
+
+def test_models_load_lazily_and_are_shared():
+    """Prueba que los modelos se cargan en el primer uso y se comparten entre analizadores"""
+    registry = ModelRegistry(ner_model="en_core_web_sm", sentiment_backend="lexicon")
+    assert registry.status()["ready"] is False
+
+    first = TextAnalyzer(registry=registry)
+    second = TextAnalyzer(registry=registry)
+    assert not registry.status()["models"]["spacy:en_core_web_sm"]["loaded"]
+
+    assert first.entity_engine.nlp is second.entity_engine.nlp
+    assert first.stop_words is second.stop_words
+
+    status = registry.warm_up()
+    assert status["ready"] is True
+    assert all(model["load_seconds"] is not None for model in status["models"].values())
+
+
+def test_missing_model_fails_fast_without_download():
+    """Prueba que un modelo no instalado da un error claro en lugar de descargarse"""
+    registry = ModelRegistry(ner_model="xx_missing_model_sm")
+
+    with pytest.raises(ModelNotAvailableError, match="python -m spacy download xx_missing_model_sm"):
+        registry.warm_up()
+
+    status = registry.status()
+    assert status["ready"] is False
+    assert status["models"]["spacy:xx_missing_model_sm"]["error"]
+
+
+def test_token_filters_are_cached_per_language():
+    """Prueba que el filtro de palabras se crea una vez por idioma y se comparte"""
+    registry = ModelRegistry()
+    load_stop_words = model_registry._load_stop_words
+
+    def fake_load(language):
+        if language == "spanish":
+            return frozenset({"la", "el", "y", "para"})
+        return load_stop_words(language)
+
+    with patch("app.services.model_registry._load_stop_words", side_effect=fake_load) as mock_load:
+        english = TextAnalyzer(registry=registry)
+        spanish = TextAnalyzer(language="spanish", registry=registry)
+
+        assert english.token_filter is TextAnalyzer(registry=registry).token_filter
+        assert english.token_filter.stop_words is registry.stop_words("english")
+        assert "para" in english.token_filter and "para" not in spanish.token_filter
+        assert spanish.get_frequent_words("para la casa y para el perro casa", top_n=1)[0].word == "casa"
+        assert mock_load.call_count == 2
+
+
+def test_missing_stop_words_language_fails_fast():
+    with pytest.raises(ModelNotAvailableError, match="klingon"):
+        ModelRegistry().token_filter("klingon")
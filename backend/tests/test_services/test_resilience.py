@@ -0,0 +1,237 @@
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from app.services.cache import ResponseCache, TTLCache
+from app.services.resilience import (
+    CircuitBreaker,
+    TokenBucket,
+    UpstreamGuard,
+    UpstreamUnavailableError,
+    backoff_delay,
+    parse_retry_after
+)
+from app.services.wiki_service import AsyncWikipediaService, CachedWikipediaService
+from tests.fake_wikipedia import FakeWikipediaServer
+
+PAGES = {12345: {"title": "Test Article", "extract": "Intro text"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sleeps():
+    # Las esperas se registran en lugar de dormir
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    with patch("app.services.resilience.asyncio.sleep", fake_sleep):
+        yield delays
+
+
+def test_backoff_delay_grows_with_full_jitter():
+    assert [backoff_delay(attempt, 0.5, 3.0, rng=lambda: 1.0) for attempt in range(4)] == [0.5, 1.0, 2.0, 3.0]
+    assert backoff_delay(2, 0.5, 3.0, rng=lambda: 0.25) == 0.5
+
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now=now) == 30.0
+    assert parse_retry_after("nonsense") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_out_bursts(sleeps):
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    for _ in range(4):
+        await bucket.acquire()
+
+    # Dos de ráfaga; las siguientes esperan su turno a 10 por segundo
+    assert sleeps == pytest.approx([0.1, 0.2])
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+
+
+def test_circuit_breaker_opens_and_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    # Semiabierto: una sola solicitud de prueba
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["opened"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    guard = UpstreamGuard(breaker=breaker, max_retries=0)
+    breaker.record_failure()
+    clock.now += 30
+
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.Event().wait()
+
+    probe = asyncio.create_task(guard.call(hang))
+    await started.wait()
+    with pytest.raises(UpstreamUnavailableError):
+        await guard.call(hang)
+
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+
+    # Otra solicitud puede hacer la prueba y cerrar el circuito
+    async def ok():
+        return httpx.Response(200)
+
+    assert (await guard.call(ok)).status_code == 200
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors_honoring_retry_after(sleeps):
+    guard = UpstreamGuard(max_retries=3, base_delay=0.5, max_delay=10, rng=lambda: 1.0)
+
+    with FakeWikipediaServer(PAGES) as server:
+        server.fail_next(status=503)
+        server.fail_next(status=429, retry_after=4)
+
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url, guard=guard)
+            result = await service.get_article_content(12345)
+
+    assert result["content"] == "Intro text"
+    assert len(server.requests) == 3
+    # Espera exponencial para el 503 y la de Retry-After para el 429
+    assert sleeps == [0.5, 4.0]
+    assert guard.stats()["retries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried(sleeps):
+    guard = UpstreamGuard(max_retries=3)
+
+    with FakeWikipediaServer(PAGES) as server:
+        server.fail_next(status=400)
+
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url, guard=guard)
+            with pytest.raises(Exception, match="Error al conectar con Wikipedia"):
+                await service.get_article_content(12345)
+
+    assert len(server.requests) == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_retried(sleeps):
+    guard = UpstreamGuard(max_retries=1, rng=lambda: 0.0)
+
+    with FakeWikipediaServer(PAGES, delay=0.2) as server:
+        async with httpx.AsyncClient(timeout=0.05) as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url, guard=guard)
+            with pytest.raises(UpstreamUnavailableError):
+                await service.get_article_content(12345)
+
+    assert len(server.requests) == 2
+    assert guard.stats()["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_counts_calls_not_attempts(sleeps):
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    guard = UpstreamGuard(breaker=breaker, max_retries=2, rng=lambda: 0.0)
+    attempts = []
+
+    async def send():
+        attempts.append(1)
+        return httpx.Response(503)
+
+    with pytest.raises(UpstreamUnavailableError):
+        await guard.call(send)
+    # Tres intentos de una sola llamada son un solo fallo
+    assert len(attempts) == 3
+    assert (breaker.state, breaker.failures) == ("closed", 1)
+
+    with pytest.raises(UpstreamUnavailableError):
+        await guard.call(send)
+    assert breaker.state == "open"
+
+    # La prueba del circuito semiabierto no se reintenta: un intento, un fallo
+    clock.now += 30
+    with pytest.raises(UpstreamUnavailableError):
+        await guard.call(send)
+    assert len(attempts) == 7
+    assert breaker.state == "open"
+    assert breaker.stats()["opened"] == 2
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_and_serves_cached_responses(sleeps):
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    guard = UpstreamGuard(breaker=breaker, max_retries=1, rng=lambda: 0.0)
+    cache = ResponseCache(TTLCache(max_entries=16, ttl=10, stale_ttl=10, fallback_ttl=3600, clock=clock))
+
+    with FakeWikipediaServer(PAGES) as server:
+        async with httpx.AsyncClient() as client:
+            service = CachedWikipediaService(cache, client=client, api_url=server.url, guard=guard)
+            await service.get_article_details(12345)
+
+            # Wikipedia cae y la entrada de caché caduca del todo
+            clock.now += 60
+            server.fail_next(count=10, status=500)
+            details = await service.get_article_details(12345)
+            assert details["title"] == "Test Article"
+            assert breaker.state == "open"
+            requests = len(server.requests)
+
+            # Con el circuito abierto no se llama a Wikipedia
+            details = await service.get_articles_details([12345])
+            assert details[12345]["title"] == "Test Article"
+            with pytest.raises(UpstreamUnavailableError) as error:
+                await service.get_article_content(12345)
+            assert error.value.retry_after == 30
+            assert len(server.requests) == requests
+
+            # Pasado el plazo, una solicitud de prueba cierra el circuito
+            clock.now += 30
+            server.failures.clear()
+            await service.get_article_content(12345)
+            assert breaker.state == "closed"
+
+    assert cache.stats()["fallback_hits"] == 2
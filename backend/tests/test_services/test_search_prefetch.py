@@ -0,0 +1,97 @@
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+from app.schemas.article import ArticleAnalysis
+from app.services.analysis_executor import AnalysisExecutor
+from app.services.analysis_store import AnalysisStore, content_hash
+from app.services.cache import ResponseCache, TTLCache
+from app.services.search_prefetch import SearchPrefetcher, get_search_prefetcher
+from app.services.wiki_service import AsyncWikipediaService, CachedWikipediaService
+from tests.fake_wikipedia import FakeWikipediaServer
+
+PAGES = {
+    1: {"title": "First", "extract": "First text"},
+    2: {"title": "Second", "extract": "Second text"},
+    3: {"title": "Third", "extract": "Third text"},
+}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_content_and_analysis(async_session_factory):
+    prefetcher = SearchPrefetcher(top_k=2, session_factory=async_session_factory)
+    executor = AnalysisExecutor(max_workers=0, max_pending=8)
+
+    with FakeWikipediaServer(PAGES) as server, \
+            patch("app.services.analyzer.TextAnalyzer.analyze_text") as mock_analyze:
+        mock_analyze.return_value = ArticleAnalysis(word_count=2, frequent_words=[])
+
+        async with httpx.AsyncClient() as client:
+            service = CachedWikipediaService(
+                ResponseCache(TTLCache(max_entries=16, ttl=60)), client=client, api_url=server.url
+            )
+            assert prefetcher.schedule([1, 2, 3], service, executor) == [1, 2]
+            await asyncio.gather(*prefetcher._tasks)
+            requests = len(server.requests)
+
+            # Abrir un resultado precargado no vuelve a Wikipedia
+            details = await service.get_article_details(1)
+            assert len(server.requests) == requests
+
+    assert mock_analyze.call_count == 2
+    async with async_session_factory() as db:
+        assert await AnalysisStore(db).get("1", content_hash(details["content"])) is not None
+
+    # Ya precargadas: no se repiten
+    assert prefetcher.schedule([1, 2], service, executor) == []
+
+    assert prefetcher.record_access(1) is True
+    assert prefetcher.record_access(1) is False
+    assert prefetcher.record_access(3) is False
+    stats = prefetcher.stats()
+    assert stats["prefetched"] == 2
+    assert stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_prefetch_respects_budget_and_load(async_session_factory):
+    prefetcher = SearchPrefetcher(top_k=3, max_in_flight=1, load_threshold=0.5, session_factory=async_session_factory)
+    executor = AnalysisExecutor(max_workers=0, max_pending=4)
+    service = AsyncWikipediaService(api_url="http://127.0.0.1:9/w/api.php")
+
+    # Con el pool ocupado no se precarga nada
+    executor.pending = 2
+    assert prefetcher.schedule([1, 2, 3], service, executor) == []
+    assert prefetcher.stats()["skipped"] == 3
+
+    executor.pending = 0
+    with patch.object(AsyncWikipediaService, "get_articles_details") as mock_details:
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_details(page_ids, include_content=True):
+            started.set()
+            await release.wait()
+            return {page_id: {"content": PAGES[page_id]["extract"]} for page_id in page_ids}
+
+        mock_details.side_effect = slow_details
+
+        # Presupuesto de una página a la vez
+        assert prefetcher.schedule([1, 2, 3], service, executor) == [1]
+        assert prefetcher.schedule([2, 3], service, executor) == []
+        await started.wait()
+
+        # La carga sube mientras se descarga: se cancela antes de analizar
+        executor.pending = 3
+        release.set()
+        await asyncio.gather(*prefetcher._tasks)
+
+    stats = prefetcher.stats()
+    assert stats["cancelled"] == 1
+    assert stats["prefetched"] == 0
+    assert stats["in_flight"] == 0
+
+
+def test_prefetch_is_disabled_by_default():
+    assert get_search_prefetcher() is None
@@ -0,0 +1,49 @@
+import pytest
+from app.services.sentiment import (
+    LexiconSentimentBackend,
+    TextBlobSentimentBackend,
+    polarity_to_sentiment
+)
+
+TEXTS = [
+    "good",
+    "very good",
+    "not good",
+    "not a good idea",
+    "not very good",
+    "I love this product! It's amazing and wonderful.",
+    "I hate this product. It's terrible and disappointing.",
+    "The city is a large and beautiful place with a long history, though the winters are cold and harsh.",
+    "It isn't bad at all, never terrible!",
+    "Nothing here carries any opinion.",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def lexicon_backend():
+    return LexiconSentimentBackend.from_textblob()
+
+
+def test_lexicon_backend_matches_textblob(lexicon_backend):
+    """Prueba que el motor vectorizado da la misma polaridad que TextBlob"""
+    reference = TextBlobSentimentBackend()
+
+    for text, polarity in zip(TEXTS, lexicon_backend.polarities(TEXTS)):
+        assert polarity == pytest.approx(reference.polarity(text)), text
+
+
+def test_lexicon_backend_scores_documents_independently(lexicon_backend):
+    """Prueba que puntuar en lote no mezcla tokens de textos vecinos"""
+    batched = lexicon_backend.polarities(["not", "good!", "very", "bad"])
+
+    assert batched == [lexicon_backend.polarity(text) for text in ["not", "good!", "very", "bad"]]
+
+
+def test_polarity_to_sentiment_labels():
+    """Prueba la conversión de polaridad a etiqueta y puntuaciones"""
+    assert polarity_to_sentiment(0.6).label == "Positive"
+    assert polarity_to_sentiment(0.6).positive == pytest.approx(0.8)
+    assert polarity_to_sentiment(-0.6).label == "Negative"
+    assert polarity_to_sentiment(0.05).label == "Neutral"
+    assert polarity_to_sentiment(0.05).neutral == 0.8
@@ -0,0 +1,37 @@
+import re
+from collections import Counter
+from app.services.tokenizer import TokenFilter, TokenizedDocument
+
+
+def test_tokens_match_previous_regex():
+    """Prueba que la tokenización coincide con re.findall(r'\\b\\w+\\b', text.lower())"""
+    text = "Python's syntax—clean, readable; 3.11 año_nuevo ÉXITO it's\n\tdone."
+
+    document = TokenizedDocument(text)
+
+    assert document.tokens == re.findall(r'\b\w+\b', text.lower())
+    assert document.word_count == len(document.tokens)
+
+
+def test_frequent_words_filters_and_keeps_first_occurrence_order():
+    document = TokenizedDocument("The cat and the dog. Dog cat bird, an ox. Bird!")
+
+    frequent = document.frequent_words(stop_words={"the", "and"}, min_length=3, top_n=3)
+
+    assert frequent == [("cat", 2), ("dog", 2), ("bird", 2)]
+
+
+def test_counts_are_computed_once():
+    document = TokenizedDocument("one two two")
+
+    assert document.counts is document.counts
+    assert document.counts == Counter({"two": 2, "one": 1})
+
+
+def test_token_filter_top_keeps_ties_in_order():
+    token_filter = TokenFilter(stop_words={"the"}, min_length=3)
+    counts = Counter({"the": 9, "ox": 8, "cat": 2, "dog": 3, "bird": 2, "fish": 1})
+
+    assert "cat" in token_filter and "the" not in token_filter and "ox" not in token_filter
+    assert token_filter.top(counts, 3) == [("dog", 3), ("cat", 2), ("bird", 2)]
+    assert TokenizedDocument("cat dog cat").frequent_words(token_filter=token_filter) == [("cat", 2), ("dog", 1)]
@@ -1,7 +1,12 @@
+import asyncio
+import time
+import httpx
 import pytest
 from unittest.mock import patch, MagicMock
 import requests
-from app.services.wiki_service import WikipediaService
+from app.services.single_flight import SingleFlight
+from app.services.wiki_service import WikipediaService, AsyncWikipediaService
+from tests.fake_wikipedia import FakeWikipediaServer
 
 
 @pytest.fixture
@@ -56,4 +61,133 @@ def test_get_article_content(wiki_service):
 
         assert result["page_id"] == 12345
         assert result["title"] == "Test Article"
-        assert result["content"] == "This is test content"
\ No newline at end of file
+        assert result["content"] == "This is test content"
+
+@pytest.mark.asyncio
+async def test_async_get_article_content():
+    pages = {12345: {"title": "Test Article", "extract": "Intro text\n\n\n== History ==\nMore text"}}
+
+    with FakeWikipediaServer(pages) as server:
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url)
+            content = await service.get_article_content(12345)
+            summary = await service.get_article_summary(12345)
+
+    assert content["title"] == "Test Article"
+    assert "More text" in content["content"]
+    assert summary["summary"] == "Intro text"
+
+
+@pytest.mark.asyncio
+async def test_async_requests_run_concurrently():
+    """Con un servidor lento, las solicitudes concurrentes no se serializan"""
+    concurrency = 20
+    delay = 0.2
+
+    with FakeWikipediaServer({}, delay=delay) as server:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits) as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url)
+
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(service.search_articles(f"query {i}") for i in range(concurrency))
+            )
+            elapsed = time.perf_counter() - start
+
+    assert len(results) == concurrency
+    assert len(server.requests) == concurrency
+    # En serie tardaría concurrency * delay (4 s); en paralelo ~delay
+    assert elapsed < concurrency * delay / 4, f"Las solicitudes se serializaron: {elapsed:.2f}s"
+
+
+@pytest.mark.asyncio
+async def test_get_article_details_single_request():
+    pages = {12345: {"title": "Test Article", "extract": "Intro text\n\n\n== History ==\nMore text", "revision_id": 7}}
+
+    with FakeWikipediaServer(pages) as server:
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url)
+            details = await service.get_article_details(12345)
+
+    assert len(server.requests) == 1
+    assert details["summary"] == "Intro text"
+    assert "More text" in details["content"]
+    assert details["revision_id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced():
+    pages = {12345: {"title": "Test Article", "extract": "Intro text"}}
+    flight = SingleFlight()
+
+    with FakeWikipediaServer(pages, delay=0.1) as server:
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url, flight=flight)
+            results = await asyncio.gather(*(service.get_article_details(12345) for _ in range(10)))
+
+    assert len(server.requests) == 1
+    assert all(result["title"] == "Test Article" for result in results)
+    assert flight.stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_get_articles_details_batches_pageids():
+    pages = {page_id: {"title": f"Article {page_id}", "extract": f"Intro {page_id}"} for page_id in range(1, 26)}
+
+    with FakeWikipediaServer(pages) as server:
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url)
+            summaries = await service.get_articles_details(list(range(1, 26)) + [999], include_content=False)
+
+    # 25 páginas en lotes de 20 -> 2 solicitudes; la página inexistente se omite
+    assert len(server.requests) == 2
+    assert sorted(summaries) == list(range(1, 26))
+    assert summaries[3]["summary"] == "Intro 3"
+    assert summaries[3]["content"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_articles_details_bounds_concurrency_and_reports_errors_per_page():
+    service = AsyncWikipediaService(client=MagicMock(), api_url="http://wiki.test")
+    in_flight = 0
+    peak = 0
+
+    async def fake_get(params):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        page_id = params["pageids"]
+        if page_id == "3":
+            raise Exception("Error al conectar con Wikipedia: 500")
+        return {"query": {"pages": {page_id: {"pageid": int(page_id), "title": f"Article {page_id}", "extract": "Text"}}}}
+
+    errors = {}
+    with patch.object(service, "_get", side_effect=fake_get), \
+            patch("app.services.wiki_service.DETAILS_CONCURRENCY", 2):
+        details = await service.get_articles_details([1, 2, 3, 4, 5], errors=errors)
+
+        with pytest.raises(Exception, match="500"):
+            await service.get_articles_details([1, 3])
+
+    assert peak == 2
+    assert sorted(details) == [1, 2, 4, 5]
+    assert list(errors) == [3]
+
+
+@pytest.mark.asyncio
+async def test_get_revisions_batches_pageids_without_content():
+    pages = {page_id: {"title": f"Article {page_id}", "revision_id": page_id * 10} for page_id in range(1, 121)}
+
+    with FakeWikipediaServer(pages) as server:
+        async with httpx.AsyncClient() as client:
+            service = AsyncWikipediaService(client=client, api_url=server.url)
+            revisions = await service.get_revisions(list(range(1, 121)) + [999])
+
+    # 121 páginas en lotes de 50 -> 3 solicitudes, solo con prop=info
+    assert len(server.requests) == 3
+    assert all(request["prop"] == "info" for request in server.requests)
+    assert sorted(revisions) == list(range(1, 121))
+    assert revisions[7] == {"revision_id": 70, "touched": "2024-01-01T00:00:00Z"}
@@ -26,7 +26,10 @@ function ArticleDetail({ article, analysis, onSave, onUpdate }) {
         wikipedia_url: article.wikipedia_url,
         summary: article.summary,
         word_count: analysis.word_count,
-        frequent_words: analysis.frequent_words
+        frequent_words: analysis.frequent_words,
+        entities: analysis.entities,
+        revision_id: article.revision_id,
+        touched: article.touched
       };
 
       await saveArticle(articleToSave);